@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Aggregate Bedrock EMF metric lines from a log file into percentiles.
+
+Reads CloudWatch Embedded Metric Format records (as emitted by
+lib/bedrock_converse.emit_converse_metrics) from a log export, `sam logs`
+output or a local run, groups them by ModelId/Operation and prints count,
+mean, p50, p90, p99 and max for each metric, plus stop reason counts.
+
+Usage:
+  python aggregate_metrics.py ingest.log
+  sam logs -n IngestFunction --stack-name my-stack > ingest.log && python aggregate_metrics.py ingest.log
+  python aggregate_metrics.py ingest.log --json
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+
+
+def iter_emf_records(lines):
+    """Yield EMF records from log lines, skipping anything that isn't one."""
+    for line in lines:
+        start = line.find("{")
+        if start < 0:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and "_aws" in record:
+            yield record
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def aggregate(records):
+    """Group metric values by (dimension values) and summarize them."""
+    values = defaultdict(lambda: defaultdict(list))
+    stop_reasons = defaultdict(Counter)
+
+    for record in records:
+        for directive in record["_aws"].get("CloudWatchMetrics", []):
+            dimension_names = directive.get("Dimensions", [[]])[0]
+            group = " / ".join(f"{name}={record.get(name, '?')}" for name in dimension_names) or "(none)"
+            for metric in directive.get("Metrics", []):
+                value = record.get(metric["Name"])
+                if isinstance(value, (int, float)):
+                    values[group][metric["Name"]].append(value)
+            if "StopReason" in record:
+                stop_reasons[group][record["StopReason"]] += 1
+
+    summary = {}
+    for group, metrics in values.items():
+        summary[group] = {"stop_reasons": dict(stop_reasons[group]), "metrics": {}}
+        for name, samples in metrics.items():
+            samples.sort()
+            summary[group]["metrics"][name] = {
+                "count": len(samples),
+                "sum": sum(samples),
+                "mean": round(sum(samples) / len(samples), 1),
+                "p50": percentile(samples, 50),
+                "p90": percentile(samples, 90),
+                "p99": percentile(samples, 99),
+                "max": samples[-1]
+            }
+    return summary
+
+
+def print_summary(summary):
+    """Print a human-readable table per group."""
+    if not summary:
+        print("No EMF records found.")
+        return
+    for group, data in sorted(summary.items()):
+        print(f"\n{group}")
+        print(f"  {'metric':<24}{'count':>8}{'sum':>12}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+        for name, stats in sorted(data["metrics"].items()):
+            print(
+                f"  {name:<24}{stats['count']:>8}{stats['sum']:>12}{stats['mean']:>10}"
+                f"{stats['p50']:>10}{stats['p90']:>10}{stats['p99']:>10}{stats['max']:>10}"
+            )
+        if data["stop_reasons"]:
+            reasons = ", ".join(f"{reason}={count}" for reason, count in data["stop_reasons"].items())
+            print(f"  stop reasons: {reasons}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate Bedrock EMF metrics from a log file")
+    parser.add_argument("log_file", help="Log file to read ('-' for stdin)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    if args.log_file == "-":
+        summary = aggregate(iter_emf_records(sys.stdin))
+    else:
+        with open(args.log_file, encoding="utf-8") as f:
+            summary = aggregate(iter_emf_records(f))
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Backfill node indexes for nodes stored before they existed.
+
+Scans the table for node items (sk day#{local_day}#node#{node_id}) and
+- writes the node#{node_id} pointer item lib/dynamo.put_node_item now
+  maintains, so delete and complete can resolve a node_id with one GetItem
+- adds the active-index keys (active_pk/active_sk) to active nodes that
+  lack them, so they show up on GET /nodes/active (and bumps those users'
+  change marker so cached /nodes/active responses are not reused)
+Safe to re-run: pointers are plain overwrites of the same value and nodes
+that already have index keys are skipped.
+
+Until it has run on a table with such nodes, deploy with
+NodePointerFallback=true so reads still find them; afterwards go back to
+the default (false), where a node_id without a pointer is treated as
+missing instead of costing a partition query:
+  sam deploy --parameter-overrides NodePointerFallback=true
+
+Usage:
+  python backfill_node_index.py --table my-stack-table
+  TABLE_NAME=my-stack-table python backfill_node_index.py --dry-run
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lib.dynamo import (  # noqa: E402
+    get_table,
+    batch_write_items,
+    build_node_pointer_item,
+    build_active_index_keys,
+    bump_change_version
+)
+
+
+def iter_node_items(table):
+    """Yield the key and index attributes of every node item, following scan pages."""
+    kwargs = {
+        "FilterExpression": Attr("sk").begins_with("day#") & Attr("sk").contains("#node#"),
+        "ProjectionExpression": "pk, sk, node_id, #status, created_at_iso, active_pk",
+        "ExpressionAttributeNames": {"#status": "status"}
+    }
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get("Items", []):
+            if item.get("node_id"):
+                yield item
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def add_active_index_keys(table, item: dict, user_id: str):
+    """Set active_pk/active_sk on an active node, unless it changed meanwhile."""
+    keys = build_active_index_keys(user_id, item["node_id"], item.get("created_at_iso") or "")
+    table.update_item(
+        Key={"pk": item["pk"], "sk": item["sk"]},
+        UpdateExpression="SET active_pk = :active_pk, active_sk = :active_sk",
+        ConditionExpression=Attr("status").eq("active") & Attr("active_pk").not_exists(),
+        ExpressionAttributeValues={":active_pk": keys["active_pk"], ":active_sk": keys["active_sk"]}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill node pointer items and active-index keys")
+    parser.add_argument("--table", default=os.environ.get("TABLE_NAME"), help="DynamoDB table name")
+    parser.add_argument("--dry-run", action="store_true", help="Count nodes without writing")
+    parser.add_argument("--batch", type=int, default=500, help="Pointers per batch write pass")
+    args = parser.parse_args()
+
+    if not args.table:
+        print("ERROR: pass --table or set TABLE_NAME", file=sys.stderr)
+        sys.exit(1)
+
+    table = get_table(args.table)
+    pending = []
+    written = 0
+    failed = 0
+    activated = 0
+    activated_users = set()
+
+    def flush():
+        nonlocal written, failed
+        unprocessed = batch_write_items(put_items=pending, table_name=args.table)
+        written += len(pending) - len(unprocessed)
+        failed += len(unprocessed)
+        pending.clear()
+
+    scanned = 0
+    needs_active_keys = 0
+    for item in iter_node_items(table):
+        scanned += 1
+        missing_active_keys = item.get("status", "active") == "active" and "active_pk" not in item
+        needs_active_keys += missing_active_keys
+        if args.dry_run:
+            continue
+        user_id = item["pk"].split("#", 1)[1]
+        pending.append(build_node_pointer_item(user_id, item["node_id"], item["sk"]))
+        if len(pending) >= args.batch:
+            flush()
+        if missing_active_keys:
+            try:
+                add_active_index_keys(table, item, user_id)
+                activated += 1
+                activated_users.add(user_id)
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+    if pending:
+        flush()
+    for user_id in activated_users:
+        bump_change_version(user_id, table_name=args.table)
+
+    print(f"node items:          {scanned}")
+    print(f"missing active keys: {needs_active_keys}")
+    if args.dry_run:
+        print("dry run - nothing written")
+        return
+    print(f"pointers written:    {written}")
+    print(f"pointers failed:     {failed}")
+    print(f"active keys added:   {activated}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark and equivalence check for node (de)serialization.
+
+Read path: a GET /nodes/active style body of N nodes as DynamoDB returns
+them (every number a Decimal), serialized the old way
+(json.dumps(default=json_serial), one callback per Decimal) and the new
+way (lib/json_utils.dumps - orjson when installed, json otherwise). Both
+the orjson and json modes are timed when orjson is installed.
+
+Write path: lib/dynamo._convert_floats against the previous always-copying
+implementation (embedded below as the reference).
+
+Fails on any difference in the decoded output.
+
+Usage:
+  python bench_serialization.py
+  python bench_serialization.py --nodes 5000 --repeat 5
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lib import json_utils  # noqa: E402
+from lib.dynamo import _convert_floats  # noqa: E402
+from lib.json_utils import json_serial  # noqa: E402
+from bench_validate import build_valid_nodes  # noqa: E402
+
+
+# --- Reference implementations ---
+
+def legacy_convert_floats(obj):
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    elif isinstance(obj, dict):
+        return {k: legacy_convert_floats(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_convert_floats(v) for v in obj]
+    return obj
+
+
+def legacy_response_body(body: dict) -> str:
+    return json.dumps(body, default=json_serial)
+
+
+# --- Inputs ---
+
+def build_nodes(count: int, rng: random.Random) -> list[dict]:
+    """Model-shaped nodes with the numeric fields a stored node carries."""
+    templates = build_valid_nodes()
+    nodes = []
+    for index in range(count):
+        node = copy.deepcopy(templates[index % len(templates)])
+        node["node_id"] = f"node_{index:06d}"
+        node["confidence"] = round(rng.random(), 3)
+        node["parse_debug"] = {
+            "model_id": "model",
+            "latency_ms": rng.randint(200, 4000),
+            "input_tokens": rng.randint(500, 3000),
+            "output_tokens": rng.randint(50, 800),
+            "fallback_used": False
+        }
+        node["evidence"][0]["word_time_range"] = {"start_ms": rng.randint(0, 5000), "end_ms": rng.randint(5000, 9000)}
+        if "todo" in node:
+            node["todo"]["estimated_minutes"] = rng.choice([None, 15, 30, 45.0])
+        nodes.append(node)
+    return nodes
+
+
+def from_dynamo(nodes: list[dict]) -> list[dict]:
+    """Round-trip nodes through the DynamoDB type system, as a Query returns them."""
+    serializer, deserializer = TypeSerializer(), TypeDeserializer()
+    stored = []
+    for node in nodes:
+        wire = serializer.serialize(legacy_convert_floats(node))
+        stored.append(deserializer.deserialize(wire))
+    return stored
+
+
+def best_ms(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark node serialization")
+    parser.add_argument("--nodes", type=int, default=1000, help="Nodes per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    nodes = build_nodes(args.nodes, random.Random(args.seed))
+    stored = from_dynamo(nodes)
+    node_ids = [node["node_id"] for node in nodes]
+    mismatches = 0
+
+    def legacy_read():
+        return legacy_response_body({"ok": True, "nodes": stored, "node_ids": node_ids, "count": len(stored)})
+
+    def current_read():
+        return json_utils.dumps({"ok": True, "nodes": stored, "node_ids": node_ids, "count": len(stored)})
+
+    modes = [False]
+    if json_utils.HAS_ORJSON:
+        modes.append(True)
+    else:
+        print("orjson not installed - timing the json fallback only")
+
+    legacy_read_ms = best_ms(legacy_read, args.repeat)
+    print(f"nodes:             {len(nodes)}")
+    print(f"read  legacy:      {legacy_read_ms:8.2f} ms")
+
+    has_orjson = json_utils.HAS_ORJSON
+    try:
+        for use_orjson in modes:
+            json_utils.HAS_ORJSON = use_orjson
+            if json.loads(current_read()) != json.loads(legacy_read()):
+                mismatches += 1
+                print(f"MISMATCH read output ({'orjson' if use_orjson else 'json'})")
+            label = "orjson" if use_orjson else "json"
+            current_ms = best_ms(current_read, args.repeat)
+            print(f"read  {label:7s}      {current_ms:8.2f} ms  ({legacy_read_ms / current_ms:.1f}x)")
+    finally:
+        json_utils.HAS_ORJSON = has_orjson
+
+    for node in nodes:
+        if _convert_floats(node) != legacy_convert_floats(node):
+            mismatches += 1
+    legacy_write_ms = best_ms(lambda: [legacy_convert_floats(node) for node in nodes], args.repeat)
+    current_write_ms = best_ms(lambda: [_convert_floats(node) for node in nodes], args.repeat)
+    print(f"write legacy:      {legacy_write_ms:8.2f} ms")
+    print(f"write current:     {current_write_ms:8.2f} ms  ({legacy_write_ms / current_write_ms:.1f}x)")
+    print(f"mismatches:        {mismatches}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
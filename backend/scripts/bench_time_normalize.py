@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Benchmark and equivalence check for lib/time_normalize.
+
+Runs the current time normalization against the previous dateutil-only
+implementation (embedded below as the reference) on realistic nodes and on
+a corpus of odd ISO 8601 strings, fails on any output difference, then
+prints per-call timings for both.
+
+Usage:
+  python bench_time_normalize.py
+  python bench_time_normalize.py --nodes 5000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dateutil import parser as dateutil_parser
+from dateutil.tz import tzoffset
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lib import time_normalize  # noqa: E402
+
+
+# --- Reference implementation (dateutil only, before the fast path) ---
+
+def legacy_parse_offset_from_user_time_iso(user_time_iso):
+    try:
+        dt = dateutil_parser.isoparse(user_time_iso)
+        if dt.tzinfo is not None:
+            offset = dt.utcoffset()
+            if offset is not None:
+                total_seconds = int(offset.total_seconds())
+                sign = "+" if total_seconds >= 0 else "-"
+                total_seconds = abs(total_seconds)
+                hours = total_seconds // 3600
+                minutes = (total_seconds % 3600) // 60
+                return f"{sign}{hours:02d}:{minutes:02d}"
+    except Exception:
+        pass
+    return "+00:00"
+
+
+def legacy_ensure_iso_datetime(value, default_offset):
+    if not value:
+        return None
+    try:
+        dt = dateutil_parser.isoparse(value)
+        offset_hours = int(default_offset[1:3])
+        offset_minutes = int(default_offset[4:6])
+        offset_seconds = (offset_hours * 3600 + offset_minutes * 60)
+        if default_offset[0] == "-":
+            offset_seconds = -offset_seconds
+        target_tz = tzoffset(None, offset_seconds)
+        dt = dt.replace(tzinfo=target_tz)
+        return dt.isoformat()
+    except Exception:
+        return None
+
+
+def legacy_ensure_iso_date(value):
+    if not value:
+        return None
+    try:
+        dt = dateutil_parser.isoparse(value)
+        return dt.strftime("%Y-%m-%d")
+    except Exception:
+        pass
+    if re.match(r"^\d{4}-\d{2}-\d{2}$", value):
+        return value
+    return None
+
+
+def legacy_compute_local_day(user_time_iso):
+    try:
+        dt = dateutil_parser.isoparse(user_time_iso)
+        return dt.strftime("%Y-%m-%d")
+    except Exception:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def legacy_date_to_datetime_iso(date_str, time_str, offset):
+    if not date_str:
+        return None
+    time_str = time_str or "09:00:00"
+    if len(time_str) == 5:
+        time_str = time_str + ":00"
+    try:
+        combined = f"{date_str}T{time_str}{offset}"
+        dateutil_parser.isoparse(combined)
+        return combined
+    except Exception:
+        return None
+
+
+def legacy_normalize_node_times(node, default_offset):
+    warnings = []
+    node = dict(node)
+
+    if "reminder" in node and node["reminder"]:
+        reminder = dict(node["reminder"])
+        if "trigger_datetime_iso" in reminder and reminder["trigger_datetime_iso"]:
+            normalized = legacy_ensure_iso_datetime(reminder["trigger_datetime_iso"], default_offset)
+            if normalized:
+                reminder["trigger_datetime_iso"] = normalized
+            else:
+                warnings.append(f"Could not parse trigger_datetime_iso: {reminder['trigger_datetime_iso']}")
+                reminder["trigger_datetime_iso"] = None
+        when = reminder.get("when", {})
+        if not reminder.get("trigger_datetime_iso") and not when.get("needs_clarification"):
+            resolved_start = when.get("resolved_start_iso")
+            if resolved_start:
+                normalized = legacy_ensure_iso_datetime(resolved_start, default_offset)
+                if normalized and "T" not in resolved_start:
+                    date_part = legacy_ensure_iso_date(resolved_start)
+                    if date_part:
+                        reminder["trigger_datetime_iso"] = legacy_date_to_datetime_iso(date_part, "09:00:00", default_offset)
+                        warnings.append("Defaulted reminder time to 09:00 local")
+                elif normalized:
+                    reminder["trigger_datetime_iso"] = normalized
+        node["reminder"] = reminder
+
+    if "todo" in node and node["todo"]:
+        todo = dict(node["todo"])
+        if "due_datetime_iso" in todo and todo["due_datetime_iso"]:
+            normalized = legacy_ensure_iso_datetime(todo["due_datetime_iso"], default_offset)
+            if normalized:
+                todo["due_datetime_iso"] = normalized
+            else:
+                warnings.append(f"Could not parse due_datetime_iso: {todo['due_datetime_iso']}")
+                todo["due_datetime_iso"] = None
+        if "due_date_iso" in todo and todo["due_date_iso"]:
+            normalized = legacy_ensure_iso_date(todo["due_date_iso"])
+            if normalized:
+                todo["due_date_iso"] = normalized
+            else:
+                warnings.append(f"Could not parse due_date_iso: {todo['due_date_iso']}")
+                todo["due_date_iso"] = None
+        node["todo"] = todo
+
+    if "calendar_placeholder" in node and node["calendar_placeholder"]:
+        cal = dict(node["calendar_placeholder"])
+        for field in ["start_datetime_iso", "end_datetime_iso"]:
+            if field in cal and cal[field]:
+                normalized = legacy_ensure_iso_datetime(cal[field], default_offset)
+                if normalized:
+                    cal[field] = normalized
+                else:
+                    warnings.append(f"Could not parse {field}: {cal[field]}")
+                    cal[field] = None
+        node["calendar_placeholder"] = cal
+
+    if "time_interpretation" in node and node["time_interpretation"]:
+        ti = dict(node["time_interpretation"])
+        for field in ["resolved_start_iso", "resolved_end_iso"]:
+            if field in ti and ti[field]:
+                normalized = legacy_ensure_iso_datetime(ti[field], default_offset)
+                if normalized:
+                    ti[field] = normalized
+        node["time_interpretation"] = ti
+
+    return node, warnings
+
+
+# --- Inputs ---
+
+# Everyday model output plus shapes where fromisoformat and isoparse disagree
+ISO_CORPUS = [
+    "2026-01-12T17:00:00-05:00", "2026-01-12T17:00:00", "2026-01-12", "2026-01-12T17:00",
+    "2026-01-12T17", "2026-01-12T17:00:00Z", "2026-01-12T17:00:00.123456+05:30",
+    "2026-01-12T17:00:00.1234567", "2026-01-12T17:00:00,5", "2026-01-12 17:00:00",
+    "2026-01-12T24:00:00", "2026-012", "2026-W03-1", "20260112T170000", "20260112",
+    "2026-01", "2026", "17:00", "2026-01-12T17:00:00+0530", "2026-01-12T17:00:00+05",
+    "2026-01-12T17:00:00-05:00:30", "2026-1-5", "2026-01-12T5pm", "tomorrow",
+    "2026-01-12T17:00:00 -05:00", "2026-01-12t17:00:00z", "2026-01-12T17:00:00.5Z",
+    "2026-02-30", "2026-01-12T17:00:60", "2026-01-12T17:00:00+24:00",
+    "2026-01-12T17:00:00UTC", "2026-01-12T17:00:00.Z", "2026-01-12T1700", "", None
+]
+OFFSETS = ["-05:00", "+00:00", "+05:30", "-09:30", "+14:00", "-00:00", "bad", "+5:00"]
+
+
+def build_nodes(count: int, rng: random.Random) -> list[dict]:
+    """Reminder/todo/calendar nodes with the datetime fields a model emits."""
+    def iso():
+        if rng.random() < 0.85:
+            day = rng.randint(1, 28)
+            hour = rng.randint(0, 23)
+            return rng.choice([
+                f"2026-02-{day:02d}T{hour:02d}:30:00",
+                f"2026-02-{day:02d}T{hour:02d}:30:00-05:00",
+                f"2026-02-{day:02d}",
+            ])
+        return rng.choice(ISO_CORPUS)
+
+    nodes = []
+    for index in range(count):
+        kind = index % 3
+        node = {"node_type": ["reminder", "todo", "calendar_placeholder"][kind], "title": "x"}
+        if rng.random() < 0.7:
+            node["time_interpretation"] = {"resolved_start_iso": iso(), "resolved_end_iso": rng.choice([None, iso()])}
+        if kind == 0:
+            node["reminder"] = {
+                "trigger_datetime_iso": rng.choice([None, iso()]),
+                "when": {"resolved_start_iso": iso(), "needs_clarification": rng.random() < 0.2}
+            }
+        elif kind == 1:
+            node["todo"] = {"due_datetime_iso": rng.choice([None, iso()]), "due_date_iso": rng.choice([None, iso()])}
+        else:
+            node["calendar_placeholder"] = {"start_datetime_iso": iso(), "end_datetime_iso": rng.choice([None, iso()])}
+        nodes.append(node)
+    return nodes
+
+
+def check_equivalence(nodes: list[dict]) -> int:
+    mismatches = 0
+
+    def compare(label, expected, actual):
+        nonlocal mismatches
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"MISMATCH {label}\n  legacy:  {expected!r}\n  current: {actual!r}")
+
+    for value in ISO_CORPUS:
+        compare(f"parse_offset({value!r})", legacy_parse_offset_from_user_time_iso(value),
+                time_normalize.parse_offset_from_user_time_iso(value))
+        compare(f"ensure_iso_date({value!r})", legacy_ensure_iso_date(value), time_normalize.ensure_iso_date(value))
+        if value:
+            compare(f"compute_local_day({value!r})", legacy_compute_local_day(value),
+                    time_normalize.compute_local_day(value))
+        for offset in OFFSETS:
+            compare(f"ensure_iso_datetime({value!r}, {offset!r})", legacy_ensure_iso_datetime(value, offset),
+                    time_normalize.ensure_iso_datetime(value, offset))
+
+    for node in nodes:
+        for offset in OFFSETS[:4]:
+            compare(f"normalize_node_times({node!r}, {offset!r})", legacy_normalize_node_times(node, offset),
+                    time_normalize.normalize_node_times(node, offset))
+    return mismatches
+
+
+def time_us(func, nodes: list[dict], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node in nodes:
+            func(node, "-05:00")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(nodes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time normalization")
+    parser.add_argument("--nodes", type=int, default=2000, help="Number of nodes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    nodes = build_nodes(args.nodes, random.Random(args.seed))
+    mismatches = check_equivalence(nodes)
+
+    legacy_us = time_us(legacy_normalize_node_times, nodes, args.repeat)
+    current_us = time_us(time_normalize.normalize_node_times, nodes, args.repeat)
+
+    print(f"nodes:       {len(nodes)}")
+    print(f"mismatches:  {mismatches}")
+    print(f"legacy:      {legacy_us:8.2f} us/node")
+    print(f"current:     {current_us:8.2f} us/node")
+    print(f"speedup:     {legacy_us / current_us:8.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for node validation: per-call jsonschema vs compiled validators.
+
+Builds one valid node per node_type plus randomly corrupted variants, checks
+that the compiled validator (lib/validate.get_node_validator) returns exactly
+the same manual and schema errors as the reference path
+(validate_node_manual + validate_node_jsonschema), also with jsonschema
+treated as missing (no schema checks on either path), then times both per
+node.
+
+Usage:
+  python bench_validate.py
+  python bench_validate.py --nodes 2000 --seed 7
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lib import fast_parse, validate  # noqa: E402
+from lib.schemas import SCHEMA_VERSION  # noqa: E402
+from lib.validate import (  # noqa: E402
+    get_node_validator,
+    validate_node_jsonschema,
+    validate_node_manual,
+    HAS_JSONSCHEMA
+)
+
+USER_TIME_ISO = "2026-01-12T17:00:00-05:00"
+
+CALENDAR_NODE = {
+    "schema_version": SCHEMA_VERSION,
+    "node_type": "calendar_placeholder",
+    "title": "Meeting with Sam",
+    "body": "Meet with Sam tomorrow at 3pm",
+    "tags": ["work"],
+    "status": "active",
+    "confidence": 0.9,
+    "evidence": [{"quote": "meeting with Sam tomorrow at 3pm"}],
+    "location_context": {"location_used": False, "location_relevance": "Not relevant"},
+    "calendar_placeholder": {
+        "intent": "Meet with Sam",
+        "event_title": "Meeting with Sam",
+        "start": {
+            "original_text": "tomorrow at 3pm",
+            "kind": "datetime",
+            "resolved_start_iso": "2026-01-13T15:00:00-05:00",
+            "resolved_end_iso": None,
+            "needs_clarification": False
+        },
+        "duration_minutes": 30,
+        "attendees_text": ["Sam"]
+    }
+}
+
+# Values swapped in to corrupt nodes - wrong types, out of range, too long
+BAD_VALUES = [None, True, 1.5, -3, 2, "x" * 5000, "", [], [1, 2], {}, {"unexpected": 1}, "banana"]
+
+
+def build_valid_nodes() -> list[dict]:
+    """One valid node per node_type."""
+    nodes = [CALENDAR_NODE]
+    for transcript in ["Remind me to call mom at 5pm", "Buy milk", "Note: the wifi password is swordfish"]:
+        tool_use, _ = fast_parse.parse_transcript(transcript, USER_TIME_ISO)
+        nodes.append(tool_use["input"])
+    return nodes
+
+
+def iter_paths(value, path=()):
+    """Yield the path of every dict key and list index in value."""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield path + (key,)
+            yield from iter_paths(child, path + (key,))
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            yield path + (index,)
+            yield from iter_paths(child, path + (index,))
+
+
+def corrupt(node: dict, rng: random.Random) -> dict:
+    """Apply 1-3 random corruptions (replace, delete or add a key)."""
+    node = copy.deepcopy(node)
+    for _ in range(rng.randint(1, 3)):
+        paths = list(iter_paths(node))
+        if not paths:
+            break
+        path = rng.choice(paths)
+        parent = node
+        for part in path[:-1]:
+            parent = parent[part]
+        action = rng.random()
+        if action < 0.6:
+            parent[path[-1]] = copy.deepcopy(rng.choice(BAD_VALUES))
+        elif action < 0.8 and isinstance(parent, dict):
+            del parent[path[-1]]
+        elif isinstance(parent, dict):
+            parent[f"extra_{rng.randint(0, 9)}"] = copy.deepcopy(rng.choice(BAD_VALUES))
+    return node
+
+
+def reference_validate(node: dict):
+    return validate_node_manual(node), validate_node_jsonschema(node)
+
+
+def compiled_validate(node: dict):
+    return get_node_validator(node.get("node_type"))(node)
+
+
+def time_per_node_us(validate, nodes: list[dict], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node in nodes:
+            validate(node)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(nodes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark node validation")
+    parser.add_argument("--nodes", type=int, default=1000, help="Number of nodes to validate")
+    parser.add_argument("--invalid-ratio", type=float, default=0.5, help="Share of corrupted nodes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if not HAS_JSONSCHEMA:
+        print("ERROR: jsonschema is required for the reference path", file=sys.stderr)
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    valid_nodes = build_valid_nodes()
+    nodes = []
+    for index in range(args.nodes):
+        node = valid_nodes[index % len(valid_nodes)]
+        nodes.append(corrupt(node, rng) if rng.random() < args.invalid_ratio else node)
+
+    mismatches = 0
+    try:
+        for has_jsonschema in (True, False):
+            validate.HAS_JSONSCHEMA = has_jsonschema
+            for node in nodes:
+                expected = reference_validate(node)
+                actual = compiled_validate(node)
+                if expected != actual:
+                    mismatches += 1
+                    if mismatches <= 5:
+                        print(f"MISMATCH (jsonschema={has_jsonschema})\n"
+                              f"  reference: {expected}\n  compiled:  {actual}")
+    finally:
+        validate.HAS_JSONSCHEMA = HAS_JSONSCHEMA
+
+    # Build the compiled validators before timing
+    for node_type in ["reminder", "todo", "note", "calendar_placeholder", None]:
+        get_node_validator(node_type)
+
+    reference_us = time_per_node_us(reference_validate, nodes, args.repeat)
+    compiled_us = time_per_node_us(compiled_validate, nodes, args.repeat)
+
+    print(f"nodes:       {len(nodes)} ({args.invalid_ratio:.0%} corrupted)")
+    print(f"mismatches:  {mismatches}")
+    print(f"reference:   {reference_us:8.1f} us/node")
+    print(f"compiled:    {compiled_us:8.1f} us/node")
+    print(f"speedup:     {reference_us / compiled_us:8.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
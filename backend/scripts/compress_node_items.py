@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Compress raw transcripts and payloads of node items written before compression.
+
+Scans the table for node items that still carry plain raw_transcript /
+raw_payload_subset attributes over lib/dynamo.RAW_COMPRESS_THRESHOLD_BYTES
+and rewrites them as the zlib-compressed raw_transcript_z / raw_payload_z
+binary attributes that lib/dynamo.build_node_item now produces. Each
+update is conditional on the item's version, so nodes saved concurrently
+are skipped rather than overwritten; content_hash is unchanged because it
+covers the decompressed values. Safe to re-run.
+
+Usage:
+  python compress_node_items.py --table my-stack-table --dry-run
+  TABLE_NAME=my-stack-table python compress_node_items.py
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lib.dynamo import get_table, build_raw_attributes  # noqa: E402
+
+
+def iter_uncompressed_node_items(table):
+    """Yield node items that still have a plain raw attribute, following scan pages."""
+    kwargs = {
+        "FilterExpression": (
+            Attr("sk").begins_with("day#")
+            & Attr("sk").contains("#node#")
+            & (Attr("raw_transcript").exists() | Attr("raw_payload_subset").exists())
+        ),
+        "ProjectionExpression": "pk, sk, version, raw_transcript, raw_payload_subset"
+    }
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def compressed_updates(item: dict) -> tuple[dict, list[str]]:
+    """The compressed attributes to set and plain attributes to remove for one item."""
+    attributes = build_raw_attributes(
+        item.get("raw_transcript") or "",
+        item.get("raw_payload_subset") or {}
+    )
+    to_set = {}
+    to_remove = []
+    for plain, compressed in (("raw_transcript", "raw_transcript_z"), ("raw_payload_subset", "raw_payload_z")):
+        if compressed in attributes and plain in item:
+            to_set[compressed] = attributes[compressed]
+            to_remove.append(plain)
+    return to_set, to_remove
+
+
+def apply_updates(table, item: dict, to_set: dict, to_remove: list[str]):
+    """Swap plain attributes for compressed ones unless the node changed since the scan."""
+    names = {f"#s{index}": name for index, name in enumerate(to_set)}
+    names.update({f"#r{index}": name for index, name in enumerate(to_remove)})
+    values = {f":s{index}": value for index, value in enumerate(to_set.values())}
+    update_expression = (
+        "SET " + ", ".join(f"#s{index} = :s{index}" for index in range(len(to_set)))
+        + " REMOVE " + ", ".join(f"#r{index}" for index in range(len(to_remove)))
+    )
+
+    if "version" in item:
+        condition = Attr("version").eq(item["version"])
+    else:
+        condition = Attr("pk").exists() & Attr("version").not_exists()
+
+    table.update_item(
+        Key={"pk": item["pk"], "sk": item["sk"]},
+        UpdateExpression=update_expression,
+        ConditionExpression=condition,
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress raw attributes of existing node items")
+    parser.add_argument("--table", default=os.environ.get("TABLE_NAME"), help="DynamoDB table name")
+    parser.add_argument("--dry-run", action="store_true", help="Report savings without writing")
+    args = parser.parse_args()
+
+    if not args.table:
+        print("ERROR: pass --table or set TABLE_NAME", file=sys.stderr)
+        sys.exit(1)
+
+    table = get_table(args.table)
+    scanned = 0
+    candidates = 0
+    compressed = 0
+    skipped = 0
+    plain_bytes = 0
+    compressed_bytes = 0
+
+    for item in iter_uncompressed_node_items(table):
+        scanned += 1
+        to_set, to_remove = compressed_updates(item)
+        if not to_set:
+            continue
+        candidates += 1
+        plain_bytes += sum(len(str(item[name]).encode("utf-8")) for name in to_remove)
+        compressed_bytes += sum(len(value) for value in to_set.values())
+        if args.dry_run:
+            continue
+        try:
+            apply_updates(table, item, to_set, to_remove)
+            compressed += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            skipped += 1
+
+    print(f"items with plain raw attributes: {scanned}")
+    print(f"items over threshold:            {candidates}")
+    print(f"raw bytes (approx):              {plain_bytes} -> {compressed_bytes}")
+    if args.dry_run:
+        print("dry run - nothing written")
+        return
+    print(f"items compressed:                {compressed}")
+    print(f"skipped (changed meanwhile):     {skipped}")
+
+
+if __name__ == "__main__":
+    main()
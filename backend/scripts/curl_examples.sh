@@ -42,6 +42,29 @@ curl -X GET "$BASE_URL/nodes/active?days=14" \
 
 echo ""
 
+# Get Active Nodes one page at a time (pass next_cursor back as cursor)
+echo "=== Get Active Nodes (paged) ==="
+curl -X GET "$BASE_URL/nodes/active?limit=50" \
+  -H "$AUTH_HEADER"
+
+echo ""
+
+# Revalidate Active Nodes (304 Not Modified while nothing changed)
+echo "=== Get Active Nodes (conditional) ==="
+ETAG=$(curl -s -o /dev/null -D - "$BASE_URL/nodes/active" -H "$AUTH_HEADER" | awk 'tolower($1) == "etag:" {print $2}' | tr -d '\r')
+curl -i -X GET "$BASE_URL/nodes/active" \
+  -H "$AUTH_HEADER" \
+  -H "If-None-Match: $ETAG"
+
+echo ""
+
+# Get this week's reminders (local-day range, optional node_type/status)
+echo "=== Get Nodes (day range) ==="
+curl -X GET "$BASE_URL/nodes?from=2026-01-12&to=2026-01-18&node_type=reminder&status=active" \
+  -H "$AUTH_HEADER"
+
+echo ""
+
 # Patch Node
 echo "=== Patch Node ==="
 curl -X PATCH "$BASE_URL/node/123" \
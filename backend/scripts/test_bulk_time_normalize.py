@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Equivalence test for bulk time normalization.
+
+Checks that lib/time_normalize.ensure_iso_datetimes and
+bulk_normalize_node_times give exactly the scalar results
+(ensure_iso_datetime / normalize_node_times) on generated nodes and a
+corpus of odd ISO 8601 strings, with and without IANA zones (tz_name),
+then times the bulk call against the per-node loop.
+
+Usage:
+  python test_bulk_time_normalize.py
+  python test_bulk_time_normalize.py --nodes 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lib import time_normalize  # noqa: E402
+from bench_time_normalize import ISO_CORPUS, OFFSETS, build_nodes  # noqa: E402
+
+TZ_NAMES = [None, "America/Toronto", "Europe/London", "Not/AZone"]
+
+
+def check(nodes: list[dict], offsets: list[str], tz_names: list[str | None]) -> int:
+    """Compare bulk and scalar results. Returns the number of mismatches."""
+    mismatches = 0
+
+    values = [value for value in ISO_CORPUS for _ in OFFSETS for _ in TZ_NAMES]
+    value_offsets = [offset for _ in ISO_CORPUS for offset in OFFSETS for _ in TZ_NAMES]
+    value_tz_names = TZ_NAMES * (len(ISO_CORPUS) * len(OFFSETS))
+    normalized, unparseable = time_normalize.ensure_iso_datetimes(values, value_offsets, value_tz_names)
+    for index, (value, offset, tz_name) in enumerate(zip(values, value_offsets, value_tz_names)):
+        expected = time_normalize.ensure_iso_datetime(value, offset, tz_name)
+        if normalized[index] != expected:
+            mismatches += 1
+            print(f"MISMATCH ensure_iso_datetimes({value!r}, {offset!r}, {tz_name!r}): "
+                  f"{normalized[index]!r} != {expected!r}")
+        if (index in unparseable) != bool(value and expected is None):
+            mismatches += 1
+            print(f"MISMATCH unparseable flag for ({value!r}, {offset!r}, {tz_name!r})")
+
+    bulk_nodes, bulk_warnings = time_normalize.bulk_normalize_node_times(nodes, offsets, tz_names)
+    for node, offset, tz_name, bulk_node, warnings in zip(nodes, offsets, tz_names, bulk_nodes, bulk_warnings):
+        expected = time_normalize.normalize_node_times(node, offset, tz_name)
+        if (bulk_node, warnings) != expected:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"MISMATCH bulk_normalize_node_times({node!r}, {offset!r}, {tz_name!r})\n"
+                      f"  bulk:   {(bulk_node, warnings)!r}\n  scalar: {expected!r}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk time normalization equivalence test")
+    parser.add_argument("--nodes", type=int, default=20000, help="Number of nodes")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    nodes = build_nodes(args.nodes, rng)
+    offsets = [rng.choice(OFFSETS[:6]) for _ in nodes]
+    tz_names = [rng.choice(TZ_NAMES) for _ in nodes]
+
+    failures = check(nodes, offsets, tz_names)
+
+    start = time.perf_counter()
+    time_normalize.bulk_normalize_node_times(nodes, offsets, tz_names)
+    bulk_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for node, offset, tz_name in zip(nodes, offsets, tz_names):
+        time_normalize.normalize_node_times(node, offset, tz_name)
+    scalar_s = time.perf_counter() - start
+
+    print(f"mismatches: {failures}  bulk: {bulk_s:.3f}s  scalar loop: {scalar_s:.3f}s  ({len(nodes)} nodes)")
+
+    if failures:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Check for lib/ingest_session.merge_nodes.
+
+A session whose utterances produced a mix of real nodes and fallback notes
+(Bedrock failed or validation rejected one utterance) must keep the
+fallback content, and drop a fallback only when a real node already
+carries its text.
+
+Usage:
+  python test_ingest_session_merge.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lib.ingest_session import merge_nodes  # noqa: E402
+from lib.validate import create_fallback_note  # noqa: E402
+
+
+def real_node(node_type: str, title: str, quote: str) -> dict:
+    return {
+        "node_type": node_type,
+        "title": title,
+        "body": quote,
+        "evidence": [{"quote": quote}],
+        "parse_debug": {"fallback_used": False}
+    }
+
+
+def fallback_node(text: str) -> dict:
+    node = create_fallback_note(title="Captured Note", body=text, warnings=[])
+    node["parse_debug"] = {"fallback_used": True}
+    return node
+
+
+def main():
+    failures = 0
+
+    def check(name: str, condition: bool):
+        nonlocal failures
+        print(f"{'ok  ' if condition else 'FAIL'} {name}")
+        failures += not condition
+
+    milk = real_node("todo", "Buy milk", "I need to buy milk.")
+    lost = fallback_node("Ask Priya about the venue deposit before Friday.")
+    merged = merge_nodes([milk, lost])
+    check("mixed session keeps the fallback note", lost in merged and milk in merged)
+
+    other = fallback_node("Pick a date for the offsite.")
+    merged = merge_nodes([milk, lost, other])
+    check("distinct fallback notes are not merged by their shared title", len(merged) == 3)
+
+    covered = fallback_node("I need to buy milk.")
+    merged = merge_nodes([milk, covered])
+    check("fallback covered by a real node is dropped", merged == [milk])
+
+    merged = merge_nodes([lost, fallback_node("Ask Priya about the venue deposit before Friday.")])
+    check("repeated fallback text is kept once", len(merged) == 1)
+
+    merged = merge_nodes([lost])
+    check("fallback-only session keeps its note", merged == [lost])
+
+    first = real_node("reminder", "Call mom", "remind me to call mom at 7")
+    corrected = real_node("reminder", "Call mom", "actually make it 8pm")
+    merged = merge_nodes([first, corrected])
+    check("later real node with the same title wins", merged == [corrected])
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Handler for deleting or completing many nodes in one request."""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.response import api_response, error_response
+from lib.auth import get_user_id
+from lib.dynamo import (
+    find_node_sks,
+    batch_get_items,
+    batch_write_items,
+    complete_node_item,
+    bump_change_version
+)
+from lib.json_utils import parse_body
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+MAX_BATCH_NODE_IDS = 100
+# Parallel conditional UpdateItems per batch-complete request
+COMPLETE_CONCURRENCY = 10
+
+
+def parse_node_ids(event: dict) -> tuple[list[str] | None, str | None]:
+    """Read {"node_ids": [...]} from the body, deduplicated in order. Returns (node_ids, error_message)."""
+    try:
+        body = parse_body(event) or {}
+    except json.JSONDecodeError:
+        return None, "Invalid JSON in request body"
+    if not isinstance(body, dict):
+        return None, "Request body must be a JSON object"
+
+    node_ids = body.get("node_ids")
+    if (
+        not isinstance(node_ids, list)
+        or not node_ids
+        or not all(isinstance(node_id, str) and node_id for node_id in node_ids)
+    ):
+        return None, "node_ids must be a non-empty list of node ID strings"
+
+    node_ids = list(dict.fromkeys(node_ids))
+    if len(node_ids) > MAX_BATCH_NODE_IDS:
+        return None, f"At most {MAX_BATCH_NODE_IDS} node_ids per request"
+    return node_ids, None
+
+
+def load_node_items(user_id: str, node_ids: list[str], projection: list[str] = None) -> dict[str, dict]:
+    """Resolve node_ids and read their node items. Returns {node_id: item} for nodes that exist."""
+    sks = find_node_sks(user_id, node_ids)
+    pk = f"user#{user_id}"
+    items = batch_get_items([{"pk": pk, "sk": sk} for sk in sks.values()], projection=projection)
+    return {item["node_id"]: item for item in items}
+
+
+def build_results(
+    node_ids: list[str],
+    found: dict,
+    failed_node_ids: set,
+    success_status: str,
+    conflict_node_ids: set = frozenset(),
+    versions: dict = None
+) -> dict:
+    """Per-ID results in request order plus summary counts."""
+    versions = versions or {}
+    results = []
+    for node_id in node_ids:
+        if node_id not in found:
+            status = "not_found"
+        elif node_id in failed_node_ids:
+            status = "failed"
+        elif node_id in conflict_node_ids:
+            status = "conflict"
+        else:
+            status = success_status
+        result = {"node_id": node_id, "status": status}
+        if status == success_status and node_id in versions:
+            result["version"] = versions[node_id]
+        results.append(result)
+
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    return {
+        "ok": not failed_node_ids and not conflict_node_ids,
+        "results": results,
+        "counts": counts
+    }
+
+
+def batch_delete(user_id: str, node_ids: list[str]) -> dict:
+    """POST /nodes/batch-delete - delete node items and their pointers."""
+    found = load_node_items(user_id, node_ids, projection=["pk", "sk", "node_id"])
+
+    pk = f"user#{user_id}"
+    delete_keys = [{"pk": pk, "sk": item["sk"]} for item in found.values()]
+    # Pointers are removed for every requested ID, which also clears stale ones
+    delete_keys += [{"pk": pk, "sk": f"node#{node_id}"} for node_id in node_ids]
+    unprocessed = batch_write_items(delete_keys=delete_keys)
+    if found:
+        bump_change_version(user_id)
+
+    # A node only counts as deleted once its node item is gone
+    sk_to_node_id = {item["sk"]: node_id for node_id, item in found.items()}
+    failed_node_ids = {
+        sk_to_node_id[request["DeleteRequest"]["Key"]["sk"]]
+        for request in unprocessed
+        if request["DeleteRequest"]["Key"]["sk"] in sk_to_node_id
+    }
+    return build_results(node_ids, found, failed_node_ids, "deleted")
+
+
+def complete_one(item: dict) -> tuple[str, int | None]:
+    """Complete one node item. Returns (outcome, new_version), outcome being completed/conflict/failed."""
+    try:
+        version = complete_node_item(item)
+    except Exception as e:
+        logger.error(f"Error completing node {item['node_id']}: {str(e)}")
+        return "failed", None
+    return ("completed", version) if version is not None else ("conflict", None)
+
+
+def batch_complete(user_id: str, node_ids: list[str]) -> dict:
+    """
+    POST /nodes/batch-complete - mark nodes completed and drop them from the active index.
+
+    Each node is written with an UpdateItem conditioned on the version that
+    was read, so a save that lands in between is reported as a conflict
+    instead of being overwritten.
+    """
+    found = load_node_items(user_id, node_ids)
+
+    # Nodes that are already completed need no write
+    items = [item for item in found.values() if item.get("status") != "completed"]
+    with ThreadPoolExecutor(max_workers=COMPLETE_CONCURRENCY) as executor:
+        outcomes = dict(zip((item["node_id"] for item in items), executor.map(complete_one, items)))
+    if any(outcome == "completed" for outcome, _ in outcomes.values()):
+        bump_change_version(user_id)
+
+    failed_node_ids = {node_id for node_id, (outcome, _) in outcomes.items() if outcome == "failed"}
+    conflict_node_ids = {node_id for node_id, (outcome, _) in outcomes.items() if outcome == "conflict"}
+    versions = {node_id: version for node_id, (_, version) in outcomes.items() if version is not None}
+    return build_results(node_ids, found, failed_node_ids, "completed", conflict_node_ids, versions)
+
+
+def handler(event, context):
+    """
+    Bulk node handler.
+
+    POST /nodes/batch-delete     {"node_ids": [...]}
+    POST /nodes/batch-complete   {"node_ids": [...]}
+
+    Node keys are resolved with one BatchGetItem pass. Deletes are written in
+    25-item BatchWriteItem chunks, completes as version-conditioned
+    UpdateItems. Returns a status per node_id: deleted/completed (with the
+    new version), not_found, conflict (changed since it was read; reload
+    it) or failed (safe to resend).
+    """
+    user_id = get_user_id(event)
+    if not user_id:
+        return error_response(401, "Unauthorized: user ID not found")
+
+    path = event.get("resource") or event.get("path") or ""
+    if path.endswith("/batch-delete"):
+        action = "delete"
+    elif path.endswith("/batch-complete"):
+        action = "complete"
+    else:
+        return error_response(404, f"Unknown batch endpoint '{path}'")
+
+    node_ids, error = parse_node_ids(event)
+    if error:
+        return error_response(400, error)
+
+    try:
+        if action == "delete":
+            response_body = batch_delete(user_id, node_ids)
+        else:
+            response_body = batch_complete(user_id, node_ids)
+
+        logger.info(json.dumps({
+            "action": f"batch_{action}_nodes",
+            "user_id": user_id,
+            "requested": len(node_ids),
+            "counts": response_body["counts"]
+        }))
+
+        return api_response(200, response_body)
+
+    except Exception as e:
+        logger.error(f"Error in batch {action}: {str(e)}", exc_info=True)
+        return error_response(500, f"Batch {action} failed: {str(e)}")
@@ -3,7 +3,7 @@ import logging
 
 from lib.response import api_response, error_response
 from lib.auth import get_user_id
-from lib.dynamo import put_node_item
+from lib.dynamo import put_node_item, NodeVersionConflictError
 from lib.ids import generate_node_id
 from lib.json_utils import parse_body
 from lib.time_normalize import compute_local_day, utc_now_iso
@@ -20,6 +20,12 @@ def handler(event, context):
     - node: (required) The node object to save
     - node_id: (optional) Node ID, will be generated if not provided
     - captured_at_iso: (optional) ISO timestamp when captured, defaults to created_at_iso
+    - user_timezone: (optional) IANA zone used to bucket the node by local day,
+      defaults to the node's timezone_name
+    - expected_version: (optional) version the client last saw; the save
+      fails with 409 if the node changed since (0 = must be new)
+    
+    Re-saving identical content is a no-op (changed: false).
     """
     # Get user ID from event
     user_id = get_user_id(event)
@@ -56,8 +62,8 @@ def handler(event, context):
     created_at_iso = node.get("created_at_iso") or utc_now_iso()
     captured_at_iso = node.get("captured_at_iso") or body.get("captured_at_iso") or created_at_iso
     
-    # Compute local_day from captured_at_iso
-    local_day = compute_local_day(captured_at_iso)
+    # Compute local_day from captured_at_iso, in the user's zone when known
+    local_day = compute_local_day(captured_at_iso, body.get("user_timezone") or node.get("timezone_name"))
     
     # Extract raw_transcript if available (for backwards compatibility)
     raw_transcript = body.get("raw_transcript") or node.get("raw_transcript") or ""
@@ -68,9 +74,15 @@ def handler(event, context):
     # Ensure node has node_id
     node["node_id"] = node_id
     
+    expected_version = body.get("expected_version")
+    if expected_version is not None and (
+        not isinstance(expected_version, int) or isinstance(expected_version, bool) or expected_version < 0
+    ):
+        return error_response(400, "expected_version must be a non-negative integer")
+    
     try:
         # Save to DynamoDB
-        put_node_item(
+        result = put_node_item(
             user_id=user_id,
             local_day=local_day,
             node_id=node_id,
@@ -78,7 +90,8 @@ def handler(event, context):
             raw_payload_subset=raw_payload_subset,
             node_obj=node,
             captured_at_iso=captured_at_iso,
-            created_at_iso=created_at_iso
+            created_at_iso=created_at_iso,
+            expected_version=expected_version
         )
         
         logger.info(json.dumps({
@@ -86,15 +99,29 @@ def handler(event, context):
             "node_id": node_id,
             "user_id": user_id,
             "node_type": node.get("node_type"),
-            "local_day": local_day
+            "local_day": local_day,
+            "version": result["version"],
+            "changed": result["changed"]
         }))
         
         return api_response(200, {
             "ok": True,
             "node_id": node_id,
-            "message": "Node saved successfully"
+            "version": result["version"],
+            "changed": result["changed"],
+            "message": "Node saved successfully" if result["changed"] else "Node already up to date"
         })
     
+    except NodeVersionConflictError as e:
+        logger.warning(json.dumps({
+            "action": "complete_node_conflict",
+            "node_id": node_id,
+            "user_id": user_id,
+            "expected_version": expected_version,
+            "current_version": e.current_version
+        }))
+        return api_response(409, {"error": str(e), "current_version": e.current_version})
+    
     except Exception as e:
         logger.error(f"Error saving node: {str(e)}", exc_info=True)
         return error_response(500, f"Failed to save node: {str(e)}")
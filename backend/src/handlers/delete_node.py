@@ -5,7 +5,7 @@ import logging
 
 from lib.response import api_response, error_response
 from lib.auth import get_user_id
-from lib.dynamo import query_items, delete_item
+from lib.dynamo import find_node_sk, delete_node_item
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -34,8 +34,7 @@ def handler(event, context):
         return error_response(400, "node_id is required in path parameters")
     
     try:
-        # Query all nodes for this user to find the one with matching node_id
-        # We need to find the item to get its sk (sort key) for deletion
+        # Resolve the node's sort key through its node#{node_id} pointer item
         pk = f"user#{user_id}"
         
         logger.info(json.dumps({
@@ -45,17 +44,11 @@ def handler(event, context):
             "pk": pk
         }))
         
-        # Query all items for this user
-        items = query_items(pk=pk)
+        item_sk = find_node_sk(user_id, node_id)
         
-        # Find the item with matching node_id
-        target_item = None
-        for item in items:
-            if item.get("node_id") == node_id:
-                target_item = item
-                break
-        
-        if not target_item:
+        # The pointer lives in the user's own partition, so a missing node
+        # (or another user's node) is simply not found
+        if not item_sk or not delete_node_item(user_id, node_id, item_sk):
             logger.warning(json.dumps({
                 "action": "delete_node_not_found",
                 "user_id": user_id,
@@ -63,38 +56,11 @@ def handler(event, context):
             }))
             return error_response(404, f"Node with id '{node_id}' not found for this user")
         
-        # Extract pk and sk from the found item
-        item_pk = target_item.get("pk")
-        item_sk = target_item.get("sk")
-        
-        if not item_pk or not item_sk:
-            logger.error(json.dumps({
-                "action": "delete_node_invalid_item",
-                "user_id": user_id,
-                "node_id": node_id,
-                "item": target_item
-            }))
-            return error_response(500, "Invalid node item structure")
-        
-        # Verify the pk matches the user (security check)
-        if item_pk != pk:
-            logger.error(json.dumps({
-                "action": "delete_node_pk_mismatch",
-                "user_id": user_id,
-                "node_id": node_id,
-                "expected_pk": pk,
-                "item_pk": item_pk
-            }))
-            return error_response(403, "Node does not belong to this user")
-        
-        # Delete the item
-        delete_item(pk=item_pk, sk=item_sk)
-        
         logger.info(json.dumps({
             "action": "delete_node_complete",
             "user_id": user_id,
             "node_id": node_id,
-            "pk": item_pk,
+            "pk": pk,
             "sk": item_sk
         }))
         
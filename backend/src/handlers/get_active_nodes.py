@@ -2,78 +2,163 @@
 
 import json
 import logging
+import time
 
-from lib.response import api_response, error_response
+from lib import response_cache
+from lib.response import error_response, serialized_response, not_modified_response
 from lib.auth import get_user_id
-from lib.dynamo import query_items
+from lib.json_utils import dumps
+from lib.dynamo import query_items, query_page, get_change_marker, ACTIVE_INDEX_NAME
+
+# The only non-key attributes projected into the active index
+NODE_PROJECTION = ["node_id", "node", "version"]
+MAX_PAGE_LIMIT = 100
+# The active index is eventually consistent: right after a write it may
+# still return the old list, so no ETag is issued (and nothing is cached)
+# until the change marker is this old
+INDEX_SETTLE_MS = 2000
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
+def parse_page_params(event: dict) -> tuple[int | None, str | None, str | None]:
+    """Read the limit/cursor query params. Returns (limit, cursor, error_message)."""
+    params = event.get("queryStringParameters") or {}
+    limit = params.get("limit")
+    cursor = params.get("cursor") or None
+    
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return None, None, "limit must be an integer"
+        if not 1 <= limit <= MAX_PAGE_LIMIT:
+            return None, None, f"limit must be between 1 and {MAX_PAGE_LIMIT}"
+    elif cursor:
+        limit = MAX_PAGE_LIMIT
+    
+    return limit, cursor, None
+
+
 def handler(event, context):
     """
     Get active nodes handler.
     
-    Retrieves all nodes for the authenticated user from DynamoDB.
+    Retrieves the active nodes for the authenticated user from the sparse
+    active-index GSI, newest first. Completed nodes and non-node items
+    (jobs, sessions, local todo#/note# actions) are not in the index.
     Uses the user ID from the JWT token claims.
     
+    Query parameters (optional):
+        - limit: Page size (1-100)
+        - cursor: next_cursor from the previous page
+    Without either, every node is returned in one response.
+    
+    Responses carry an ETag derived from the user's change marker (see
+    lib/dynamo.bump_change_version); a request whose If-None-Match still
+    matches gets a 304 without querying the index, and unchanged bodies
+    are served from a per-container LRU (lib/response_cache).
+    
     Returns:
-        - nodes: List of all node objects for the user
-        - node_ids: List of all node IDs for the user
+        - nodes: List of node objects
+        - node_ids: List of node IDs
+        - node_versions: Stored version of each node (send as expected_version)
+        - next_cursor: Cursor for the next page, or null when there is none
     """
     # Get user ID from event (extracted from JWT token by API Gateway)
     user_id = get_user_id(event)
     if not user_id:
         return error_response(401, "Unauthorized: user ID not found")
     
+    limit, cursor, error = parse_page_params(event)
+    if error:
+        return error_response(400, error)
+    
     try:
-        # Query all nodes for this user
-        # pk format: user#{user_id}
-        # sk format: day#{local_day}#node#{node_id}
-        # We query by pk only to get all nodes regardless of day
+        # Query the active nodes for this user
+        # active_pk format: user#{user_id}
+        # active_sk format: {created_at_iso}#{node_id}
         pk = f"user#{user_id}"
         
         logger.info(json.dumps({
             "action": "get_active_nodes",
             "user_id": user_id,
-            "pk": pk
+            "pk": pk,
+            "limit": limit,
+            "has_cursor": bool(cursor)
         }))
         
-        # Query all items for this user (no sk_prefix means get all)
-        items = query_items(pk=pk)
+        marker = get_change_marker(user_id)
+        request_key = f"active|{limit}|{cursor}"
+        etag = None
+        if time.time() * 1000 - marker["changed_at_ms"] >= INDEX_SETTLE_MS:
+            etag = response_cache.build_etag(user_id, request_key, marker["version"])
+            headers = event.get("headers") or {}
+            if_none_match = headers.get("if-none-match") or headers.get("If-None-Match")
+            if response_cache.etag_matches(if_none_match, etag):
+                logger.info(json.dumps({"action": "get_active_nodes_not_modified", "user_id": user_id}))
+                return not_modified_response(etag)
+            cached = response_cache.get(user_id, request_key, marker["version"])
+            if cached:
+                logger.info(json.dumps({"action": "get_active_nodes_cache_hit", "user_id": user_id}))
+                return serialized_response(200, cached[1], {"ETag": etag, "Cache-Control": "private, no-cache"})
         
-        # Extract nodes and node_ids from the items
+        next_cursor = None
+        if limit:
+            try:
+                items, next_cursor = query_page(
+                    pk=pk,
+                    limit=limit,
+                    cursor=cursor,
+                    projection=NODE_PROJECTION,
+                    newest_first=True,
+                    index_name=ACTIVE_INDEX_NAME
+                )
+            except ValueError as e:
+                return error_response(400, str(e))
+        else:
+            items = query_items(
+                pk=pk,
+                projection=NODE_PROJECTION,
+                index_name=ACTIVE_INDEX_NAME,
+                newest_first=True
+            )
+        
+        # Extract nodes and node_ids from the items (already newest first)
         nodes = []
         node_ids = []
+        node_versions = []
         
         for item in items:
-            # Each item has: pk, sk, node_id, node, and other metadata
+            # Each item has: the table and index keys, node_id and node
             if "node" in item:
                 nodes.append(item["node"])
             if "node_id" in item:
                 node_ids.append(item["node_id"])
-        
-        # Sort nodes by created_at_iso (newest first) if available
-        try:
-            nodes.sort(key=lambda n: n.get("created_at_iso", ""), reverse=True)
-        except (KeyError, TypeError):
-            # If sorting fails, just return in whatever order
-            pass
+                # Clients send it back as expected_version when saving
+                node_versions.append(int(item.get("version", 0)))
         
         logger.info(json.dumps({
             "action": "get_active_nodes_complete",
             "user_id": user_id,
             "nodes_count": len(nodes),
-            "node_ids_count": len(node_ids)
+            "node_ids_count": len(node_ids),
+            "has_more": bool(next_cursor)
         }))
         
-        return api_response(200, {
+        body = dumps({
             "ok": True,
             "nodes": nodes,
             "node_ids": node_ids,
-            "count": len(nodes)
+            "node_versions": node_versions,
+            "count": len(nodes),
+            "next_cursor": next_cursor
         })
+        if not etag:
+            return serialized_response(200, body)
+        response_cache.put(user_id, request_key, marker["version"], etag, body)
+        return serialized_response(200, body, {"ETag": etag, "Cache-Control": "private, no-cache"})
     
     except Exception as e:
         logger.error(f"Error getting nodes: {str(e)}", exc_info=True)
@@ -0,0 +1,123 @@
+"""Handler for querying a user's nodes by local-day range."""
+
+import json
+import logging
+from datetime import date
+
+from lib.response import api_response, error_response
+from lib.auth import get_user_id
+from lib.dynamo import query_nodes_by_day_range
+from lib.validate import VALID_NODE_TYPES
+from handlers.get_active_nodes import parse_page_params, NODE_PROJECTION
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+NODE_STATUSES = ("active", "completed")
+# Keeps a single request to a bounded key range
+MAX_RANGE_DAYS = 366
+
+
+def parse_range_params(event: dict) -> tuple[dict | None, str | None]:
+    """Read the from/to/node_type/status query params. Returns (filters, error_message)."""
+    params = event.get("queryStringParameters") or {}
+    start_day = params.get("from")
+    end_day = params.get("to") or start_day
+    if not start_day:
+        return None, "from is required (YYYY-MM-DD)"
+
+    try:
+        start = date.fromisoformat(start_day)
+        end = date.fromisoformat(end_day)
+    except ValueError:
+        return None, "from and to must be dates in YYYY-MM-DD format"
+    if len(start_day) != 10 or len(end_day) != 10:
+        return None, "from and to must be dates in YYYY-MM-DD format"
+    if end < start:
+        return None, "to must not be before from"
+    if (end - start).days >= MAX_RANGE_DAYS:
+        return None, f"Date range must not exceed {MAX_RANGE_DAYS} days"
+
+    node_type = params.get("node_type") or None
+    if node_type and node_type not in VALID_NODE_TYPES:
+        return None, f"node_type must be one of {VALID_NODE_TYPES}"
+
+    status = params.get("status") or None
+    if status and status not in NODE_STATUSES:
+        return None, f"status must be one of {list(NODE_STATUSES)}"
+
+    return {
+        "start_day": start_day,
+        "end_day": end_day,
+        "node_type": node_type,
+        "status": status
+    }, None
+
+
+def handler(event, context):
+    """
+    Get nodes handler.
+
+    GET /nodes?from=YYYY-MM-DD[&to=YYYY-MM-DD][&node_type=...][&status=...]
+
+    Returns the user's nodes whose local day falls in from..to (inclusive,
+    to defaults to from), oldest day first. Only that range of the day#
+    sort key is read; node_type and status narrow the result further.
+
+    Query parameters (optional):
+        - limit: Page size (1-100)
+        - cursor: next_cursor from the previous page
+    """
+    user_id = get_user_id(event)
+    if not user_id:
+        return error_response(401, "Unauthorized: user ID not found")
+
+    filters, error = parse_range_params(event)
+    if error:
+        return error_response(400, error)
+
+    limit, cursor, error = parse_page_params(event)
+    if error:
+        return error_response(400, error)
+
+    try:
+        logger.info(json.dumps({
+            "action": "get_nodes",
+            "user_id": user_id,
+            "limit": limit,
+            "has_cursor": bool(cursor),
+            **filters
+        }))
+
+        try:
+            items, next_cursor = query_nodes_by_day_range(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                projection=NODE_PROJECTION,
+                **filters
+            )
+        except ValueError as e:
+            return error_response(400, str(e))
+
+        nodes = [item["node"] for item in items if "node" in item]
+        node_ids = [item["node_id"] for item in items if "node_id" in item]
+
+        logger.info(json.dumps({
+            "action": "get_nodes_complete",
+            "user_id": user_id,
+            "nodes_count": len(nodes),
+            "has_more": bool(next_cursor)
+        }))
+
+        return api_response(200, {
+            "ok": True,
+            "nodes": nodes,
+            "node_ids": node_ids,
+            "count": len(nodes),
+            "next_cursor": next_cursor
+        })
+
+    except Exception as e:
+        logger.error(f"Error querying nodes: {str(e)}", exc_info=True)
+        return error_response(500, f"Failed to query nodes: {str(e)}")
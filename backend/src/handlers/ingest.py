@@ -2,13 +2,27 @@
 
 import json
 import os
+import time
 import logging
 from typing import Any
 
 from lib.response import api_response, error_response
-from lib.bedrock_converse import call_converse
+from lib.auth import get_user_id
+from lib.dynamo import put_node_items
+from lib.bedrock_converse import (
+    call_converse,
+    classify_intents,
+    extract_usage,
+    get_prompt_version,
+    is_circuit_open,
+    route_model,
+    deadline_from_context,
+    CircuitOpenError
+)
+from lib import ingest_cache, fast_parse
 from lib.time_normalize import (
-    parse_offset_from_user_time_iso,
+    resolve_user_offset,
+    get_zone,
     compute_local_day,
     utc_now_iso,
     normalize_node_times
@@ -34,18 +48,38 @@ def parse_request_body(event: dict) -> tuple[dict | None, str | None]:
     except json.JSONDecodeError:
         return None, "Invalid JSON in request body"
     
-    # Validate required fields
-    transcript = body.get("transcript", "").strip()
-    if not transcript:
-        return None, "transcript is required and must be non-empty"
-    
-    user_time_iso = body.get("user_time_iso", "").strip()
-    if not user_time_iso:
-        return None, "user_time_iso is required"
+    error = validate_ingest_fields(body)
+    if error:
+        return None, error
     
     return body, None
 
 
+def validate_ingest_fields(body: dict) -> str | None:
+    """Check the fields every ingest request needs. Returns an error message or None."""
+    if not isinstance(body, dict):
+        return "Request body must be a JSON object"
+    
+    transcript = body.get("transcript")
+    if not isinstance(transcript, str) or not transcript.strip():
+        return "transcript is required and must be a non-empty string"
+    
+    return validate_context_fields(body)
+
+
+def validate_context_fields(body: dict) -> str | None:
+    """Check the time context fields shared by ingest requests and sessions. Returns an error message or None."""
+    user_time_iso = body.get("user_time_iso")
+    if not isinstance(user_time_iso, str) or not user_time_iso.strip():
+        return "user_time_iso is required and must be a string"
+    
+    user_timezone = body.get("user_timezone")
+    if user_timezone is not None and (not isinstance(user_timezone, str) or get_zone(user_timezone) is None):
+        return "user_timezone must be an IANA time zone name like America/Toronto"
+    
+    return None
+
+
 def build_user_payload(body: dict) -> dict:
     """Build the payload to send to Bedrock."""
     user_time_iso = body["user_time_iso"]
@@ -55,13 +89,16 @@ def build_user_payload(body: dict) -> dict:
     if not user_location:
         user_location = {"kind": "unknown"}
     
-    return {
+    payload = {
         "transcript": body["transcript"],
         "transcript_meta": body.get("transcript_meta", {}),
         "captured_at_iso": captured_at_iso,
         "user_time_iso": user_time_iso,
         "user_location": user_location
     }
+    if body.get("user_timezone"):
+        payload["user_timezone"] = body["user_timezone"]
+    return payload
 
 
 def finalize_node(
@@ -72,15 +109,24 @@ def finalize_node(
     model_id: str,
     latency_ms: int,
     tool_name: str,
-    fallback_used: bool
+    fallback_used: bool,
+    debug: dict | None = None,
+    timezone_name: str | None = None
 ) -> dict:
-    """Add server-side fields to the node."""
+    """
+    Add server-side fields to the node. debug holds extra parse_debug fields.
+    
+    timezone keeps the offset-only form; timezone_name is the IANA zone when
+    the client sent one.
+    """
     node = dict[Any, Any](node)
     
     # Set server timestamps
     node["created_at_iso"] = created_at_iso
     node["captured_at_iso"] = captured_at_iso
     node["timezone"] = timezone_offset
+    if timezone_name:
+        node["timezone_name"] = timezone_name
     
     # Ensure schema version
     node["schema_version"] = SCHEMA_VERSION
@@ -90,159 +136,233 @@ def finalize_node(
         "model_id": model_id,
         "latency_ms": latency_ms,
         "tool_name_used": tool_name or "none",
-        "fallback_used": fallback_used
+        "fallback_used": fallback_used,
+        "cache_hit": False
     }
+    if debug:
+        node["parse_debug"].update(debug)
     
     return node
 
 
-def handler(event, context):
+def build_node(
+    tool_name: str | None,
+    tool_input: dict | None,
+    transcript: str,
+    captured_at_iso: str,
+    created_at_iso: str,
+    timezone_offset: str,
+    model_id: str,
+    latency_ms: int,
+    warnings: list[str],
+    user_id: str,
+    debug: dict | None = None,
+    timezone_name: str | None = None
+) -> dict:
     """
-    Ingest handler - processes voice transcripts into structured nodes.
+    Turn one model tool call into a finalized node.
     
-    Input: JSON with transcript, user_time_iso, optional user_location
-    Output: JSON with ok, node_id, node
+    Runs time normalization and validation, falls back to a note when the tool
+    input is missing, then adds server fields and a fresh node_id.
     """
-    # Parse request
-    body, error = parse_request_body(event)
-    if error:
-        return error_response(400, error)
+    all_warnings = list(warnings)
+    fallback_used = False
+    
+    if not tool_input:
+        if tool_name:
+            all_warnings.append("Model did not return a tool input - using fallback")
+        else:
+            all_warnings.append("Model did not return a tool call - using fallback")
+        node = create_fallback_note(
+            title="Captured Note",
+            body=transcript,
+            warnings=all_warnings
+        )
+        fallback_used = True
+    else:
+        node = tool_input
+    
+    node, time_warnings = normalize_node_times(node, timezone_offset, timezone_name)
+    all_warnings.extend(time_warnings)
+    node, validation_warnings, validation_fallback = validate_node(node, transcript)
+    all_warnings.extend(validation_warnings)
+    fallback_used = fallback_used or validation_fallback
+    
+    node = finalize_node(
+        node=node,
+        captured_at_iso=captured_at_iso,
+        created_at_iso=created_at_iso,
+        timezone_offset=timezone_offset,
+        model_id=model_id,
+        latency_ms=latency_ms,
+        tool_name=tool_name,
+        fallback_used=fallback_used,
+        debug=debug,
+        timezone_name=timezone_name
+    )
+    
+    existing_warnings = node.get("global_warnings", [])
+    node["global_warnings"] = list(set(existing_warnings + all_warnings))
+    
+    # Add node_id to the node object
+    node["node_id"] = generate_node_id()
+    
+    logger.info(json.dumps({
+        "action": "ingest_complete",
+        "node_id": node["node_id"],
+        "node_type": node.get("node_type"),
+        "tool_used": tool_name,
+        "latency_ms": latency_ms,
+        "fallback_used": fallback_used,
+        "user_id": user_id
+    }))
+    
+    return node
+
+
+def ingest_transcript(body: dict, deadline: float | None = None, user_id: str | None = None) -> list[dict]:
+    """
+    Run the full ingest pipeline for one validated request body.
     
-    user_id = body.get("user_id", "demo")
+    Calls Bedrock, then builds one finalized node per tool call (or a single
+    fallback note if the model returned none). Returns the list of nodes.
+    deadline is a time.monotonic() value that bounds Bedrock retries.
+    user_id is the authenticated user (lib/auth.get_user_id) and scopes the
+    result cache, which is skipped without one; the body's client-supplied
+    user_id is ignored.
+    """
     transcript = body["transcript"]
     user_time_iso = body["user_time_iso"]
     captured_at_iso = body.get("captured_at_iso") or user_time_iso
     
-    # Extract timezone offset for time normalization
-    timezone_offset = parse_offset_from_user_time_iso(user_time_iso)
+    # Extract timezone offset (and the IANA zone, if sent) for time normalization
+    timezone_name = body.get("user_timezone") or None
+    timezone_offset = resolve_user_offset(user_time_iso, timezone_name)
     created_at_iso = utc_now_iso()
     
     # Build payload for Bedrock
     user_payload = build_user_payload(body)
     
-    # Get model ID from environment
-    model_id = os.environ.get("BEDROCK_MODEL_ID", DEFAULT_MODEL_ID)
+    # Trivial captures are parsed locally without a model call
+    if fast_parse.is_enabled():
+        start_time = time.time()
+        fast_tool_use = fast_parse.try_fast_path(transcript, user_time_iso, user_id)
+        if fast_tool_use:
+            return [build_node(
+                tool_name=fast_tool_use["name"],
+                tool_input=fast_tool_use["input"],
+                transcript=transcript,
+                captured_at_iso=captured_at_iso,
+                created_at_iso=created_at_iso,
+                timezone_offset=timezone_offset,
+                model_id=fast_parse.FAST_PATH_MODEL_ID,
+                latency_ms=int((time.time() - start_time) * 1000),
+                warnings=[],
+                user_id=user_id,
+                debug={"route": "local"},
+                timezone_name=timezone_name
+            )]
+    
+    # Route to a model by transcript complexity, switching to the cheaper
+    # fallback model while the routed model's circuit breaker is open
+    model_id, route = route_model(transcript, os.environ.get("BEDROCK_MODEL_ID", DEFAULT_MODEL_ID))
+    fallback_model_id = os.environ.get("BEDROCK_FALLBACK_MODEL_ID")
+    if fallback_model_id and is_circuit_open(model_id):
+        model_id, route = fallback_model_id, "fallback"
+    
+    # Serve re-submitted transcripts from the result cache
+    cache_key = None
+    if user_id and ingest_cache.is_enabled():
+        cache_key = ingest_cache.build_cache_key(user_payload, model_id, get_prompt_version(), user_id)
+        cached_nodes = ingest_cache.get_cached_nodes(cache_key)
+        if cached_nodes:
+            return refresh_cached_nodes(cached_nodes, captured_at_iso, created_at_iso, user_id)
     
     # Call Bedrock
     tool_uses = []
     latency_ms = 0
+    debug = {"route": route}
     error_warnings = []
     
     try:
-        tool_uses, raw_response, latency_ms = call_converse(model_id, user_payload)
+        tool_uses, raw_response, latency_ms = call_converse(
+            model_id, user_payload, deadline=deadline, node_types=classify_intents(transcript)
+        )
+        debug.update(extract_usage(raw_response))
+    except CircuitOpenError as e:
+        # Bedrock is browning out - accept a rougher local parse over a fallback note
+        logger.warning(f"Bedrock circuit open: {str(e)}")
+        degraded_tool_use = fast_parse.try_fast_path(
+            transcript, user_time_iso, user_id, threshold=fast_parse.DEGRADED_MIN_CONFIDENCE
+        )
+        if degraded_tool_use:
+            error_warnings.append("Bedrock unavailable - parsed locally")
+            tool_uses = [degraded_tool_use]
+            model_id = fast_parse.FAST_PATH_MODEL_ID
+            debug["route"] = "local"
+        else:
+            error_warnings.append(f"Bedrock call failed: {str(e)}")
     except Exception as e:
         logger.error(f"Bedrock call failed: {str(e)}")
         error_warnings.append(f"Bedrock call failed: {str(e)}")
         tool_uses = []
         latency_ms = 0
     
-    nodes = []
-    node_ids = []
-    
     if not tool_uses:
         # No tool call - create fallback node
         logger.warning("Bedrock returned no tool call")
-        all_warnings = ["Model did not return a tool call - using fallback"] + error_warnings
-        node = create_fallback_note(
-            title="Captured Note",
-            body=transcript,
-            warnings=all_warnings
-        )
-        fallback_used = True
-        tool_name = None
-        
-        node, time_warnings = normalize_node_times(node, timezone_offset)
-        all_warnings.extend(time_warnings)
-        node, validation_warnings, validation_fallback = validate_node(node, transcript)
-        all_warnings.extend(validation_warnings)
-        fallback_used = fallback_used or validation_fallback
-        
-        node = finalize_node(
-            node=node,
+        tool_uses = [{"name": None, "input": None}]
+    
+    nodes = []
+    for tool_use in tool_uses:
+        nodes.append(build_node(
+            tool_name=tool_use.get("name"),
+            tool_input=tool_use.get("input"),
+            transcript=transcript,
             captured_at_iso=captured_at_iso,
             created_at_iso=created_at_iso,
             timezone_offset=timezone_offset,
             model_id=model_id,
             latency_ms=latency_ms,
-            tool_name=tool_name,
-            fallback_used=fallback_used
-        )
-        
-        existing_warnings = node.get("global_warnings", [])
-        node["global_warnings"] = list(set(existing_warnings + all_warnings))
-        
-        node_id = generate_node_id()
-        
-        # Add node_id to the node object
-        node["node_id"] = node_id
-        
-        nodes.append(node)
-        node_ids.append(node_id)
+            warnings=error_warnings,
+            user_id=user_id,
+            debug=debug,
+            timezone_name=timezone_name
+        ))
+    
+    # Only cache real model output, not fallbacks caused by a failed call
+    if cache_key and not error_warnings:
+        ingest_cache.put_cached_nodes(cache_key, nodes)
+    
+    return nodes
+
+
+def refresh_cached_nodes(
+    nodes: list[dict],
+    captured_at_iso: str,
+    created_at_iso: str,
+    user_id: str
+) -> list[dict]:
+    """Give cached nodes fresh node_ids and server timestamps and mark them as cache hits."""
+    for node in nodes:
+        node["node_id"] = generate_node_id()
+        node["created_at_iso"] = created_at_iso
+        node["captured_at_iso"] = captured_at_iso
+        node.setdefault("parse_debug", {})["cache_hit"] = True
         
         logger.info(json.dumps({
-            "action": "ingest_complete",
-            "node_id": node_id,
+            "action": "ingest_cache_hit",
+            "node_id": node["node_id"],
             "node_type": node.get("node_type"),
-            "tool_used": tool_name,
-            "latency_ms": latency_ms,
-            "fallback_used": fallback_used,
             "user_id": user_id
         }))
-    else:
-        for tool_use in tool_uses:
-            tool_name = tool_use.get("name")
-            tool_input = tool_use.get("input")
-            all_warnings = list(error_warnings)
-            fallback_used = False
-            
-            if not tool_input:
-                all_warnings.append("Model did not return a tool input - using fallback")
-                node = create_fallback_note(
-                    title="Captured Note",
-                    body=transcript,
-                    warnings=all_warnings
-                )
-                fallback_used = True
-            else:
-                node = tool_input
-            
-            node, time_warnings = normalize_node_times(node, timezone_offset)
-            all_warnings.extend(time_warnings)
-            node, validation_warnings, validation_fallback = validate_node(node, transcript)
-            all_warnings.extend(validation_warnings)
-            fallback_used = fallback_used or validation_fallback
-            
-            node = finalize_node(
-                node=node,
-                captured_at_iso=captured_at_iso,
-                created_at_iso=created_at_iso,
-                timezone_offset=timezone_offset,
-                model_id=model_id,
-                latency_ms=latency_ms,
-                tool_name=tool_name,
-                fallback_used=fallback_used
-            )
-            
-            existing_warnings = node.get("global_warnings", [])
-            node["global_warnings"] = list(set(existing_warnings + all_warnings))
-            
-            node_id = generate_node_id()
-            
-            # Add node_id to the node object
-            node["node_id"] = node_id
-            
-            nodes.append(node)
-            node_ids.append(node_id)
-            
-            logger.info(json.dumps({
-                "action": "ingest_complete",
-                "node_id": node_id,
-                "node_type": node.get("node_type"),
-                "tool_used": tool_name,
-                "latency_ms": latency_ms,
-                "fallback_used": fallback_used,
-                "user_id": user_id
-            }))
+    
+    return nodes
+
+
+def build_response_body(nodes: list[dict]) -> dict:
+    """Build the /ingest response envelope for a list of nodes."""
+    node_ids = [node["node_id"] for node in nodes]
     
     response_body = {
         "ok": True,
@@ -254,4 +374,81 @@ def handler(event, context):
         response_body["node_id"] = node_ids[0]
         response_body["node"] = nodes[0]
     
+    return response_body
+
+
+def build_persist_entries(body: dict, nodes: list[dict]) -> list[dict]:
+    """Build put_node_items entries for the nodes produced from one request body."""
+    raw_payload_subset = {
+        "transcript_meta": body.get("transcript_meta", {}),
+        "user_time_iso": body["user_time_iso"],
+        "user_location": body.get("user_location") or {"kind": "unknown"}
+    }
+    if body.get("user_timezone"):
+        raw_payload_subset["user_timezone"] = body["user_timezone"]
+    
+    entries = []
+    for node in nodes:
+        captured_at_iso = node.get("captured_at_iso") or body["user_time_iso"]
+        entries.append({
+            "local_day": compute_local_day(captured_at_iso, body.get("user_timezone")),
+            "node_id": node["node_id"],
+            "raw_transcript": body["transcript"],
+            "raw_payload_subset": raw_payload_subset,
+            "node_obj": node,
+            "captured_at_iso": captured_at_iso,
+            "created_at_iso": node.get("created_at_iso") or utc_now_iso()
+        })
+    return entries
+
+
+def persist_nodes(user_id: str, entries: list[dict]) -> list[str]:
+    """
+    Store ingested nodes in one batched write.
+    
+    Returns the node_ids that could not be written; a failed batch call
+    reports every node as unwritten rather than failing the ingest.
+    """
+    try:
+        failed_node_ids = put_node_items(user_id, entries)
+    except Exception as e:
+        logger.error(f"Error persisting nodes: {str(e)}", exc_info=True)
+        failed_node_ids = [entry["node_id"] for entry in entries]
+    
+    logger.info(json.dumps({
+        "action": "ingest_persist",
+        "user_id": user_id,
+        "node_count": len(entries),
+        "failed_count": len(failed_node_ids)
+    }))
+    
+    return failed_node_ids
+
+
+def handler(event, context):
+    """
+    Ingest handler - processes voice transcripts into structured nodes.
+    
+    Input: JSON with transcript, user_time_iso, optional user_location,
+    optional persist (store the nodes so no /node/{id}/complete calls are needed)
+    Output: JSON with ok, node_id, node (plus persisted when persist was set)
+    """
+    # Parse request
+    body, error = parse_request_body(event)
+    if error:
+        return error_response(400, error)
+    
+    persist = bool(body.get("persist"))
+    auth_user_id = get_user_id(event)
+    if persist and not auth_user_id:
+        return error_response(401, "Unauthorized: user ID not found")
+    
+    nodes = ingest_transcript(body, deadline=deadline_from_context(context), user_id=auth_user_id)
+    response_body = build_response_body(nodes)
+    
+    if persist:
+        failed_node_ids = persist_nodes(auth_user_id, build_persist_entries(body, nodes))
+        response_body["persisted"] = not failed_node_ids
+        response_body["unpersisted_node_ids"] = failed_node_ids
+    
     return api_response(200, response_body)
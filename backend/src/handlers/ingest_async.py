@@ -0,0 +1,65 @@
+"""Handler for submitting asynchronous ingest jobs."""
+
+import json
+import logging
+
+from lib.response import api_response, error_response
+from lib.auth import get_user_id
+from lib.ingest_jobs import generate_job_id, save_job, STATUS_QUEUED
+from lib.ingest_queue import get_queue
+from lib.time_normalize import utc_now_iso
+from handlers.ingest import parse_request_body
+from handlers import ingest_worker
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def handler(event, context):
+    """
+    Async ingest handler - POST /ingest/async.
+
+    Input: same JSON body as POST /ingest
+    Output: 202 with job_id; poll GET /ingest/jobs/{job_id} for the result.
+    The worker persists the nodes, so no /node/{id}/complete calls are needed.
+    """
+    user_id = get_user_id(event)
+    if not user_id:
+        return error_response(401, "Unauthorized: user ID not found")
+
+    body, error = parse_request_body(event)
+    if error:
+        return error_response(400, error)
+
+    job_id = generate_job_id()
+    created_at_iso = utc_now_iso()
+
+    try:
+        save_job(user_id, job_id, STATUS_QUEUED, created_at_iso)
+        queue = get_queue()
+        queue.send({
+            "job_id": job_id,
+            "user_id": user_id,
+            "created_at_iso": created_at_iso,
+            "body": body
+        })
+    except Exception as e:
+        logger.error(f"Error queueing ingest job: {str(e)}", exc_info=True)
+        return error_response(500, f"Failed to queue ingest job: {str(e)}")
+
+    logger.info(json.dumps({
+        "action": "ingest_job_queued",
+        "job_id": job_id,
+        "user_id": user_id
+    }))
+
+    if queue.is_local():
+        # No SQS configured (sam local / tests) - run the worker inline
+        queue.drain(ingest_worker.handler)
+
+    return api_response(202, {
+        "ok": True,
+        "job_id": job_id,
+        "status": STATUS_QUEUED,
+        "status_path": f"/ingest/jobs/{job_id}"
+    })
@@ -0,0 +1,191 @@
+"""Handler for ingesting a batch of transcripts with bounded concurrency."""
+
+import json
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from lib.response import api_response, error_response
+from lib.auth import get_user_id
+from lib.json_utils import parse_body
+from handlers.ingest import (
+    validate_ingest_fields,
+    ingest_transcript,
+    build_response_body,
+    build_persist_entries,
+    persist_nodes
+)
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ITEMS = 20
+DEFAULT_ITEM_TIMEOUT_MS = 20000
+# Time reserved at the end of the invocation to build and return the response
+DEADLINE_MARGIN_MS = 1500
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _batch_deadline(context, item_timeout_ms: int) -> float:
+    """Monotonic deadline for the whole batch, bounded by the Lambda's remaining time."""
+    now = time.monotonic()
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        remaining_ms = context.get_remaining_time_in_millis() - DEADLINE_MARGIN_MS
+        return now + max(remaining_ms, 0) / 1000
+    return now + item_timeout_ms / 1000
+
+
+def _run_item(
+    item: dict,
+    started: dict,
+    index: int,
+    item_timeout_ms: int,
+    batch_deadline: float,
+    user_id: str | None
+) -> list[dict]:
+    """Worker body - records its start time so the caller can enforce a per-item deadline."""
+    if time.monotonic() >= batch_deadline:
+        raise TimeoutError("Batch deadline reached before item started")
+    started[index] = time.monotonic()
+    item_deadline = min(started[index] + item_timeout_ms / 1000, batch_deadline)
+    return ingest_transcript(item, deadline=item_deadline, user_id=user_id)
+
+
+def run_batch(items: list[dict], context=None, user_id: str | None = None) -> list[dict]:
+    """
+    Ingest every item through a bounded worker pool.
+
+    user_id is the authenticated user (see ingest_transcript).
+
+    Returns one result per item, in input order:
+    - {"index": i, "ok": True, ...ingest response body}
+    - {"index": i, "ok": False, "error": str}
+    """
+    concurrency = max(1, _env_int("INGEST_BATCH_CONCURRENCY", DEFAULT_CONCURRENCY))
+    item_timeout_ms = _env_int("INGEST_BATCH_ITEM_TIMEOUT_MS", DEFAULT_ITEM_TIMEOUT_MS)
+    batch_deadline = _batch_deadline(context, item_timeout_ms)
+
+    results = [None] * len(items)
+    started = {}
+    futures = {}
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        for index, item in enumerate(items):
+            try:
+                error = validate_ingest_fields(item)
+            except Exception as e:
+                # A malformed item fails on its own instead of sinking the batch
+                logger.error(f"Batch item {index} could not be validated: {str(e)}")
+                error = f"Invalid item: {str(e)}"
+            if error:
+                results[index] = {"index": index, "ok": False, "error": error}
+                continue
+            future = executor.submit(_run_item, item, started, index, item_timeout_ms, batch_deadline, user_id)
+            futures[future] = index
+
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            if now >= batch_deadline:
+                break
+
+            # Wake up at the earliest per-item or batch deadline
+            next_deadline = batch_deadline
+            for future in pending:
+                started_at = started.get(futures[future])
+                if started_at is not None:
+                    next_deadline = min(next_deadline, started_at + item_timeout_ms / 1000)
+
+            done, pending = wait(pending, timeout=max(next_deadline - now, 0), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index = futures[future]
+                try:
+                    nodes = future.result()
+                    results[index] = {"index": index, **build_response_body(nodes)}
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {str(e)}")
+                    results[index] = {"index": index, "ok": False, "error": str(e)}
+
+            now = time.monotonic()
+            for future in list(pending):
+                index = futures[future]
+                started_at = started.get(index)
+                if started_at is not None and now - started_at >= item_timeout_ms / 1000:
+                    pending.discard(future)
+                    results[index] = {"index": index, "ok": False, "error": "Item deadline exceeded"}
+
+        for future in pending:
+            index = futures[future]
+            future.cancel()
+            results[index] = {"index": index, "ok": False, "error": "Batch deadline exceeded"}
+    finally:
+        # Don't block the response on stragglers that already missed their deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
+
+def handler(event, context):
+    """
+    Batch ingest handler - POST /ingest/batch.
+
+    Input: JSON with items, a list of /ingest request bodies, and optional
+    persist to store every produced node in one batched write
+    Output: JSON with ok, results (one per item, in input order), succeeded, failed
+    """
+    try:
+        body = parse_body(event)
+    except json.JSONDecodeError:
+        return error_response(400, "Invalid JSON in request body")
+
+    items = body.get("items") if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        return error_response(400, "items is required and must be a non-empty list")
+
+    max_items = _env_int("INGEST_BATCH_MAX_ITEMS", DEFAULT_MAX_ITEMS)
+    if len(items) > max_items:
+        return error_response(400, f"items must contain at most {max_items} transcripts")
+
+    persist = bool(body.get("persist"))
+    user_id = get_user_id(event)
+    if persist and not user_id:
+        return error_response(401, "Unauthorized: user ID not found")
+
+    results = run_batch(items, context, user_id)
+    succeeded = sum(1 for result in results if result["ok"])
+
+    if persist:
+        entries = []
+        for item, result in zip(items, results):
+            if result["ok"]:
+                entries.extend(build_persist_entries(item, result["nodes"]))
+        failed_node_ids = set(persist_nodes(user_id, entries))
+        for result in results:
+            if result["ok"]:
+                unpersisted = [node_id for node_id in result["node_ids"] if node_id in failed_node_ids]
+                result["persisted"] = not unpersisted
+                result["unpersisted_node_ids"] = unpersisted
+
+    logger.info(json.dumps({
+        "action": "ingest_batch_complete",
+        "items": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded
+    }))
+
+    return api_response(200, {
+        "ok": True,
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded
+    })
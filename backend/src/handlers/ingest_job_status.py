@@ -0,0 +1,38 @@
+"""Handler for polling asynchronous ingest jobs."""
+
+import logging
+
+from lib.response import api_response, error_response
+from lib.auth import get_user_id
+from lib.ingest_jobs import get_job
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def handler(event, context):
+    """
+    Ingest job status handler - GET /ingest/jobs/{job_id}.
+
+    Returns the job status; once succeeded, result holds the same body
+    POST /ingest returns (nodes, node_ids, ...).
+    """
+    user_id = get_user_id(event)
+    if not user_id:
+        return error_response(401, "Unauthorized: user ID not found")
+
+    path_params = event.get("pathParameters") or {}
+    job_id = path_params.get("job_id")
+    if not job_id:
+        return error_response(400, "job_id is required in path parameters")
+
+    try:
+        job = get_job(user_id, job_id)
+    except Exception as e:
+        logger.error(f"Error reading ingest job: {str(e)}", exc_info=True)
+        return error_response(500, f"Failed to read ingest job: {str(e)}")
+
+    if not job:
+        return error_response(404, f"Job with id '{job_id}' not found for this user")
+
+    return api_response(200, {"ok": True, **job})
@@ -0,0 +1,207 @@
+"""Handler for incremental ingest of live, partial transcripts."""
+
+import json
+import logging
+
+from lib.response import api_response, error_response
+from lib.auth import get_user_id
+from lib.bedrock_converse import deadline_from_context
+from lib.ingest_session import (
+    generate_session_id,
+    append_delta,
+    take_completed_text,
+    merge_nodes,
+    new_session,
+    load_session,
+    save_session,
+    delete_session,
+    SessionConflictError,
+    MAX_TRANSCRIPT_CHARS
+)
+from handlers.ingest import (
+    ingest_transcript,
+    build_response_body,
+    build_persist_entries,
+    persist_nodes,
+    validate_context_fields
+)
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Request fields shared by every utterance of a session
+CONTEXT_FIELDS = ("user_time_iso", "captured_at_iso", "user_timezone", "user_location", "transcript_meta")
+
+
+def parse_json_body(event: dict) -> tuple[dict | None, str | None]:
+    """Parse an optional JSON object body. Returns (body, error_message)."""
+    body_str = event.get("body") or "{}"
+    try:
+        body = json.loads(body_str) if isinstance(body_str, str) else body_str
+    except json.JSONDecodeError:
+        return None, "Invalid JSON in request body"
+    if not isinstance(body, dict):
+        return None, "Request body must be a JSON object"
+    return body, None
+
+
+def parse_session_text(session: dict, context, final: bool = False) -> dict:
+    """
+    Parse the utterances completed since the last call and record their nodes.
+
+    With final=True the unterminated tail is parsed too. Returns the updated
+    session (not yet saved).
+    """
+    transcript = session["transcript"]
+    parsed_upto = int(session["parsed_upto"])
+
+    if final:
+        chunk, new_parsed_upto = transcript[parsed_upto:].strip(), len(transcript)
+    else:
+        chunk, new_parsed_upto = take_completed_text(transcript, parsed_upto)
+
+    nodes = json.loads(session["nodes_json"])
+    if chunk:
+        body = dict(json.loads(session["context_json"]), transcript=chunk)
+        user_id = session["pk"].removeprefix("user#")
+        nodes.extend(ingest_transcript(body, deadline=deadline_from_context(context), user_id=user_id))
+
+    return dict(
+        session,
+        parsed_upto=new_parsed_upto,
+        nodes_json=json.dumps(nodes)
+    )
+
+
+def start_session(user_id: str, body: dict, context) -> dict:
+    """POST /ingest/sessions - open a session, optionally with initial text."""
+    error = validate_context_fields(body)
+    if error:
+        return error_response(400, error)
+
+    text = body.get("text") or ""
+    if not isinstance(text, str):
+        return error_response(400, "text must be a string")
+    if len(text) > MAX_TRANSCRIPT_CHARS:
+        return error_response(400, f"Session transcript exceeds {MAX_TRANSCRIPT_CHARS} characters")
+
+    session_context = {field: body[field] for field in CONTEXT_FIELDS if body.get(field)}
+    session_context["user_id"] = user_id
+
+    session_id = generate_session_id()
+    session = new_session(user_id, session_id, session_context)
+    if text:
+        session["transcript"] = append_delta("", text)
+        session = parse_session_text(session, context)
+    save_session(session)
+
+    logger.info(json.dumps({
+        "action": "ingest_session_start",
+        "session_id": session_id,
+        "user_id": user_id
+    }))
+
+    return api_response(201, build_session_status(session))
+
+
+def add_delta(session: dict, body: dict, context) -> dict:
+    """POST /ingest/sessions/{session_id}/delta - append text and parse completed utterances."""
+    text = body.get("text")
+    if not isinstance(text, str) or not text.strip():
+        return error_response(400, "text is required and must be non-empty")
+
+    transcript = append_delta(session["transcript"], text)
+    if len(transcript) > MAX_TRANSCRIPT_CHARS:
+        return error_response(400, f"Session transcript exceeds {MAX_TRANSCRIPT_CHARS} characters")
+
+    session = parse_session_text(dict(session, transcript=transcript), context)
+    save_session(session)
+    return api_response(200, build_session_status(session))
+
+
+def finish_session(user_id: str, session: dict, body: dict, context) -> dict:
+    """POST /ingest/sessions/{session_id}/finish - parse the tail and return merged nodes."""
+    text = body.get("text")
+    if isinstance(text, str) and text.strip():
+        session = dict(session, transcript=append_delta(session["transcript"], text))
+
+    session = parse_session_text(session, context, final=True)
+    # Claim the session before returning nodes so a retried finish can't duplicate them
+    save_session(session)
+
+    nodes = merge_nodes(json.loads(session["nodes_json"]))
+    response_body = build_response_body(nodes)
+    response_body["session_id"] = session["session_id"]
+
+    if body.get("persist"):
+        persist_body = dict(json.loads(session["context_json"]), transcript=session["transcript"])
+        failed_node_ids = persist_nodes(user_id, build_persist_entries(persist_body, nodes))
+        response_body["persisted"] = not failed_node_ids
+        response_body["unpersisted_node_ids"] = failed_node_ids
+
+    delete_session(user_id, session["session_id"])
+
+    logger.info(json.dumps({
+        "action": "ingest_session_finish",
+        "session_id": session["session_id"],
+        "user_id": user_id,
+        "node_count": len(nodes),
+        "transcript_chars": len(session["transcript"])
+    }))
+
+    return api_response(200, response_body)
+
+
+def build_session_status(session: dict) -> dict:
+    """Summarize a session for start/delta responses."""
+    nodes = json.loads(session["nodes_json"])
+    return {
+        "ok": True,
+        "session_id": session["session_id"],
+        "parsed_chars": int(session["parsed_upto"]),
+        "pending_text": session["transcript"][int(session["parsed_upto"]):].strip(),
+        "node_count": len(nodes)
+    }
+
+
+def handler(event, context):
+    """
+    Incremental ingest handler.
+
+    POST /ingest/sessions                       start (user_time_iso, optional text)
+    POST /ingest/sessions/{session_id}/delta    append {"text"}; parses completed utterances
+    POST /ingest/sessions/{session_id}/finish   optional {"text", "persist"}; returns merged nodes
+
+    Concurrent deltas for one session get 409 and should be resent.
+    """
+    user_id = get_user_id(event)
+    if not user_id:
+        return error_response(401, "Unauthorized: user ID not found")
+
+    body, error = parse_json_body(event)
+    if error:
+        return error_response(400, error)
+
+    path_params = event.get("pathParameters") or {}
+    session_id = path_params.get("session_id")
+    action = path_params.get("action")
+
+    try:
+        if not session_id:
+            return start_session(user_id, body, context)
+
+        if action not in ("delta", "finish"):
+            return error_response(404, f"Unknown session action '{action}'")
+
+        session = load_session(user_id, session_id)
+        if not session:
+            return error_response(404, f"Session with id '{session_id}' not found for this user")
+
+        if action == "delta":
+            return add_delta(session, body, context)
+        return finish_session(user_id, session, body, context)
+    except SessionConflictError as e:
+        return error_response(409, str(e))
+    except Exception as e:
+        logger.error(f"Error in ingest session: {str(e)}", exc_info=True)
+        return error_response(500, f"Ingest session failed: {str(e)}")
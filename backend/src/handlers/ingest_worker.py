@@ -0,0 +1,133 @@
+"""Queue worker for asynchronous ingest jobs."""
+
+import json
+import logging
+import os
+
+from lib.bedrock_converse import deadline_from_context
+from lib.ids import derive_node_id
+from lib.ingest_jobs import get_job, save_job, STATUS_RUNNING, STATUS_SUCCEEDED, STATUS_FAILED
+from handlers.ingest import ingest_transcript, build_response_body, build_persist_entries, persist_nodes
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Matches the queue's RedrivePolicy maxReceiveCount
+DEFAULT_MAX_RECEIVE_COUNT = 3
+
+
+class RetryableJobError(Exception):
+    """Raised so SQS redelivers a job (Bedrock failed, or the nodes were not stored)."""
+
+
+def _max_receive_count() -> int:
+    try:
+        return int(os.environ.get("INGEST_MAX_RECEIVE_COUNT", DEFAULT_MAX_RECEIVE_COUNT))
+    except ValueError:
+        return DEFAULT_MAX_RECEIVE_COUNT
+
+
+def process_job(message: dict, context=None, final_attempt: bool = True) -> dict:
+    """
+    Run the ingest pipeline for one queued job and record the outcome.
+
+    call_converse -> normalize -> validate -> persist, then the job record is
+    updated with the same body /ingest would have returned.
+
+    Safe under SQS at-least-once delivery:
+    - a job that already succeeded is not run again
+    - node_ids are derived from job_id and position, and the built nodes
+      are checkpointed on the job record before persisting, so a
+      redelivery re-writes the same nodes instead of calling Bedrock again
+    - if only fallback notes came back (Bedrock failed or its output was
+      rejected) or persisting failed, RetryableJobError is raised so SQS
+      retries; on the final attempt fallback notes are kept so the
+      transcript is not lost
+    """
+    user_id = message["user_id"]
+    job_id = message["job_id"]
+    body = message["body"]
+    created_at_iso = message["created_at_iso"]
+
+    job = get_job(user_id, job_id)
+    if job and job["status"] == STATUS_SUCCEEDED:
+        logger.info(json.dumps({"action": "ingest_job_duplicate", "job_id": job_id, "user_id": user_id}))
+        return job.get("result", {})
+
+    if job and job.get("result"):
+        # Redelivery after the nodes were built - reuse them
+        nodes = job["result"]["nodes"]
+    else:
+        save_job(user_id, job_id, STATUS_RUNNING, created_at_iso)
+        nodes = ingest_transcript(body, deadline=deadline_from_context(context), user_id=user_id)
+        for index, node in enumerate(nodes):
+            node["node_id"] = derive_node_id(job_id, index)
+
+        only_fallback = all(node.get("parse_debug", {}).get("fallback_used") for node in nodes)
+        if only_fallback and not final_attempt:
+            raise RetryableJobError(f"Only fallback output for job {job_id}")
+
+        save_job(user_id, job_id, STATUS_RUNNING, created_at_iso, result=build_response_body(nodes))
+
+    result = build_response_body(nodes)
+    failed_node_ids = persist_nodes(user_id, build_persist_entries(body, nodes))
+    if failed_node_ids:
+        raise RetryableJobError(f"Could not persist nodes {failed_node_ids} for job {job_id}")
+    result["persisted"] = True
+    result["unpersisted_node_ids"] = []
+
+    save_job(user_id, job_id, STATUS_SUCCEEDED, created_at_iso, result=result)
+
+    logger.info(json.dumps({
+        "action": "ingest_job_complete",
+        "job_id": job_id,
+        "user_id": user_id,
+        "node_count": len(nodes),
+        "node_ids": result["node_ids"]
+    }))
+    return result
+
+
+def handler(event, context):
+    """
+    SQS worker handler.
+
+    Each record body is {"job_id", "user_id", "created_at_iso", "body"}.
+    Failed records are reported back to SQS so they are retried (and
+    eventually dead-lettered) without redoing the whole batch. The job is
+    only marked failed on its final delivery, so earlier attempts keep
+    their checkpointed nodes.
+    """
+    failures = []
+    max_receive_count = _max_receive_count()
+
+    for record in event.get("Records", []):
+        try:
+            message = json.loads(record["body"])
+        except (KeyError, json.JSONDecodeError):
+            # Malformed messages can never succeed - drop them
+            logger.error(f"Dropping malformed ingest message: {record.get('messageId')}")
+            continue
+
+        # The in-memory queue never redelivers, so a missing count means final
+        receive_count = int(record.get("attributes", {}).get("ApproximateReceiveCount", max_receive_count))
+        final_attempt = receive_count >= max_receive_count
+
+        try:
+            process_job(message, context, final_attempt=final_attempt)
+        except Exception as e:
+            logger.error(
+                f"Ingest job {message.get('job_id')} failed (attempt {receive_count}): {str(e)}",
+                exc_info=True
+            )
+            if final_attempt:
+                try:
+                    save_job(
+                        message["user_id"], message["job_id"], STATUS_FAILED,
+                        message["created_at_iso"], error=str(e)
+                    )
+                except Exception:
+                    logger.error("Could not record job failure", exc_info=True)
+            failures.append({"itemIdentifier": record["messageId"]})
+
+    return {"batchItemFailures": failures}
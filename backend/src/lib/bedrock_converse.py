@@ -1,18 +1,52 @@
 """Bedrock Converse API client with tool use for Seocnd-Brain."""
 
+import hashlib
 import json
+import logging
+import os
+import random
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from lib.schemas import SCHEMA_VERSION
+from lib.metrics import emit_emf
+
+logger = logging.getLogger()
 
 _client = None
+# node_types tuple (or None for all) -> tool list with a trailing cache point
+_tools = {}
+# Same keys -> serialized size of that tool list, for log estimates
+_tools_chars = {}
+_prompt_version = None
+
+# Marks the end of a static prefix so Bedrock prompt caching can reuse it
+CACHE_POINT = {"cachePoint": {"type": "default"}}
 
 
 def get_client():
-    """Get cached Bedrock Runtime client."""
+    """
+    Get cached Bedrock Runtime client.
+    
+    botocore's own retries are disabled - call_converse owns retry, hedging
+    and circuit breaking so they can respect the invocation deadline.
+    """
     global _client
     if _client is None:
-        _client = boto3.client("bedrock-runtime")
+        _client = boto3.client(
+            "bedrock-runtime",
+            config=Config(
+                retries={"max_attempts": 1, "mode": "standard"},
+                read_timeout=30,
+                max_pool_connections=20
+            )
+        )
     return _client
 
 
@@ -222,11 +256,23 @@ CALENDAR_TOOL_PROPERTIES = {
 }
 
 
-def build_tools():
-    """Build tool specifications for Bedrock Converse."""
+NODE_TYPE_TOOLS = {
+    "reminder": "create_reminder_node",
+    "todo": "create_todo_node",
+    "note": "create_note_node",
+    "calendar_placeholder": "create_calendar_placeholder_node"
+}
+
+
+def build_tools(node_types=None):
+    """
+    Build tool specifications for Bedrock Converse.
+    
+    node_types limits the specs to those node types (all four when None).
+    """
     base_required = ["schema_version", "node_type", "title", "body", "tags", "status", "confidence", "evidence", "location_context"]
     
-    return [
+    tools = [
         {
             "toolSpec": {
                 "name": "create_reminder_node",
@@ -280,6 +326,11 @@ def build_tools():
             }
         }
     ]
+    
+    if node_types is None:
+        return tools
+    names = {NODE_TYPE_TOOLS[node_type] for node_type in node_types}
+    return [tool for tool in tools if tool["toolSpec"]["name"] in names]
 
 
 SYSTEM_PROMPT = '''You are Second-Brain, an AI that converts messy voice transcripts into ONE OR MORE structured nodes.
@@ -384,41 +435,570 @@ def build_system_prompt():
     return SYSTEM_PROMPT
 
 
-def call_converse(model_id: str, user_payload: dict):
+def get_tools(node_types=None):
     """
-    Call Bedrock Converse API with tools.
+    Get the tool list with a trailing cache point (built once per container).
     
-    Returns: (tool_uses, raw_response, latency_ms)
-    tool_uses is a list of {"name": str, "input": dict}
+    The tool specs never change between requests, so they are built on first
+    use and the cachePoint lets Bedrock serve them from the prompt cache.
+    Each node_types subset is built once and gets its own cache entry.
     """
-    client = get_client()
-    tools = build_tools()
-    system_prompt = build_system_prompt()
+    key = tuple(node_types) if node_types is not None else None
+    if key not in _tools:
+        _tools[key] = build_tools(node_types) + [CACHE_POINT]
+    return _tools[key]
+
+
+def get_tools_chars(node_types=None) -> int:
+    """Serialized size of get_tools(node_types), computed once per container and subset."""
+    key = tuple(node_types) if node_types is not None else None
+    if key not in _tools_chars:
+        _tools_chars[key] = len(json.dumps(get_tools(node_types)))
+    return _tools_chars[key]
+
+
+def get_prompt_version():
+    """
+    Get a short fingerprint of the system prompt and tool specs.
     
-    user_message = json.dumps(user_payload, ensure_ascii=False)
+    Changes whenever either is edited, so anything keyed on it (e.g. the
+    ingest result cache) is invalidated by prompt changes automatically.
+    """
+    global _prompt_version
+    if _prompt_version is None:
+        material = SYSTEM_PROMPT + json.dumps(build_tools(), sort_keys=True)
+        _prompt_version = hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+    return _prompt_version
+
+
+def get_system_blocks():
+    """Get the system prompt blocks with a trailing cache point."""
+    return [{"text": build_system_prompt()}, CACHE_POINT]
+
+
+def extract_usage(response: dict) -> dict:
+    """
+    Extract token and latency accounting from a Converse response.
     
-    start_time = time.time()
+    cache_read_input_tokens are prefix tokens served from the cache (hit),
+    cache_write_input_tokens are prefix tokens written to it (miss).
+    server_latency_ms is Bedrock's own latency, excluding network and client time.
+    Missing counts are reported as 0.
+    """
+    usage = response.get("usage") or {}
+    metrics = response.get("metrics") or {}
+    return {
+        "input_tokens": usage.get("inputTokens", 0),
+        "output_tokens": usage.get("outputTokens", 0),
+        "cache_read_input_tokens": usage.get("cacheReadInputTokens", 0),
+        "cache_write_input_tokens": usage.get("cacheWriteInputTokens", 0),
+        "server_latency_ms": metrics.get("latencyMs", 0),
+        "stop_reason": response.get("stopReason") or "unknown"
+    }
+
+
+def emit_converse_metrics(model_id: str, operation: str, latency_ms: int, usage: dict) -> None:
+    """Emit one EMF line with the token counts and latencies of a Bedrock call."""
+    emit_emf(
+        metrics={
+            "InputTokens": (usage["input_tokens"], "Count"),
+            "OutputTokens": (usage["output_tokens"], "Count"),
+            "CacheReadInputTokens": (usage["cache_read_input_tokens"], "Count"),
+            "CacheWriteInputTokens": (usage["cache_write_input_tokens"], "Count"),
+            "ServerLatency": (usage["server_latency_ms"], "Milliseconds"),
+            "ClientLatency": (latency_ms, "Milliseconds")
+        },
+        dimensions={"ModelId": model_id, "Operation": operation},
+        properties={"StopReason": usage["stop_reason"]}
+    )
+
+
+def build_converse_request(model_id: str, user_payload: dict, node_types=None) -> dict:
+    """
+    Build the keyword arguments for a Converse call.
+    
+    node_types (from classify_intents) limits the tools sent; with a single
+    type the tool choice is pinned to it.
+    """
+    user_message = json.dumps(user_payload, ensure_ascii=False)
+    if node_types is not None and len(node_types) == 1:
+        tool_choice = {"tool": {"name": NODE_TYPE_TOOLS[node_types[0]]}}
+    else:
+        tool_choice = {"auto": {}}
     
-    response = client.converse(
-        modelId=model_id,
-        messages=[
+    return {
+        "modelId": model_id,
+        "messages": [
             {
                 "role": "user",
                 "content": [{"text": user_message}]
             }
         ],
-        system=[{"text": system_prompt}],
-        toolConfig={
-            "tools": tools,
-            "toolChoice": {"auto": {}}
+        "system": get_system_blocks(),
+        "toolConfig": {
+            "tools": get_tools(node_types),
+            "toolChoice": tool_choice
         },
-        inferenceConfig={
+        "inferenceConfig": {
             "temperature": 0,
             "maxTokens": 4096
         }
+    }
+
+
+# Error codes worth retrying - everything else fails fast
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "InternalServerException"
+}
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY_S = 0.2
+RETRY_MAX_DELAY_S = 4.0
+# Don't start an attempt with less time than this left before the deadline
+MIN_ATTEMPT_S = 1.0
+DEFAULT_DEADLINE_S = 25.0
+
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 95
+
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 5
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_COOLDOWN_S = 30.0
+
+_hedge_executor = ThreadPoolExecutor(max_workers=8)
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker for a model is open."""
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies for one model."""
+    
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+    
+    def add(self, latency_ms: int) -> None:
+        with self._lock:
+            self._samples.append(latency_ms)
+    
+    def count(self) -> int:
+        return len(self._samples)
+    
+    def percentile(self, pct: float) -> int | None:
+        """Return the pct-th percentile latency, or None with no samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one model.
+    
+    Opens when at least BREAKER_MIN_CALLS of the last BREAKER_WINDOW calls
+    were seen and BREAKER_FAILURE_RATE of them failed. After the cooldown one
+    trial call is let through (half-open); its outcome closes or re-opens it.
+    """
+    
+    def __init__(self):
+        self._outcomes = deque(maxlen=BREAKER_WINDOW)
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < BREAKER_COOLDOWN_S:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < BREAKER_COOLDOWN_S
+    
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self._opened_at is not None and self._trial_in_flight:
+                # Half-open trial decides the state
+                self._trial_in_flight = False
+                if success:
+                    self._opened_at = None
+                    self._outcomes.clear()
+                else:
+                    self._opened_at = time.monotonic()
+                return
+            
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= BREAKER_MIN_CALLS and failures / len(self._outcomes) >= BREAKER_FAILURE_RATE:
+                self._opened_at = time.monotonic()
+                logger.warning(json.dumps({
+                    "action": "bedrock_circuit_open",
+                    "failures": failures,
+                    "calls": len(self._outcomes)
+                }))
+
+
+_latency_trackers = {}
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_latency_tracker(model_id: str) -> LatencyTracker:
+    """Get the per-container latency tracker for a model."""
+    with _registry_lock:
+        if model_id not in _latency_trackers:
+            _latency_trackers[model_id] = LatencyTracker()
+        return _latency_trackers[model_id]
+
+
+def get_breaker(model_id: str) -> CircuitBreaker:
+    """Get the per-container circuit breaker for a model."""
+    with _registry_lock:
+        if model_id not in _breakers:
+            _breakers[model_id] = CircuitBreaker()
+        return _breakers[model_id]
+
+
+def is_breaker_failure(error: Exception) -> bool:
+    """
+    Return True if a failed call says the model is unhealthy.
+    
+    Throttling and server errors count, as do timeouts and connection
+    errors; client errors such as ValidationException or AccessDenied are
+    caused by the request, so they don't open the circuit for everyone.
+    """
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in RETRYABLE_ERROR_CODES or status >= 500
+    return True
+
+
+def is_circuit_open(model_id: str) -> bool:
+    """Return True if calls to model_id are currently being short-circuited."""
+    return get_breaker(model_id).is_open()
+
+
+# Model routing - cheap transcript features pick the model for each request
+ROUTES = ["fast", "default", "strong"]
+ROUTE_MODEL_ENV = {
+    "fast": "BEDROCK_FAST_MODEL_ID",
+    "default": "BEDROCK_MODEL_ID",
+    "strong": "BEDROCK_STRONG_MODEL_ID"
+}
+FAST_ROUTE_MAX_WORDS = 25
+STRONG_ROUTE_MIN_WORDS = 120
+STRONG_ROUTE_MIN_INTENTS = 3
+LATENCY_BUDGET_PERCENTILE = 99
+
+INTENT_CUES = re.compile(
+    r"\b(remind me|don'?t forget|need to|have to|gotta|schedule|set up|book|"
+    r"add .{1,40}? to my|note (?:that|to self)|to-?do)\b",
+    re.IGNORECASE
+)
+TIME_EXPRESSIONS = re.compile(
+    r"\b(today|tomorrow|tonight|morning|afternoon|evening|noon|midnight|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"next (?:week|month|year)|this (?:week|weekend)|in \w+ (?:minutes?|hours?|days?|weeks?)|"
+    r"\d{1,2}(?::\d{2})?\s*(?:am|pm|a\.m\.|p\.m\.)|at \d{1,2})\b",
+    re.IGNORECASE
+)
+
+
+def extract_route_features(transcript: str) -> dict:
+    """Cheap features used to route a transcript to a model."""
+    sentences = [part for part in re.split(r"[.!?]+", transcript) if part.strip()]
+    return {
+        "words": len(transcript.split()),
+        "intents": max(1, len(INTENT_CUES.findall(transcript)), len(sentences)),
+        "time_expressions": len(TIME_EXPRESSIONS.findall(transcript))
+    }
+
+
+def route_model(transcript: str, default_model_id: str) -> tuple[str, str]:
+    """
+    Pick a model for this transcript.
+    
+    Short single-intent captures go to the fast route, long multi-intent dumps
+    to the strong route, everything else to the default model. Routes without
+    a configured model ID use default_model_id. If BEDROCK_LATENCY_BUDGET_MS is
+    set, a route whose observed p99 exceeds it is stepped down to a faster one.
+    
+    Returns: (model_id, route)
+    """
+    features = extract_route_features(transcript)
+    
+    if (features["words"] <= FAST_ROUTE_MAX_WORDS
+            and features["intents"] <= 1
+            and features["time_expressions"] <= 1):
+        route = "fast"
+    elif (features["words"] >= STRONG_ROUTE_MIN_WORDS
+            or features["intents"] >= STRONG_ROUTE_MIN_INTENTS):
+        route = "strong"
+    else:
+        route = "default"
+    
+    def model_for(route_name: str) -> str:
+        return os.environ.get(ROUTE_MODEL_ENV[route_name]) or default_model_id
+    
+    budget_ms = os.environ.get("BEDROCK_LATENCY_BUDGET_MS")
+    if budget_ms:
+        try:
+            budget = int(budget_ms)
+        except ValueError:
+            budget = None
+        index = ROUTES.index(route)
+        while budget is not None and index > 0:
+            tracker = get_latency_tracker(model_for(ROUTES[index]))
+            if tracker.count() < HEDGE_MIN_SAMPLES or tracker.percentile(LATENCY_BUDGET_PERCENTILE) <= budget:
+                break
+            index -= 1
+        route = ROUTES[index]
+    
+    model_id = model_for(route)
+    logger.info(json.dumps({
+        "action": "bedrock_route",
+        "route": route,
+        "model_id": model_id,
+        **features
+    }))
+    return model_id, route
+
+
+# Intent pre-classification - rules pick the node types whose tool specs are sent
+INTENT_RULES = {
+    "reminder": re.compile(
+        r"\b(remind(?:er)?|don'?t (?:let me )?forget|ping me|alert me|nudge me)\b",
+        re.IGNORECASE
+    ),
+    "calendar_placeholder": re.compile(
+        r"\b(schedule|meeting|appointment|calendar|book (?:a|an|the)|set up (?:a|an) (?:call|meeting)|"
+        r"(?:lunch|dinner|coffee|breakfast|drinks) with|call with|sync with|interview)\b",
+        re.IGNORECASE
+    ),
+    "todo": re.compile(
+        r"\b(need to|have to|got to|gotta|must|should|to-?do|task|"
+        r"add .{1,40}? to my (?:list|todos?)|pick up|buy|finish|submit|pay|clean|fix)\b",
+        re.IGNORECASE
+    ),
+    "note": re.compile(
+        r"\b(note|idea|thought|remember that|fyi|learned|interesting|apparently|journal)\b",
+        re.IGNORECASE
+    )
+}
+# Phrasings specific enough to pin the tool choice when their type is the
+# only one matched. The broad INTENT_RULES words ("should", "pay", "fix")
+# also show up in reminders and events, so they only narrow the toolset
+PIN_RULES = {
+    "reminder": re.compile(
+        r"\b(remind me|set (?:a|an) (?:reminder|alarm)|don'?t let me forget)\b",
+        re.IGNORECASE
+    ),
+    "calendar_placeholder": re.compile(
+        r"\b(schedule (?:a|an)|book (?:a|an|the)|set up (?:a|an) (?:call|meeting)|"
+        r"(?:add|put) .{1,40}? (?:on|to|in) my calendar)\b",
+        re.IGNORECASE
+    ),
+    "todo": re.compile(
+        r"\b(add .{1,40}? to my (?:list|todos?)|to-?do)\b",
+        re.IGNORECASE
+    ),
+    "note": re.compile(
+        r"\b(take a note|note to self|note that|journal)\b",
+        re.IGNORECASE
     )
+}
+# Rough characters per token for estimating the tool tokens a subset saves
+CHARS_PER_TOKEN = 4
+
+
+def classify_intents(transcript: str) -> list[str] | None:
+    """
+    Guess which node types a transcript needs.
+    
+    Returns node types in tool order, or None (send every tool) when no rule
+    fires. A single type (which pins the tool choice) is only returned for a
+    single-intent transcript whose one matched type also has a PIN_RULES
+    phrase; a lone broad match sends every tool instead. Otherwise notes are
+    added as the catch-all so a missed intent can still be captured.
+    """
+    if os.environ.get("INTENT_CLASSIFIER_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    
+    matched = [node_type for node_type, rule in INTENT_RULES.items() if rule.search(transcript)]
+    if not matched:
+        return None
+    
+    if len(matched) == 1 and extract_route_features(transcript)["intents"] <= 1:
+        if PIN_RULES[matched[0]].search(transcript):
+            return matched
+        return None
+    
+    node_types = set(matched) | {"note"}
+    return [node_type for node_type in NODE_TYPE_TOOLS if node_type in node_types]
+
+
+def log_intent_classification(node_types: list[str] | None, tool_uses: list[dict], usage: dict) -> None:
+    """Log how the classifier's guess compared with the tools the model called."""
+    if node_types is None:
+        return
+    
+    tool_names = {NODE_TYPE_TOOLS[node_type] for node_type in node_types}
+    called = [tool_use["name"] for tool_use in tool_uses]
+    full_chars = get_tools_chars()
+    subset_chars = get_tools_chars(node_types)
+    
+    logger.info(json.dumps({
+        "action": "intent_classifier",
+        "predicted": node_types,
+        "called": called,
+        "hit": bool(called) and all(name in tool_names for name in called),
+        "pinned": len(node_types) == 1,
+        "input_tokens": usage["input_tokens"],
+        "est_tool_tokens_saved": (full_chars - subset_chars) // CHARS_PER_TOKEN
+    }))
+
+
+def deadline_from_context(context, margin_ms: int = 1500) -> float:
+    """Convert the Lambda's remaining time into a time.monotonic() deadline."""
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        return time.monotonic() + max(context.get_remaining_time_in_millis() - margin_ms, 0) / 1000
+    return time.monotonic() + DEFAULT_DEADLINE_S
+
+
+def _hedge_delay_s(model_id: str) -> float | None:
+    """
+    Delay before firing a duplicate request, or None if hedging is off.
+    
+    Uses the observed p95 once enough samples exist, else BEDROCK_HEDGE_AFTER_MS.
+    """
+    if os.environ.get("BEDROCK_HEDGING_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    tracker = get_latency_tracker(model_id)
+    if tracker.count() >= HEDGE_MIN_SAMPLES:
+        return tracker.percentile(HEDGE_PERCENTILE) / 1000
+    configured = os.environ.get("BEDROCK_HEDGE_AFTER_MS")
+    if configured:
+        try:
+            return int(configured) / 1000
+        except ValueError:
+            return None
+    return None
+
+
+def _converse_hedged(client, request: dict, deadline: float) -> dict:
+    """
+    Run one Converse attempt, hedging it with a duplicate after the p95 latency.
+    
+    Whichever request succeeds first wins; the loser's result is discarded.
+    """
+    hedge_after = _hedge_delay_s(request["modelId"])
+    remaining = deadline - time.monotonic()
+    
+    # Only hedge when the duplicate would still have a realistic chance to finish
+    if hedge_after is None or remaining < hedge_after + MIN_ATTEMPT_S:
+        return client.converse(**request)
+    
+    primary = _hedge_executor.submit(client.converse, **request)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+    
+    hedge = _hedge_executor.submit(client.converse, **request)
+    logger.info(json.dumps({
+        "action": "bedrock_hedge_fired",
+        "model_id": request["modelId"],
+        "hedge_after_ms": int(hedge_after * 1000)
+    }))
+    
+    pending = {primary, hedge}
+    last_error = None
+    while pending:
+        done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            raise TimeoutError("Bedrock call exceeded the invocation deadline")
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            last_error = future.exception()
+    raise last_error
+
+
+def call_converse(model_id: str, user_payload: dict, deadline: float | None = None, node_types=None):
+    """
+    Call Bedrock Converse API with tools.
+    
+    Transient errors (throttling etc.) are retried with full-jitter exponential
+    backoff, slow calls are hedged with a duplicate request, and a per-model
+    circuit breaker fails fast with CircuitOpenError during brownouts.
+    deadline is a time.monotonic() value no retry or hedge may run past.
+    node_types (from classify_intents) limits the tool specs sent.
+    
+    Returns: (tool_uses, raw_response, latency_ms)
+    tool_uses is a list of {"name": str, "input": dict}
+    """
+    client = get_client()
+    request = build_converse_request(model_id, user_payload, node_types)
+    breaker = get_breaker(model_id)
+    if deadline is None:
+        deadline = time.monotonic() + DEFAULT_DEADLINE_S
+    
+    if not breaker.allow_request():
+        raise CircuitOpenError(f"Circuit open for {model_id}")
+    
+    start_time = time.time()
+    attempt = 0
+    
+    try:
+        while True:
+            attempt_start = time.time()
+            try:
+                response = _converse_hedged(client, request, deadline)
+                break
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "")
+                attempt += 1
+                if code not in RETRYABLE_ERROR_CODES or attempt >= RETRY_MAX_ATTEMPTS:
+                    raise
+                delay = random.uniform(0, min(RETRY_MAX_DELAY_S, RETRY_BASE_DELAY_S * (2 ** attempt)))
+                if time.monotonic() + delay + MIN_ATTEMPT_S > deadline:
+                    raise
+                if breaker.is_open():
+                    # Other calls opened the circuit meanwhile - stop retrying
+                    raise CircuitOpenError(f"Circuit open for {model_id}") from e
+                logger.warning(json.dumps({
+                    "action": "bedrock_retry",
+                    "model_id": model_id,
+                    "error_code": code,
+                    "attempt": attempt,
+                    "delay_ms": int(delay * 1000)
+                }))
+                time.sleep(delay)
+    except Exception as e:
+        # One outcome per logical call, however many attempts it took
+        breaker.record(not is_breaker_failure(e))
+        raise
+    
+    breaker.record(True)
+    get_latency_tracker(model_id).add(int((time.time() - attempt_start) * 1000))
     
     latency_ms = int((time.time() - start_time) * 1000)
+    usage = extract_usage(response)
+    emit_converse_metrics(model_id, "Converse", latency_ms, usage)
     
     # Extract tool use from response
     tool_uses = []
@@ -433,4 +1013,6 @@ def call_converse(model_id: str, user_payload: dict):
                         "input": block["toolUse"]["input"]
                     })
     
+    log_intent_classification(node_types, tool_uses, usage)
+    
     return tool_uses, response, latency_ms
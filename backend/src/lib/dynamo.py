@@ -1,20 +1,73 @@
 """DynamoDB utilities."""
 
+import base64
+import hashlib
+import json
 import os
+import random
+import time
+import zlib
 from decimal import Decimal
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 
+_resource = None
 _table_cache = {}
+# Leaf types _convert_floats can skip
+_FLOAT_FREE_TYPES = frozenset((str, int, bool, type(None), Decimal))
+# Decodes the raw attribute values in ConditionalCheckFailed error responses
+_deserializer = TypeDeserializer()
+
+# BatchWriteItem accepts at most 25 requests per call
+BATCH_WRITE_CHUNK = 25
+BATCH_WRITE_MAX_ATTEMPTS = 6
+BATCH_WRITE_BASE_DELAY_S = 0.05
+# BatchGetItem accepts at most 100 keys per call
+BATCH_GET_CHUNK = 100
+
+# Node item attributes covered by content_hash; the timestamps are left
+# out because clients default them to "now" on every retry
+NODE_CONTENT_FIELDS = ("node", "status", "local_day", "raw_transcript", "raw_payload_subset")
+
+# raw_transcript / raw_payload_subset bigger than this (UTF-8 bytes) are
+# stored zlib-compressed in binary raw_transcript_z / raw_payload_z
+# attributes; read them with get_raw_transcript / get_raw_payload_subset
+RAW_COMPRESS_THRESHOLD_BYTES = 1024
+RAW_COMPRESS_LEVEL = 6
+# Node item attributes that are only present sometimes; put_node_item
+# removes the ones the new version of the item doesn't have
+OPTIONAL_NODE_ATTRIBUTES = (
+    "active_pk", "active_sk", "raw_transcript", "raw_transcript_z", "raw_payload_subset", "raw_payload_z"
+)
+
+# Per-user item whose change_version is bumped on every node write, so
+# readers can tell whether anything changed with one GetItem
+CHANGE_MARKER_SK = "meta#changes"
+
+# Sparse GSI holding only active nodes, ordered by creation time (see build_node_item)
+ACTIVE_INDEX_NAME = "active-index"
+# Partition/sort key attribute names of the table (None) and each index
+INDEX_KEYS = {
+    None: ("pk", "sk"),
+    ACTIVE_INDEX_NAME: ("active_pk", "active_sk"),
+}
+
+
+def get_resource():
+    """Get DynamoDB service resource (cached)."""
+    global _resource
+    if _resource is None:
+        _resource = boto3.resource("dynamodb")
+    return _resource
 
 
 def get_table(table_name: str = None):
     """Get DynamoDB table resource (cached)."""
     resolved = table_name or os.environ.get("TABLE_NAME")
     if resolved not in _table_cache:
-        dynamodb = boto3.resource("dynamodb")
-        _table_cache[resolved] = dynamodb.Table(resolved)
+        _table_cache[resolved] = get_resource().Table(resolved)
     return _table_cache[resolved]
 
 
@@ -37,27 +90,250 @@ def delete_item(pk: str, sk: str, table_name: str = None):
     return table.delete_item(Key={"pk": pk, "sk": sk})
 
 
-def query_items(pk: str, sk_prefix: str = None, table_name: str = None):
-    """Query items by partition key and optional sort key prefix."""
+def query_items(
+    pk: str,
+    sk_prefix: str = None,
+    table_name: str = None,
+    projection: list[str] = None,
+    index_name: str = None,
+    newest_first: bool = False
+) -> list[dict]:
+    """
+    Query all items by partition key and optional sort key prefix.
+    
+    Follows LastEvaluatedKey until the query is exhausted, so partitions
+    larger than one 1 MB response page are returned in full. With
+    index_name, pk and sk_prefix apply to that index's keys.
+    """
+    items = []
+    cursor_key = None
+    while True:
+        page, cursor_key = _query_once(
+            pk, sk_prefix, table_name, projection,
+            exclusive_start_key=cursor_key,
+            newest_first=newest_first,
+            index_name=index_name
+        )
+        items.extend(page)
+        if not cursor_key:
+            return items
+
+
+def query_page(
+    pk: str,
+    sk_prefix: str = None,
+    limit: int = None,
+    cursor: str = None,
+    projection: list[str] = None,
+    newest_first: bool = False,
+    table_name: str = None,
+    index_name: str = None
+) -> tuple[list[dict], str | None]:
+    """
+    Query one page of items.
+    
+    cursor is the opaque string returned as next_cursor by the previous
+    page (None for the first page). Returns (items, next_cursor);
+    next_cursor is None once there is nothing left. Raises ValueError for
+    a cursor that is malformed or belongs to another partition.
+    """
+    exclusive_start_key = decode_cursor(cursor, pk) if cursor else None
+    items, last_key = _query_once(
+        pk, sk_prefix, table_name, projection,
+        exclusive_start_key=exclusive_start_key,
+        limit=limit,
+        newest_first=newest_first,
+        index_name=index_name
+    )
+    return items, encode_cursor(last_key) if last_key else None
+
+
+def _query_once(
+    pk: str,
+    sk_prefix: str,
+    table_name: str,
+    projection: list[str],
+    exclusive_start_key: dict = None,
+    limit: int = None,
+    newest_first: bool = False,
+    index_name: str = None,
+    sk_range: tuple[str, str] = None,
+    filter_condition=None
+) -> tuple[list[dict], dict | None]:
+    """Run a single Query call. Returns (items, LastEvaluatedKey)."""
     table = get_table(table_name)
-    key_condition = Key("pk").eq(pk)
+    pk_name, sk_name = INDEX_KEYS[index_name]
+    key_condition = Key(pk_name).eq(pk)
     if sk_prefix:
-        key_condition = key_condition & Key("sk").begins_with(sk_prefix)
-    response = table.query(KeyConditionExpression=key_condition)
-    return response.get("Items", [])
+        key_condition = key_condition & Key(sk_name).begins_with(sk_prefix)
+    elif sk_range:
+        key_condition = key_condition & Key(sk_name).between(*sk_range)
+    
+    kwargs = {"KeyConditionExpression": key_condition}
+    if filter_condition is not None:
+        kwargs["FilterExpression"] = filter_condition
+    if index_name:
+        kwargs["IndexName"] = index_name
+    if projection:
+        # Alias every attribute so reserved words (status, ttl, ...) are safe
+        names = {f"#p{index}": name for index, name in enumerate(projection)}
+        kwargs["ProjectionExpression"] = ", ".join(names)
+        kwargs["ExpressionAttributeNames"] = names
+    if exclusive_start_key:
+        kwargs["ExclusiveStartKey"] = exclusive_start_key
+    if limit:
+        kwargs["Limit"] = limit
+    if newest_first:
+        kwargs["ScanIndexForward"] = False
+    
+    response = table.query(**kwargs)
+    return response.get("Items", []), response.get("LastEvaluatedKey")
+
+
+def encode_cursor(last_evaluated_key: dict) -> str:
+    """Encode a LastEvaluatedKey as an opaque, URL-safe cursor."""
+    raw = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, pk: str) -> dict:
+    """
+    Decode a cursor from encode_cursor back into an ExclusiveStartKey.
+    
+    The key must be for partition pk, so a client can't page through
+    another user's items by crafting a cursor. Raises ValueError otherwise.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if (
+        not isinstance(key, dict)
+        or key.get("pk") != pk
+        or not all(isinstance(value, str) for value in key.values())
+    ):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def batch_write_items(
+    put_items: list[dict] = None,
+    delete_keys: list[dict] = None,
+    table_name: str = None
+) -> list[dict]:
+    """
+    Write items with BatchWriteItem in 25-request chunks.
+    
+    UnprocessedItems are retried with jittered exponential backoff.
+    Returns the write requests that were still unprocessed after the final
+    attempt (empty list on full success), each shaped like
+    {"PutRequest": {"Item": ...}} or {"DeleteRequest": {"Key": ...}}.
+    """
+    resolved = table_name or os.environ.get("TABLE_NAME")
+    requests = [{"PutRequest": {"Item": item}} for item in (put_items or [])]
+    requests += [{"DeleteRequest": {"Key": key}} for key in (delete_keys or [])]
+    
+    failed = []
+    for start in range(0, len(requests), BATCH_WRITE_CHUNK):
+        pending = requests[start:start + BATCH_WRITE_CHUNK]
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            response = get_resource().batch_write_item(RequestItems={resolved: pending})
+            pending = response.get("UnprocessedItems", {}).get(resolved, [])
+            if not pending:
+                break
+            if attempt < BATCH_WRITE_MAX_ATTEMPTS - 1:
+                delay = BATCH_WRITE_BASE_DELAY_S * (2 ** attempt)
+                time.sleep(random.uniform(0, delay))
+        failed.extend(pending)
+    
+    return failed
+
+
+def batch_get_items(keys: list[dict], projection: list[str] = None, table_name: str = None) -> list[dict]:
+    """
+    Read items with BatchGetItem in 100-key chunks.
+    
+    UnprocessedKeys are retried with the same backoff as batch_write_items;
+    raises RuntimeError if some keys are still unprocessed after the final
+    attempt. Missing items are simply absent from the result, which is in
+    no particular order.
+    """
+    resolved = table_name or os.environ.get("TABLE_NAME")
+    request = {}
+    if projection:
+        names = {f"#p{index}": name for index, name in enumerate(projection)}
+        request["ProjectionExpression"] = ", ".join(names)
+        request["ExpressionAttributeNames"] = names
+    
+    items = []
+    for start in range(0, len(keys), BATCH_GET_CHUNK):
+        pending = dict(request, Keys=keys[start:start + BATCH_GET_CHUNK])
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            response = get_resource().batch_get_item(RequestItems={resolved: pending})
+            items.extend(response.get("Responses", {}).get(resolved, []))
+            pending = response.get("UnprocessedKeys", {}).get(resolved)
+            if not pending:
+                break
+            if attempt < BATCH_WRITE_MAX_ATTEMPTS - 1:
+                delay = BATCH_WRITE_BASE_DELAY_S * (2 ** attempt)
+                time.sleep(random.uniform(0, delay))
+        if pending:
+            raise RuntimeError(f"BatchGetItem left {len(pending['Keys'])} keys unprocessed")
+    
+    return items
 
 
 def _convert_floats(obj):
-    """Convert floats to Decimal for DynamoDB compatibility."""
+    """
+    Convert floats to Decimal for DynamoDB compatibility.
+    
+    Containers are copied only when something inside them changes, and
+    leaf values that can't hold a float are skipped without recursing.
+    """
+    obj_type = type(obj)
+    if obj_type is float:
+        return Decimal(str(obj))
+    if obj_type is dict:
+        changed = None
+        for key, value in obj.items():
+            if type(value) in _FLOAT_FREE_TYPES:
+                continue
+            new_value = _convert_floats(value)
+            if new_value is not value:
+                if changed is None:
+                    changed = dict(obj)
+                changed[key] = new_value
+        return obj if changed is None else changed
+    if obj_type is list:
+        changed = None
+        for index, value in enumerate(obj):
+            if type(value) in _FLOAT_FREE_TYPES:
+                continue
+            new_value = _convert_floats(value)
+            if new_value is not value:
+                if changed is None:
+                    changed = list(obj)
+                changed[index] = new_value
+        return obj if changed is None else changed
+    # Subclasses (OrderedDict, numpy floats...) take the plain path
     if isinstance(obj, float):
         return Decimal(str(obj))
-    elif isinstance(obj, dict):
+    if isinstance(obj, dict):
         return {k: _convert_floats(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
+    if isinstance(obj, list):
         return [_convert_floats(v) for v in obj]
     return obj
 
 
+class NodeVersionConflictError(Exception):
+    """Raised when a node was changed since the version the caller saved from."""
+    
+    def __init__(self, message: str, current_version: int | None = None):
+        super().__init__(message)
+        self.current_version = current_version
+
+
 def put_node_item(
     user_id: str,
     local_day: str,
@@ -67,23 +343,239 @@ def put_node_item(
     node_obj: dict,
     captured_at_iso: str,
     created_at_iso: str,
-    table_name: str = None
-) -> None:
+    table_name: str = None,
+    expected_version: int = None
+) -> dict:
     """
-    Store a node item in DynamoDB.
+    Store a node item in DynamoDB with one versioned UpdateItem.
     
     Uses pk/sk strategy for efficient "list today's nodes" queries:
     - pk: user#{user_id}
     - sk: day#{local_day}#node#{node_id}
+    plus a pointer item (see build_node_pointer_item) for by-ID lookups,
+    written only when the node item is created or moved.
+    
+    Every write bumps the item's version and stores a content_hash.
+    Saving content identical to what is stored is a no-op (so retries are
+    free). With expected_version the write only succeeds if the stored
+    version still matches (0 = the node must not be versioned yet) and
+    raises NodeVersionConflictError otherwise; without it the last writer
+    wins.
+    
+    Requests per save:
+    - re-save on the same local_day: the node UpdateItem, no read first
+    - create (expected_version 0): the node UpdateItem and the pointer
+    - no-op retry: the (failed) conditional UpdateItem only
+    - local_day changed: the failed UpdateItem on the new sk, then the
+      pointer and old item are read and the node moved in one transaction
+      (see _move_node_item)
+    Changed nodes also bump the user's change marker (bump_change_version):
+    one more small write, which is what lets GET /nodes/active answer
+    304 / from cache without querying the index. Moves do it inside their
+    transaction; no-ops skip it.
+    
+    Returns {"version": int, "changed": bool, "created": bool}.
     """
+    item = build_node_item(
+        user_id=user_id,
+        local_day=local_day,
+        node_id=node_id,
+        raw_transcript=raw_transcript,
+        raw_payload_subset=raw_payload_subset,
+        node_obj=node_obj,
+        captured_at_iso=captured_at_iso,
+        created_at_iso=created_at_iso
+    )
+    
+    if expected_version != 0:
+        # Assume the node is stored under this local_day; nothing there
+        # means it is new or moved day, which the pointer tells apart
+        result = _update_node_item(item, expected_version, must_exist=True, table_name=table_name)
+        if result is not None:
+            return result
+        
+        pointer = get_item(item["pk"], f"node#{node_id}", table_name=table_name)
+        previous_sk = pointer["ref_sk"] if pointer else None
+        if previous_sk and previous_sk != item["sk"]:
+            previous = get_item(item["pk"], previous_sk, table_name=table_name)
+            if previous:
+                return _move_node_item(item, previous, expected_version, table_name)
+        if expected_version is not None:
+            raise NodeVersionConflictError(
+                f"Node '{node_id}' was modified (stored version None, expected {expected_version})"
+            )
+    
+    result = _update_node_item(item, expected_version, must_exist=False, table_name=table_name)
+    if not result["created"]:
+        return result
+    
+    # New node item - write its pointer; if the node was stored under
+    # another day before, drop the stale copy
     table = get_table(table_name)
+    response = table.put_item(
+        Item=build_node_pointer_item(user_id, node_id, item["sk"]),
+        ReturnValues="ALL_OLD"
+    )
+    previous_sk = response.get("Attributes", {}).get("ref_sk")
+    if previous_sk and previous_sk != item["sk"]:
+        table.delete_item(Key={"pk": item["pk"], "sk": previous_sk})
+    return result
+
+
+def _update_node_item(item: dict, expected_version: int | None, must_exist: bool, table_name: str = None) -> dict | None:
+    """
+    Write a node item with one conditional UpdateItem (see put_node_item).
+    
+    With must_exist, returns None (nothing written) if there is no item at
+    item's sk. Bumps the change marker when something was written.
+    """
+    names = {"#version": "version"}
+    values = {":zero": 0, ":one": 1}
+    set_clauses = ["#version = if_not_exists(#version, :zero) + :one"]
+    for index, (name, value) in enumerate(item.items()):
+        if name in ("pk", "sk", "version"):
+            continue
+        names[f"#f{index}"] = name
+        values[f":f{index}"] = value
+        set_clauses.append(f"#f{index} = :f{index}")
+    update_expression = "SET " + ", ".join(set_clauses)
+    # Leaving the active status drops the node from the sparse active index,
+    # and a raw attribute switching form drops its other representation
+    removed = [name for name in OPTIONAL_NODE_ATTRIBUTES if name not in item]
+    if removed:
+        names.update({f"#r{index}": name for index, name in enumerate(removed)})
+        update_expression += " REMOVE " + ", ".join(f"#r{index}" for index in range(len(removed)))
+    
+    condition = Attr("content_hash").not_exists() | Attr("content_hash").ne(item["content_hash"])
+    if expected_version == 0:
+        condition = Attr("version").not_exists() & condition
+    elif expected_version is not None:
+        condition = Attr("version").eq(expected_version) & condition
+    if must_exist:
+        condition = Attr("pk").exists() & condition
+    
+    try:
+        response = get_table(table_name).update_item(
+            Key={"pk": item["pk"], "sk": item["sk"]},
+            UpdateExpression=update_expression,
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_OLD",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD"
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        if must_exist and "Item" not in e.response:
+            return None
+        current = {
+            name: _deserializer.deserialize(value)
+            for name, value in e.response.get("Item", {}).items()
+            if name in ("version", "content_hash")
+        }
+        current_version = int(current["version"]) if "version" in current else None
+        if current.get("content_hash") == item["content_hash"]:
+            # Same content is already stored, e.g. a retried save
+            return {"version": current_version, "changed": False, "created": False}
+        raise NodeVersionConflictError(
+            f"Node '{item['node_id']}' was modified (stored version {current_version}, expected {expected_version})",
+            current_version=current_version
+        ) from e
+    
+    old = response.get("Attributes") or {}
+    bump_change_version(item["pk"].removeprefix("user#"), table_name=table_name)
+    return {"version": int(old.get("version", 0)) + 1, "changed": True, "created": not old}
+
+
+def _move_node_item(item: dict, previous: dict, expected_version: int | None, table_name: str = None) -> dict:
+    """
+    Move a node item to a new sk (its local_day changed) in one transaction.
     
+    The new item continues the previous item's version. Writing it, deleting
+    the previous item and repointing the pointer only succeed together, and
+    only if the previous item is still at the version that was read (and at
+    expected_version when given); otherwise NodeVersionConflictError.
+    """
+    node_id = item["node_id"]
+    current_version = int(previous["version"]) if "version" in previous else None
+    if expected_version is not None and expected_version != (current_version or 0):
+        raise NodeVersionConflictError(
+            f"Node '{node_id}' was modified (stored version {current_version}, expected {expected_version})",
+            current_version=current_version
+        )
+    
+    item = dict(item, version=(current_version or 0) + 1)
+    if current_version is None:
+        delete_condition = {"ConditionExpression": "attribute_not_exists(#version)"}
+    else:
+        delete_condition = {
+            "ConditionExpression": "#version = :version",
+            "ExpressionAttributeValues": {":version": current_version}
+        }
+    
+    table = get_table(table_name)
+    user_id = item["pk"].removeprefix("user#")
+    try:
+        table.meta.client.transact_write_items(TransactItems=[
+            {"Put": {"TableName": table.name, "Item": item}},
+            {"Delete": {
+                "TableName": table.name,
+                "Key": {"pk": item["pk"], "sk": previous["sk"]},
+                "ExpressionAttributeNames": {"#version": "version"},
+                **delete_condition
+            }},
+            {"Put": {"TableName": table.name, "Item": build_node_pointer_item(user_id, node_id, item["sk"])}},
+            {"Update": dict(build_change_marker_update(user_id), TableName=table.name)},
+        ])
+    except ClientError as e:
+        reasons = e.response.get("CancellationReasons") or []
+        if not any(reason.get("Code") == "ConditionalCheckFailed" for reason in reasons):
+            raise
+        raise NodeVersionConflictError(
+            f"Node '{node_id}' was modified while moving it to {item['local_day']}",
+            current_version=current_version
+        ) from e
+    
+    return {"version": item["version"], "changed": True, "created": False}
+
+
+def put_node_items(user_id: str, entries: list[dict], table_name: str = None) -> list[str]:
+    """
+    Store several node items in one BatchWriteItem pass.
+    
+    Each entry holds the build_node_item keyword arguments except user_id.
+    Unlike put_node_item this overwrites unconditionally, which is what a
+    fresh ingest wants. Returns the node_ids whose node or pointer item
+    could not be written.
+    """
+    items = []
+    for entry in entries:
+        item = build_node_item(user_id=user_id, **entry)
+        items.append(item)
+        items.append(build_node_pointer_item(user_id, item["node_id"], item["sk"]))
+    failed = batch_write_items(put_items=items, table_name=table_name)
+    if len(failed) < len(items):
+        bump_change_version(user_id, table_name=table_name)
+    return list(dict.fromkeys(request["PutRequest"]["Item"]["node_id"] for request in failed))
+
+
+def build_node_item(
+    user_id: str,
+    local_day: str,
+    node_id: str,
+    raw_transcript: str,
+    raw_payload_subset: dict,
+    node_obj: dict,
+    captured_at_iso: str,
+    created_at_iso: str
+) -> dict:
+    """Build the DynamoDB item for a node (see put_node_item for the key layout)."""
     pk = f"user#{user_id}"
     sk = f"day#{local_day}#node#{node_id}"
     
     # Convert floats to Decimal for DynamoDB
     node_obj_clean = _convert_floats(node_obj)
-    raw_payload_clean = _convert_floats(raw_payload_subset)
     
     item = {
         "pk": pk,
@@ -93,23 +585,326 @@ def put_node_item(
         "captured_at_iso": captured_at_iso,
         "local_day": local_day,
         "status": node_obj.get("status", "active"),
-        "raw_transcript": raw_transcript[:10000],  # Limit size
-        "raw_payload_subset": raw_payload_clean,
         "node": node_obj_clean,
         "node_type": node_obj.get("node_type", "note"),
+        "version": 1,
     }
+    item.update(build_raw_attributes(raw_transcript[:10000], raw_payload_subset))  # Limit size
+    item["content_hash"] = node_content_hash(item)
+    
+    # Only active nodes carry the active-index keys, so the sparse index
+    # drops a node as soon as it is saved with any other status
+    if item["status"] == "active":
+        item.update(build_active_index_keys(user_id, node_id, created_at_iso))
+    
+    return item
+
+
+def node_content_hash(item: dict) -> str:
+    """
+    Hash of the content of a node item (see NODE_CONTENT_FIELDS).
+    
+    Raw attributes are hashed by value, so compressing them doesn't change it.
+    """
+    content = {field: item.get(field) for field in NODE_CONTENT_FIELDS}
+    content["raw_transcript"] = get_raw_transcript(item)
+    content["raw_payload_subset"] = get_raw_payload_subset(item)
+    raw = json.dumps(content, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _json_default(obj):
+    """Serialize DynamoDB values so a Decimal and the float it came from match."""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    return str(obj)
+
+
+def build_raw_attributes(raw_transcript: str, raw_payload_subset: dict) -> dict:
+    """
+    Raw transcript/payload attributes of a node item.
+    
+    Values over RAW_COMPRESS_THRESHOLD_BYTES go into zlib-compressed binary
+    attributes (raw_transcript_z, raw_payload_z), which cuts item size and
+    write units for long dictations; smaller ones stay plain.
+    """
+    attributes = {}
+    
+    transcript_bytes = raw_transcript.encode("utf-8")
+    if len(transcript_bytes) > RAW_COMPRESS_THRESHOLD_BYTES:
+        attributes["raw_transcript_z"] = zlib.compress(transcript_bytes, RAW_COMPRESS_LEVEL)
+    else:
+        attributes["raw_transcript"] = raw_transcript
+    
+    payload_bytes = json.dumps(raw_payload_subset, separators=(",", ":"), default=_json_default).encode("utf-8")
+    if len(payload_bytes) > RAW_COMPRESS_THRESHOLD_BYTES:
+        attributes["raw_payload_z"] = zlib.compress(payload_bytes, RAW_COMPRESS_LEVEL)
+    else:
+        attributes["raw_payload_subset"] = _convert_floats(raw_payload_subset)
+    
+    return attributes
+
+
+def get_raw_transcript(item: dict) -> str:
+    """Raw transcript of a node item, decompressing it if it was stored compressed."""
+    if "raw_transcript_z" in item:
+        return zlib.decompress(bytes(item["raw_transcript_z"])).decode("utf-8")
+    return item.get("raw_transcript") or ""
+
+
+def get_raw_payload_subset(item: dict) -> dict:
+    """Raw payload subset of a node item, decompressing it if it was stored compressed."""
+    if "raw_payload_z" in item:
+        return json.loads(zlib.decompress(bytes(item["raw_payload_z"])), parse_float=Decimal)
+    return item.get("raw_payload_subset") or {}
+
+
+def build_active_index_keys(user_id: str, node_id: str, created_at_iso: str) -> dict:
+    """
+    Keys of a node in the active-index GSI.
+    
+    - active_pk: user#{user_id}
+    - active_sk: {created_at_iso}#{node_id} (sorts by creation time)
+    """
+    return {
+        "active_pk": f"user#{user_id}",
+        "active_sk": f"{created_at_iso}#{node_id}",
+    }
+
+
+def build_node_pointer_item(user_id: str, node_id: str, ref_sk: str) -> dict:
+    """
+    Build the by-ID pointer item for a node.
+    
+    - pk: user#{user_id}
+    - sk: node#{node_id}
+    - ref_sk: sk of the node item (day#{local_day}#node#{node_id})
+    Lets delete/complete find a node with one GetItem instead of a
+    partition query; list queries use the day# prefix and never see it.
+    """
+    return {
+        "pk": f"user#{user_id}",
+        "sk": f"node#{node_id}",
+        "node_id": node_id,
+        "ref_sk": ref_sk,
+    }
+
+
+def pointer_fallback_enabled() -> bool:
+    """
+    Return True while node_ids without a pointer item may still exist.
+    
+    Off by default: a pointer miss means the node doesn't exist and costs no
+    partition query. Set NODE_POINTER_FALLBACK to true only on tables that
+    still hold nodes from before pointers, until
+    scripts/backfill_node_index.py has run.
+    """
+    return os.environ.get("NODE_POINTER_FALLBACK", "false").lower() in ("1", "true", "yes")
+
+
+def find_node_sk(user_id: str, node_id: str, table_name: str = None) -> str | None:
+    """
+    Return the sk of a node item, or None if the user has no such node.
+    
+    Reads the pointer item. While pointer_fallback_enabled(), nodes written
+    before pointers existed (not yet backfilled by
+    scripts/backfill_node_index.py) fall back to a projected query over the
+    user's day# items.
+    """
+    pointer = get_item(f"user#{user_id}", f"node#{node_id}", table_name=table_name)
+    if pointer:
+        return pointer["ref_sk"]
+    if not pointer_fallback_enabled():
+        return None
+    return _scan_node_sks(user_id, {node_id}, table_name).get(node_id)
+
+
+def find_node_sks(user_id: str, node_ids: list[str], table_name: str = None) -> dict[str, str]:
+    """
+    Resolve several node_ids at once. Returns {node_id: sk} for the nodes found.
+    
+    Pointers are read with one BatchGetItem pass; any node_ids without a
+    pointer share a single fallback query (see find_node_sk).
+    """
+    pk = f"user#{user_id}"
+    pointers = batch_get_items(
+        [{"pk": pk, "sk": f"node#{node_id}"} for node_id in node_ids],
+        projection=["node_id", "ref_sk"],
+        table_name=table_name
+    )
+    sks = {pointer["node_id"]: pointer["ref_sk"] for pointer in pointers}
+    missing = set(node_ids) - sks.keys()
+    if missing and pointer_fallback_enabled():
+        sks.update(_scan_node_sks(user_id, missing, table_name))
+    return sks
+
+
+def _scan_node_sks(user_id: str, node_ids: set[str], table_name: str = None) -> dict[str, str]:
+    """
+    Find node sks by querying the user's day# items (for nodes without pointers).
+    
+    O(user history) - only used while pointer_fallback_enabled().
+    """
+    items = query_items(
+        pk=f"user#{user_id}",
+        sk_prefix="day#",
+        table_name=table_name,
+        projection=["sk", "node_id"]
+    )
+    return {item["node_id"]: item["sk"] for item in items if item.get("node_id") in node_ids}
+
+
+def mark_node_item_completed(item: dict) -> dict:
+    """
+    Return a copy of a node item with status completed and the next version.
+    
+    Drops the active-index keys so the node leaves GET /nodes/active.
+    """
+    item = {key: value for key, value in item.items() if key not in ("active_pk", "active_sk")}
+    item["status"] = "completed"
+    if isinstance(item.get("node"), dict):
+        item["node"] = dict(item["node"], status="completed")
+    item["version"] = int(item.get("version", 0)) + 1
+    item["content_hash"] = node_content_hash(item)
+    return item
+
+
+def complete_node_item(item: dict, table_name: str = None) -> int | None:
+    """
+    Mark a node item completed with one UpdateItem conditioned on its version.
+    
+    item is the node item as read. Returns the new version, or None (nothing
+    written) if the node was changed since it was read, so a concurrent
+    versioned save is never overwritten.
+    """
+    completed = mark_node_item_completed(item)
+    names = {"#version": "version", "#status": "status", "#hash": "content_hash"}
+    values = {":version": completed["version"], ":status": "completed", ":hash": completed["content_hash"]}
+    set_clauses = ["#version = :version", "#status = :status", "#hash = :hash"]
+    if "node" in completed:
+        names["#node"] = "node"
+        values[":node"] = completed["node"]
+        set_clauses.append("#node = :node")
+    names.update({"#apk": "active_pk", "#ask": "active_sk"})
+    
+    if "version" in item:
+        condition = Attr("version").eq(item["version"])
+    else:
+        condition = Attr("version").not_exists()
     
     try:
-        table.put_item(
-            Item=item,
-            ConditionExpression=Attr("pk").not_exists() & Attr("sk").not_exists()
+        get_table(table_name).update_item(
+            Key={"pk": item["pk"], "sk": item["sk"]},
+            UpdateExpression="SET " + ", ".join(set_clauses) + " REMOVE #apk, #ask",
+            ConditionExpression=Attr("pk").exists() & condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
         )
     except ClientError as e:
-        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-            # Item already exists - this is fine, just update
-            table.put_item(Item=item)
-        else:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
             raise
+        return None
+    return completed["version"]
+
+
+def delete_node_item(user_id: str, node_id: str, sk: str, table_name: str = None) -> bool:
+    """
+    Delete a node item and its pointer.
+    
+    Returns False if the node item was already gone (a stale pointer is
+    still removed).
+    """
+    table = get_table(table_name)
+    pk = f"user#{user_id}"
+    response = table.delete_item(Key={"pk": pk, "sk": sk}, ReturnValues="ALL_OLD")
+    table.delete_item(Key={"pk": pk, "sk": f"node#{node_id}"})
+    deleted = bool(response.get("Attributes"))
+    if deleted:
+        bump_change_version(user_id, table_name=table_name)
+    return deleted
+
+
+def bump_change_version(user_id: str, table_name: str = None) -> int:
+    """
+    Record that the user's nodes changed. Returns the new change_version.
+    
+    Called after every node write (put_node_item, put_node_items,
+    delete_node_item and the batch endpoints), so a reader that sees the
+    new version also sees the write on the table.
+    """
+    response = get_table(table_name).update_item(**build_change_marker_update(user_id), ReturnValues="UPDATED_NEW")
+    return int(response["Attributes"]["change_version"])
+
+
+def build_change_marker_update(user_id: str) -> dict:
+    """UpdateItem arguments that bump a user's change marker (also usable in a transaction)."""
+    return {
+        "Key": {"pk": f"user#{user_id}", "sk": CHANGE_MARKER_SK},
+        "UpdateExpression": "ADD change_version :one SET changed_at_ms = :now",
+        "ExpressionAttributeValues": {":one": 1, ":now": int(time.time() * 1000)},
+    }
+
+
+def get_change_marker(user_id: str, table_name: str = None) -> dict:
+    """
+    Read the user's change marker (strongly consistent, one GetItem).
+    
+    Returns {"version": int, "changed_at_ms": int}; both are 0 for users
+    whose nodes have not been written since markers were introduced.
+    """
+    response = get_table(table_name).get_item(
+        Key={"pk": f"user#{user_id}", "sk": CHANGE_MARKER_SK},
+        ConsistentRead=True
+    )
+    item = response.get("Item") or {}
+    return {
+        "version": int(item.get("change_version", 0)),
+        "changed_at_ms": int(item.get("changed_at_ms", 0))
+    }
+
+
+def query_nodes_by_day_range(
+    user_id: str,
+    start_day: str,
+    end_day: str,
+    node_type: str = None,
+    status: str = None,
+    limit: int = None,
+    cursor: str = None,
+    projection: list[str] = None,
+    table_name: str = None
+) -> tuple[list[dict], str | None]:
+    """
+    Query one page of a user's nodes for local days start_day..end_day (inclusive).
+    
+    Reads only the key range sk BETWEEN day#{start_day} and day#{end_day}~
+    ("~" sorts after "#node#...", so end_day's nodes are included), oldest
+    day first. node_type and status are applied as filters, so a page can
+    hold fewer than limit items while next_cursor is still set. Returns
+    (items, next_cursor) like query_page; without a limit the whole range
+    is read and next_cursor is None.
+    """
+    pk = f"user#{user_id}"
+    filter_condition = None
+    if node_type:
+        filter_condition = Attr("node_type").eq(node_type)
+    if status:
+        status_condition = Attr("status").eq(status)
+        filter_condition = status_condition if filter_condition is None else filter_condition & status_condition
+    
+    last_key = decode_cursor(cursor, pk) if cursor else None
+    items = []
+    while True:
+        page, last_key = _query_once(
+            pk, None, table_name, projection,
+            exclusive_start_key=last_key,
+            limit=limit,
+            sk_range=(f"day#{start_day}", f"day#{end_day}~"),
+            filter_condition=filter_condition
+        )
+        items.extend(page)
+        if limit or not last_key:
+            return items, encode_cursor(last_key) if last_key else None
 
 
 def query_nodes_by_day(user_id: str, local_day: str, table_name: str = None) -> list:
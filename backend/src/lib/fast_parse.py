@@ -0,0 +1,373 @@
+"""Deterministic fast-path parser for simple transcripts.
+
+Recognizes high-confidence single-intent reminders, todos and notes
+("remind me to call mom tomorrow at 7pm", "buy milk", "note to self ...")
+and builds the same tool input the model would, so trivial captures skip
+the Bedrock round trip. Anything ambiguous is scored below the threshold
+and left to the model.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+from dateutil import parser as dateutil_parser
+
+from lib.schemas import SCHEMA_VERSION
+
+logger = logging.getLogger()
+
+FAST_PATH_MODEL_ID = "local:fast-path"
+DEFAULT_MIN_CONFIDENCE = 0.85
+# Used when Bedrock is unavailable - a rough parse beats a fallback note
+DEGRADED_MIN_CONFIDENCE = 0.5
+# Parses that leave a time phrase unresolved ("by friday", "tomorrow
+# morning") score below DEGRADED_MIN_CONFIDENCE so the phrase is never
+# silently dropped
+UNRESOLVED_TIME_CONFIDENCE = 0.3
+
+# Per-container counters for hit-rate reporting, shared by the
+# /ingest/batch worker threads
+_stats = {"attempts": 0, "hits": 0}
+_stats_lock = threading.Lock()
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "ten": 10, "fifteen": 15, "twenty": 20, "thirty": 30, "forty five": 45
+}
+
+# Anything that suggests scheduling, multiple intents or fuzzy time goes to the model
+CALENDAR_WORDS = re.compile(
+    r"\b(schedule|set up|book|plan|meet|meeting|appointment|demo|interview|check-in|calendar|event)\b",
+    re.IGNORECASE
+)
+MULTI_INTENT = re.compile(r"\b(and then|also|and remind|and add|plus)\b|[.;!?]\s+\S", re.IGNORECASE)
+# Questions ("should I buy a new car?") are not captures - leave them to the model
+QUESTION_RE = re.compile(
+    r"^(?:who|whom|whose|what|when|where|why|how|which)\b"
+    r"|^(?:should|shall|can|could|would|will|do|does|did|is|are|am|was|were|have|has|may|might|must)\s+"
+    r"(?:i|we|you|he|she|they|it|my|our|your|this|that|there|the)\b",
+    re.IGNORECASE
+)
+FUZZY_TIME_WORDS = re.compile(
+    r"\b(morning|afternoon|evening|tonight|later|soon|weekend|week|month|year|o'?clock|"
+    r"noonish|before|after|until|by|every|each|daily|weekly|monthly)\b",
+    re.IGNORECASE
+)
+
+DAY_RE = re.compile(r"\b(?:on\s+)?(today|tomorrow|(?:next\s+|this\s+)?(?:" + "|".join(WEEKDAYS) + r"))\b", re.IGNORECASE)
+CLOCK_RE = re.compile(
+    r"\bat\s+(?:(noon|midnight)|(\d{1,2})(?::(\d{2}))?\s*(am|pm)?)(?=\W|$)",
+    re.IGNORECASE
+)
+# "7:30 p.m." -> "7:30 pm" before punctuation is stripped or read as a sentence end
+DOTTED_MERIDIEM_RE = re.compile(r"(?<![a-z])([ap])\.\s?m\.?(?![a-z])", re.IGNORECASE)
+RELATIVE_RE = re.compile(
+    r"\bin\s+(\d+|" + "|".join(NUMBER_WORDS) + r")\s+(minutes?|mins?|hours?|hrs?)\b",
+    re.IGNORECASE
+)
+
+REMINDER_RE = re.compile(r"^(?:please\s+)?(?:remind me|don'?t (?:let me )?forget)\s+(?:to\s+)?(?P<rest>.+)$", re.IGNORECASE)
+LIST_TODO_RE = re.compile(
+    r"^(?:please\s+)?add\s+(?P<task>.+?)\s+to\s+my\s+(?:todo|to-do|to do|task|shopping|grocery)\s+list$",
+    re.IGNORECASE
+)
+NEED_TODO_RE = re.compile(r"^(?:i\s+)?(?:need to|have to|gotta|should)\s+(?P<task>.+)$", re.IGNORECASE)
+TODO_PREFIX_RE = re.compile(r"^(?:todo|to-do|to do|task)\s*[:,]?\s+(?P<task>.+)$", re.IGNORECASE)
+IMPERATIVE_RE = re.compile(
+    r"^(?P<task>(?:buy|get|pick up|grab|order|pay|return|clean|wash|email|text|call|finish|submit|"
+    r"renew|cancel|water|feed|take out|print|charge|fix)\b.+)$",
+    re.IGNORECASE
+)
+NOTE_RE = re.compile(r"^(?:note to self|note that|note|remember that|fyi)\s*[:,]?\s+(?P<content>.+)$", re.IGNORECASE)
+
+
+def is_enabled() -> bool:
+    """Return True unless FAST_PATH_ENABLED is set to a false value."""
+    return os.environ.get("FAST_PATH_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def min_confidence() -> float:
+    """Confidence a parse needs before it replaces the model call."""
+    try:
+        return float(os.environ.get("FAST_PATH_MIN_CONFIDENCE", DEFAULT_MIN_CONFIDENCE))
+    except ValueError:
+        return DEFAULT_MIN_CONFIDENCE
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip(" ,.!?")
+
+
+def _title(text: str) -> str:
+    text = _clean(text)
+    return (text[:1].upper() + text[1:])[:120]
+
+
+def _resolve_day(day_text: str, now: datetime) -> datetime:
+    """Resolve today/tomorrow/weekday names against the user's local date."""
+    day_text = re.sub(r"\s+", " ", day_text)
+    if day_text == "today":
+        return now
+    if day_text == "tomorrow":
+        return now + timedelta(days=1)
+    weekday = WEEKDAYS.index(day_text.split()[-1])
+    days_ahead = (weekday - now.weekday()) % 7
+    if days_ahead == 0 or day_text.startswith("next "):
+        # "monday" said on a Monday, or "next monday", means the coming one
+        days_ahead = days_ahead or 7
+    return now + timedelta(days=days_ahead)
+
+
+def _extract_time(text: str, now: datetime) -> tuple[str, datetime | None, str, bool]:
+    """
+    Pull a time expression out of text.
+
+    Returns (remaining_text, resolved_datetime, original_time_text, ambiguous).
+    resolved_datetime is None when no time expression was found.
+    """
+    relative = RELATIVE_RE.search(text)
+    if relative:
+        amount_text, unit = relative.group(1).lower(), relative.group(2).lower()
+        amount = int(amount_text) if amount_text.isdigit() else NUMBER_WORDS[amount_text]
+        delta = timedelta(hours=amount) if unit.startswith("h") else timedelta(minutes=amount)
+        remaining = text[:relative.start()] + text[relative.end():]
+        return remaining, now + delta, relative.group(0), bool(DAY_RE.search(remaining) or CLOCK_RE.search(remaining))
+
+    day = DAY_RE.search(text)
+    clock = CLOCK_RE.search(text)
+    if not day and not clock:
+        return text, None, "", False
+
+    original = " ".join(m.group(0) for m in sorted(filter(None, [day, clock]), key=lambda m: m.start()))
+    remaining = text
+    for match in sorted(filter(None, [day, clock]), key=lambda m: m.start(), reverse=True):
+        remaining = remaining[:match.start()] + remaining[match.end():]
+
+    if not clock:
+        # Date only - the model decides what time of day is meant
+        return remaining, None, original, True
+
+    ambiguous = False
+    if clock.group(1):
+        hour, minute = (12 if clock.group(1).lower() == "noon" else 0), 0
+    else:
+        hour = int(clock.group(2))
+        minute = int(clock.group(3) or 0)
+        meridiem = (clock.group(4) or "").lower()
+        if hour > 23 or minute > 59 or (meridiem and not 1 <= hour <= 12):
+            return remaining, None, original, True
+        if meridiem == "pm" and hour != 12:
+            hour += 12
+        elif meridiem == "am" and hour == 12:
+            hour = 0
+        elif not meridiem and hour <= 12:
+            # "at 7" - AM or PM?
+            ambiguous = True
+
+    base = _resolve_day(day.group(1).lower(), now) if day else now
+    resolved = base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if not day and resolved <= now:
+        # "at 9am" when it's already past 9 - could mean tomorrow
+        ambiguous = True
+    return remaining, resolved, original, ambiguous
+
+
+def _base_node(node_type: str, title: str, transcript: str, confidence: float) -> dict:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "node_type": node_type,
+        "title": _title(title),
+        "body": transcript[:4000],
+        "tags": [],
+        "status": "active",
+        "confidence": confidence,
+        "evidence": [{"quote": transcript[:500]}],
+        "location_context": {
+            "location_used": False,
+            "location_relevance": "Not needed for this capture"
+        },
+        "global_warnings": []
+    }
+
+
+def _time_interpretation(original_text: str, resolved: datetime | None) -> dict:
+    if resolved is None:
+        return {
+            "original_text": "",
+            "kind": "unspecified",
+            "needs_clarification": False
+        }
+    return {
+        "original_text": original_text,
+        "kind": "datetime",
+        "resolved_start_iso": resolved.isoformat(),
+        "needs_clarification": False,
+        "resolution_notes": "Resolved by fast-path parser against user_time_iso"
+    }
+
+
+def _parse_reminder(rest: str, transcript: str, now: datetime) -> tuple[dict, float] | None:
+    remaining, resolved, original, ambiguous = _extract_time(rest, now)
+    task = _clean(remaining)
+    if not task:
+        return None
+
+    node = _base_node("reminder", task, transcript, 0.9)
+    when = _time_interpretation(original, resolved)
+    node["time_interpretation"] = dict(when)
+    node["reminder"] = {
+        "reminder_text": task,
+        "when": when,
+        "trigger_datetime_iso": resolved.isoformat() if resolved else None,
+        "priority": "normal"
+    }
+
+    # A reminder with no time, or an AM/PM guess, needs the model's judgement
+    if resolved is not None and not ambiguous:
+        confidence = 0.9
+    elif original and resolved is None:
+        confidence = UNRESOLVED_TIME_CONFIDENCE
+    else:
+        confidence = 0.4
+    return node, confidence
+
+
+def _parse_todo(task_text: str, transcript: str, now: datetime, confidence: float) -> tuple[dict, float] | None:
+    remaining, resolved, original, ambiguous = _extract_time(task_text, now)
+    task = _clean(remaining)
+    if not task:
+        return None
+
+    node = _base_node("todo", task, transcript, confidence)
+    due = _time_interpretation(original, resolved)
+    node["todo"] = {
+        "task": _title(task),
+        "due": due,
+        "priority": "normal",
+        "status_detail": "open"
+    }
+    if resolved is not None:
+        node["time_interpretation"] = dict(due)
+        node["todo"]["due_datetime_iso"] = resolved.isoformat()
+    if original and resolved is None:
+        # e.g. a date without a time - not kept as the due date
+        confidence = min(confidence, UNRESOLVED_TIME_CONFIDENCE)
+    elif ambiguous:
+        confidence = min(confidence, 0.5)
+    return node, confidence
+
+
+def _parse_note(content: str, transcript: str) -> tuple[dict, float]:
+    content = _clean(content)
+    node = _base_node("note", content, transcript, 0.9)
+    node["note"] = {
+        "content": content[:4000],
+        "category_hint": "other",
+        "pin": False,
+        "related_entities": []
+    }
+    return node, 0.9
+
+
+def parse_transcript(transcript: str, user_time_iso: str) -> tuple[dict | None, float]:
+    """
+    Try to parse a transcript without the model.
+
+    Returns (tool_use, confidence); tool_use is {"name": str, "input": dict}
+    shaped like a Converse tool call, or None when no pattern matched.
+    """
+    try:
+        now = dateutil_parser.isoparse(user_time_iso)
+    except Exception:
+        return None, 0.0
+
+    text = _clean(DOTTED_MERIDIEM_RE.sub(lambda m: m.group(1).lower() + "m", transcript))
+    if not text or len(text) > 200:
+        return None, 0.0
+    # _clean drops the trailing "?", so check the raw transcript for it
+    if transcript.rstrip().endswith("?") or QUESTION_RE.match(text):
+        return None, 0.0
+    if CALENDAR_WORDS.search(text) or MULTI_INTENT.search(text):
+        return None, 0.0
+
+    result = None
+    tool_name = None
+    fuzzy = bool(FUZZY_TIME_WORDS.search(text))
+
+    note = NOTE_RE.match(text)
+    reminder = REMINDER_RE.match(text)
+    if note:
+        result, tool_name = _parse_note(note.group("content"), transcript), "create_note_node"
+    elif reminder:
+        result, tool_name = _parse_reminder(reminder.group("rest"), transcript, now), "create_reminder_node"
+    else:
+        for pattern, confidence in ((LIST_TODO_RE, 0.92), (TODO_PREFIX_RE, 0.92), (NEED_TODO_RE, 0.88), (IMPERATIVE_RE, 0.88)):
+            match = pattern.match(text)
+            if match:
+                result = _parse_todo(match.group("task"), transcript, now, confidence)
+                tool_name = "create_todo_node"
+                break
+
+    if not result:
+        return None, 0.0
+
+    node, confidence = result
+    if fuzzy and tool_name != "create_note_node":
+        # The fuzzy phrase is left in the title rather than resolved
+        confidence = min(confidence, UNRESOLVED_TIME_CONFIDENCE)
+    node["confidence"] = confidence
+    return {"name": tool_name, "input": node}, confidence
+
+
+def try_fast_path(
+    transcript: str,
+    user_time_iso: str,
+    user_id: str = "",
+    threshold: float | None = None
+) -> dict | None:
+    """
+    Run the fast-path parser and report the hit rate.
+
+    Returns a tool_use when the parse clears threshold (default
+    FAST_PATH_MIN_CONFIDENCE), otherwise None so the caller falls back to Bedrock.
+    """
+    if threshold is None:
+        threshold = min_confidence()
+    tool_use, confidence = parse_transcript(transcript, user_time_iso)
+    hit = tool_use is not None and confidence >= threshold
+
+    with _stats_lock:
+        _stats["attempts"] += 1
+        if hit:
+            _stats["hits"] += 1
+        attempts, hits = _stats["attempts"], _stats["hits"]
+
+    logger.info(json.dumps({
+        "action": "fast_path",
+        "hit": hit,
+        "tool_name": tool_use["name"] if tool_use else None,
+        "confidence": confidence,
+        "threshold": threshold,
+        "container_attempts": attempts,
+        "container_hit_rate": round(hits / attempts, 4),
+        "user_id": user_id
+    }))
+
+    return tool_use if hit else None
+
+
+def get_stats() -> dict:
+    """Return this container's fast-path attempt and hit counts."""
+    with _stats_lock:
+        attempts, hits = _stats["attempts"], _stats["hits"]
+    return {
+        "attempts": attempts,
+        "hits": hits,
+        "hit_rate": hits / attempts if attempts else 0.0
+    }
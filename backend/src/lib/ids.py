@@ -1,5 +1,6 @@
 """ID generation utilities for BrainDump."""
 
+import hashlib
 import uuid
 import time
 
@@ -16,6 +17,18 @@ def generate_node_id() -> str:
     return f"node_{timestamp_hex}_{random_suffix}"
 
 
+def derive_node_id(seed: str, index: int) -> str:
+    """
+    Derive a stable node ID from a seed (e.g. an ingest job_id) and the node's position.
+    
+    Format: node_{hash_prefix}_{index}
+    Re-running the same job yields the same IDs, so its writes overwrite
+    instead of duplicating.
+    """
+    digest = hashlib.sha256(f"{seed}#{index}".encode("utf-8")).hexdigest()[:16]
+    return f"node_{digest}_{index}"
+
+
 def generate_ulid_like() -> str:
     """
     Generate a ULID-like ID (time-sortable).
@@ -0,0 +1,143 @@
+"""Content-addressed cache of ingest results.
+
+Keyed on everything that determines the model output: the normalized
+transcript, the user_time_iso minute and offset, user_location, the model ID
+and the prompt version, plus the authenticated user ID (never the
+client-sent body field) so one user's results are never served to another. Entries live in DynamoDB with a TTL, fronted by a small
+per-container LRU that is shared by the /ingest/batch worker threads.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from dateutil import parser as dateutil_parser
+
+from lib.dynamo import get_item, put_item
+
+logger = logging.getLogger()
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_LRU_SIZE = 256
+
+# hash -> (expires_at_epoch, nodes)
+_lru = OrderedDict()
+_lru_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """Return True unless INGEST_CACHE_ENABLED is set to a false value."""
+    return os.environ.get("INGEST_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def _ttl_seconds() -> int:
+    try:
+        return int(os.environ.get("INGEST_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def _lru_size() -> int:
+    try:
+        return int(os.environ.get("INGEST_CACHE_LRU_SIZE", DEFAULT_LRU_SIZE))
+    except ValueError:
+        return DEFAULT_LRU_SIZE
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Collapse whitespace so trivially different re-sends share a key."""
+    return re.sub(r"\s+", " ", transcript).strip()
+
+
+def minute_bucket(user_time_iso: str) -> str:
+    """Truncate user_time_iso to the minute, keeping its offset."""
+    try:
+        dt = dateutil_parser.isoparse(user_time_iso)
+        return dt.replace(second=0, microsecond=0).isoformat()
+    except Exception:
+        return user_time_iso
+
+
+def build_cache_key(user_payload: dict, model_id: str, prompt_version: str, user_id: str) -> str:
+    """Hash the inputs that determine the model output, scoped to one user."""
+    key_material = json.dumps({
+        "user_id": user_id,
+        "transcript": normalize_transcript(user_payload["transcript"]),
+        "user_time": minute_bucket(user_payload["user_time_iso"]),
+        "user_location": user_payload.get("user_location"),
+        "user_timezone": user_payload.get("user_timezone"),
+        "model_id": model_id,
+        "prompt_version": prompt_version
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, expires_at: int, nodes: list[dict]) -> None:
+    with _lru_lock:
+        _lru[key] = (expires_at, nodes)
+        _lru.move_to_end(key)
+        while len(_lru) > _lru_size():
+            _lru.popitem(last=False)
+
+
+def _recall(key: str, now: int) -> list[dict] | None:
+    """Return the LRU entry for key unless it is missing or expired."""
+    with _lru_lock:
+        entry = _lru.get(key)
+        if entry is None:
+            return None
+        expires_at, nodes = entry
+        if expires_at <= now:
+            del _lru[key]
+            return None
+        _lru.move_to_end(key)
+        return nodes
+
+
+def get_cached_nodes(key: str) -> list[dict] | None:
+    """
+    Look up cached nodes, LRU first, then DynamoDB.
+
+    Returns deep copies safe to mutate, or None on a miss.
+    """
+    now = int(time.time())
+
+    nodes = _recall(key, now)
+    if nodes is not None:
+        return json.loads(json.dumps(nodes))
+
+    try:
+        item = get_item(f"ingest_cache#{key}", "result")
+    except Exception as e:
+        logger.warning(f"Ingest cache read failed: {str(e)}")
+        return None
+
+    # DynamoDB TTL deletion is lazy, so check expiry ourselves
+    if not item or int(item.get("ttl", 0)) <= now:
+        return None
+
+    nodes = json.loads(item["nodes_json"])
+    _remember(key, int(item["ttl"]), nodes)
+    return json.loads(item["nodes_json"])
+
+
+def put_cached_nodes(key: str, nodes: list[dict]) -> None:
+    """Store nodes under key in the LRU and in DynamoDB with a TTL."""
+    expires_at = int(time.time()) + _ttl_seconds()
+    nodes_json = json.dumps(nodes, ensure_ascii=False)
+    _remember(key, expires_at, json.loads(nodes_json))
+
+    try:
+        put_item({
+            "pk": f"ingest_cache#{key}",
+            "sk": "result",
+            "nodes_json": nodes_json,
+            "ttl": expires_at
+        })
+    except Exception as e:
+        logger.warning(f"Ingest cache write failed: {str(e)}")
@@ -0,0 +1,77 @@
+"""Job records for asynchronous ingest.
+
+Jobs are stored next to the user's nodes:
+- pk: user#{user_id}
+- sk: job#{job_id}
+and expire through the table's ttl attribute.
+"""
+
+import json
+import time
+import uuid
+
+from lib.dynamo import get_item, put_item
+from lib.time_normalize import utc_now_iso
+
+JOB_TTL_SECONDS = 7 * 86400
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+def generate_job_id() -> str:
+    """Generate a unique ingest job ID."""
+    return f"job_{uuid.uuid4().hex}"
+
+
+def _job_key(user_id: str, job_id: str) -> tuple[str, str]:
+    return f"user#{user_id}", f"job#{job_id}"
+
+
+def save_job(user_id: str, job_id: str, status: str, created_at_iso: str,
+             result: dict = None, error: str = None) -> dict:
+    """Write the full job record (jobs are small, so updates rewrite the item)."""
+    pk, sk = _job_key(user_id, job_id)
+    item = {
+        "pk": pk,
+        "sk": sk,
+        "job_id": job_id,
+        "job_status": status,
+        "created_at_iso": created_at_iso,
+        "updated_at_iso": utc_now_iso(),
+        "ttl": int(time.time()) + JOB_TTL_SECONDS
+    }
+    if result is not None:
+        # Stored as JSON text so floats survive without Decimal conversion
+        item["result_json"] = json.dumps(result)
+    if error:
+        item["error"] = error
+    put_item(item)
+    return item
+
+
+def get_job(user_id: str, job_id: str) -> dict | None:
+    """
+    Load a job as an API-facing dict, or None if it doesn't exist.
+
+    Returns {"job_id", "status", "created_at_iso", "updated_at_iso"} plus
+    "result" when succeeded and "error" when failed.
+    """
+    pk, sk = _job_key(user_id, job_id)
+    item = get_item(pk, sk)
+    if not item:
+        return None
+
+    job = {
+        "job_id": item["job_id"],
+        "status": item["job_status"],
+        "created_at_iso": item.get("created_at_iso"),
+        "updated_at_iso": item.get("updated_at_iso")
+    }
+    if "result_json" in item:
+        job["result"] = json.loads(item["result_json"])
+    if "error" in item:
+        job["error"] = item["error"]
+    return job
@@ -0,0 +1,65 @@
+"""Queue for asynchronous ingest jobs.
+
+SQS in deployed stacks (INGEST_QUEUE_URL set); an in-memory stand-in
+otherwise, so the submit -> worker -> status path runs locally and in tests
+without AWS.
+"""
+
+import json
+import os
+
+import boto3
+
+_queue = None
+
+
+class SqsQueue:
+    """Ingest job queue backed by SQS."""
+
+    def __init__(self, queue_url: str):
+        self.queue_url = queue_url
+        self._client = boto3.client("sqs")
+
+    def send(self, message: dict) -> None:
+        self._client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(message))
+
+    def is_local(self) -> bool:
+        return False
+
+
+class InMemoryQueue:
+    """
+    In-process stand-in for SQS.
+
+    Messages are held until drain() hands them to a consumer, in the same
+    SQS event shape the worker Lambda receives.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message: dict) -> None:
+        self.messages.append(json.dumps(message))
+
+    def is_local(self) -> bool:
+        return True
+
+    def drain(self, consumer) -> dict:
+        """Deliver all queued messages to consumer(event, context) as one SQS-style event."""
+        if not self.messages:
+            return {"batchItemFailures": []}
+        records = [
+            {"messageId": str(index), "body": body}
+            for index, body in enumerate(self.messages)
+        ]
+        self.messages = []
+        return consumer({"Records": records}, None)
+
+
+def get_queue():
+    """Get the ingest queue (cached): SQS if INGEST_QUEUE_URL is set, else in-memory."""
+    global _queue
+    if _queue is None:
+        queue_url = os.environ.get("INGEST_QUEUE_URL")
+        _queue = SqsQueue(queue_url) if queue_url else InMemoryQueue()
+    return _queue
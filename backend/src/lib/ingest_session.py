@@ -0,0 +1,159 @@
+"""Incremental ingest sessions for live transcripts.
+
+A session keeps the running transcript and the nodes parsed so far:
+- pk: user#{user_id}
+- sk: session#{session_id}
+Each delta appends text; only utterances that are complete (end in sentence
+punctuation) and not yet parsed are sent through the pipeline, so by the
+time the user stops talking most of the work is already done.
+"""
+
+import json
+import re
+import time
+import uuid
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from lib.dynamo import get_table, get_item, delete_item
+
+SESSION_TTL_SECONDS = 86400
+MAX_TRANSCRIPT_CHARS = 20000
+
+# An utterance is complete once it ends in sentence punctuation
+UTTERANCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s|$)")
+
+
+class SessionConflictError(Exception):
+    """Raised when a session was updated concurrently."""
+
+
+def generate_session_id() -> str:
+    """Generate a unique ingest session ID."""
+    return f"sess_{uuid.uuid4().hex}"
+
+
+def append_delta(transcript: str, delta: str) -> str:
+    """Append a transcript delta, keeping exactly one space between segments."""
+    delta = delta.strip()
+    if not delta:
+        return transcript
+    if not transcript:
+        return delta
+    return f"{transcript} {delta}"
+
+
+def take_completed_text(transcript: str, parsed_upto: int) -> tuple[str, int]:
+    """
+    Take the complete utterances after parsed_upto.
+
+    Returns (text, new_parsed_upto). Text after the last sentence terminator
+    is still being spoken and is left for a later delta or finish; all the
+    newly completed utterances go to the model together in one call.
+    """
+    pending = transcript[parsed_upto:]
+    last_end = 0
+    for match in UTTERANCE_END.finditer(pending):
+        last_end = match.end()
+
+    text = pending[:last_end].strip()
+    if not text.strip(" .!?"):
+        return "", parsed_upto + last_end
+    return text, parsed_upto + last_end
+
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"\W+", " ", text or "").strip().casefold()
+
+
+def _dedupe_key(node: dict) -> tuple[str, str]:
+    return node.get("node_type", ""), _normalize_text(node.get("title"))
+
+
+def _is_fallback(node: dict) -> bool:
+    return bool(node.get("parse_debug", {}).get("fallback_used"))
+
+
+def _covered_text(nodes: list[dict]) -> list[str]:
+    """Normalized text a real node carries from its utterance: body, note content and evidence quotes."""
+    texts = []
+    for node in nodes:
+        texts.append(_normalize_text(node.get("body")))
+        texts.append(_normalize_text((node.get("note") or {}).get("content")))
+        texts.extend(_normalize_text(evidence.get("quote")) for evidence in node.get("evidence") or [])
+    return [text for text in texts if text]
+
+
+def merge_nodes(nodes: list[dict]) -> list[dict]:
+    """
+    Merge nodes parsed from separate utterances.
+
+    Nodes with the same type and (normalized) title are duplicates; the later
+    one wins since people correct themselves as they go ("actually make it
+    8pm"). Fallback notes (an utterance Bedrock or validation could not turn
+    into nodes) hold that utterance's text, so they are kept unless a real
+    node already carries the same text; they are deduplicated by text, not
+    by their generic title.
+    """
+    real_texts = _covered_text([node for node in nodes if not _is_fallback(node)])
+
+    merged = {}
+    for node in nodes:
+        if _is_fallback(node):
+            source = _normalize_text(node.get("body"))
+            if source and any(source in text for text in real_texts):
+                continue
+            key = ("fallback", source)
+        else:
+            key = _dedupe_key(node)
+        merged.pop(key, None)
+        merged[key] = node
+    return list(merged.values())
+
+
+def new_session(user_id: str, session_id: str, context: dict) -> dict:
+    """Build a fresh session record. context holds the ingest fields shared by every utterance."""
+    return {
+        "pk": f"user#{user_id}",
+        "sk": f"session#{session_id}",
+        "session_id": session_id,
+        "context_json": json.dumps(context),
+        "transcript": "",
+        "parsed_upto": 0,
+        "nodes_json": "[]",
+        "version": 0,
+        "ttl": int(time.time()) + SESSION_TTL_SECONDS
+    }
+
+
+def load_session(user_id: str, session_id: str) -> dict | None:
+    """Load a session record, or None if missing or expired."""
+    item = get_item(f"user#{user_id}", f"session#{session_id}")
+    if not item or int(item.get("ttl", 0)) <= int(time.time()):
+        return None
+    return item
+
+
+def save_session(session: dict) -> dict:
+    """
+    Write a session, guarding against concurrent deltas.
+
+    The write only succeeds if the stored version is the one this session
+    was loaded with; raises SessionConflictError otherwise.
+    """
+    expected_version = int(session["version"])
+    session = dict(session, version=expected_version + 1)
+    condition = Attr("pk").not_exists() if expected_version == 0 else Attr("version").eq(expected_version)
+    try:
+        get_table().put_item(Item=session, ConditionExpression=condition)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            raise SessionConflictError("Session was updated concurrently") from e
+        raise
+    return session
+
+
+def delete_session(user_id: str, session_id: str):
+    """Remove a finished session."""
+    delete_item(f"user#{user_id}", f"session#{session_id}")
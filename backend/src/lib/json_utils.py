@@ -4,6 +4,12 @@ import json
 from datetime import datetime
 from decimal import Decimal
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 def json_serial(obj):
     """JSON serializer for objects not serializable by default."""
@@ -20,3 +26,15 @@ def parse_body(event: dict) -> dict:
     if isinstance(body, str):
         return json.loads(body)
     return body
+
+
+def dumps(obj) -> str:
+    """
+    Serialize a response body.
+    
+    Uses orjson when it is installed, json otherwise; both fall back to
+    json_serial for Decimals and datetimes.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=json_serial, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, default=json_serial)
@@ -0,0 +1,45 @@
+"""CloudWatch Embedded Metric Format (EMF) helpers.
+
+Printing an EMF JSON line to stdout is enough for Lambda: CloudWatch Logs
+extracts the metrics asynchronously, with no PutMetricData call on the
+request path.
+"""
+
+import json
+import os
+import time
+
+DEFAULT_NAMESPACE = "SecondBrain"
+
+
+def build_emf_record(metrics: dict, dimensions: dict, properties: dict = None, namespace: str = None) -> dict:
+    """
+    Build an EMF record.
+
+    metrics maps metric name -> (value, unit), e.g. {"InputTokens": (812, "Count")}.
+    dimensions maps dimension name -> string value.
+    properties are extra searchable fields that are not metrics.
+    """
+    namespace = namespace or os.environ.get("METRICS_NAMESPACE", DEFAULT_NAMESPACE)
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": namespace,
+                "Dimensions": [list(dimensions)],
+                "Metrics": [{"Name": name, "Unit": unit} for name, (_, unit) in metrics.items()]
+            }]
+        },
+        **{name: str(value) for name, value in dimensions.items()},
+        **{name: value for name, (value, _) in metrics.items()}
+    }
+    if properties:
+        record.update(properties)
+    return record
+
+
+def emit_emf(metrics: dict, dimensions: dict, properties: dict = None, namespace: str = None) -> None:
+    """Print one EMF line to stdout for CloudWatch to pick up."""
+    if os.environ.get("METRICS_ENABLED", "true").lower() in ("0", "false", "no"):
+        return
+    print(json.dumps(build_emf_record(metrics, dimensions, properties, namespace)), flush=True)
@@ -1,16 +1,16 @@
 """API response utilities."""
 
-import json
-from lib.json_utils import json_serial
+from lib.json_utils import dumps
 
 
-def api_response(status_code: int, body: dict, headers: dict = None):
-    """Create an API Gateway response."""
+def serialized_response(status_code: int, body: str, headers: dict = None):
+    """Create an API Gateway response from an already serialized body."""
     default_headers = {
         "Content-Type": "application/json",
         "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Headers": "Content-Type,Authorization",
+        "Access-Control-Allow-Headers": "Content-Type,Authorization,If-None-Match",
         "Access-Control-Allow-Methods": "GET,POST,PATCH,DELETE,OPTIONS",
+        "Access-Control-Expose-Headers": "ETag",
     }
     if headers:
         default_headers.update(headers)
@@ -18,10 +18,20 @@ def api_response(status_code: int, body: dict, headers: dict = None):
     return {
         "statusCode": status_code,
         "headers": default_headers,
-        "body": json.dumps(body, default=json_serial),
+        "body": body,
     }
 
 
+def api_response(status_code: int, body: dict, headers: dict = None):
+    """Create an API Gateway response."""
+    return serialized_response(status_code, dumps(body), headers)
+
+
+def not_modified_response(etag: str):
+    """Create a 304 response for a conditional GET whose ETag still matches."""
+    return serialized_response(304, "", {"ETag": etag, "Cache-Control": "private, no-cache"})
+
+
 def error_response(status_code: int, message: str):
     """Create an error response."""
     return api_response(status_code, {"error": message})
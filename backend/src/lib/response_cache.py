@@ -0,0 +1,75 @@
+"""Per-container LRU of serialized GET responses, keyed by change version.
+
+Entries are stored per user and request (e.g. the page params) together
+with the user's change_version (lib/dynamo.get_change_marker) they were
+built from. Looking one up with a different version is a miss and drops
+all of that user's entries, so a write from any container invalidates
+them; there is no TTL.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+DEFAULT_LRU_SIZE = 128
+# Bodies bigger than this are served but not kept
+MAX_BODY_BYTES = 1024 * 1024
+
+# (user_id, request_key) -> (version, etag, body)
+_lru = OrderedDict()
+
+
+def is_enabled() -> bool:
+    """Return True unless NODES_CACHE_ENABLED is set to a false value."""
+    return os.environ.get("NODES_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def _lru_size() -> int:
+    try:
+        return int(os.environ.get("NODES_CACHE_LRU_SIZE", DEFAULT_LRU_SIZE))
+    except ValueError:
+        return DEFAULT_LRU_SIZE
+
+
+def build_etag(user_id: str, request_key: str, version: int) -> str:
+    """Strong ETag for one user's response to one request at one change version."""
+    digest = hashlib.sha256(f"{user_id}|{request_key}".encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header value covers etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in [value.removeprefix("W/") for value in candidates]
+
+
+def invalidate_user(user_id: str) -> None:
+    """Drop every cached response of a user."""
+    for key in [key for key in _lru if key[0] == user_id]:
+        del _lru[key]
+
+
+def get(user_id: str, request_key: str, version: int) -> tuple[str, str] | None:
+    """Return (etag, body) cached for this version, or None."""
+    if not is_enabled():
+        return None
+    entry = _lru.get((user_id, request_key))
+    if entry is None:
+        return None
+    if entry[0] != version:
+        invalidate_user(user_id)
+        return None
+    _lru.move_to_end((user_id, request_key))
+    return entry[1], entry[2]
+
+
+def put(user_id: str, request_key: str, version: int, etag: str, body: str) -> None:
+    """Remember a serialized body, evicting the least recently used entries."""
+    if not is_enabled() or len(body) > MAX_BODY_BYTES:
+        return
+    _lru[(user_id, request_key)] = (version, etag, body)
+    _lru.move_to_end((user_id, request_key))
+    while len(_lru) > _lru_size():
+        _lru.popitem(last=False)
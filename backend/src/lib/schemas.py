@@ -298,6 +298,11 @@ BRAINDUMP_NODE_SCHEMA = {
             "maxLength": 10,
             "description": "Timezone offset like -05:00"
         },
+        "timezone_name": {
+            "type": "string",
+            "maxLength": 64,
+            "description": "IANA time zone like America/Toronto, when the client sent one"
+        },
         "status": {"$ref": "#/$defs/status"},
         "confidence": {
             "type": "number",
@@ -329,7 +334,15 @@ BRAINDUMP_NODE_SCHEMA = {
                 "model_id": {"type": "string"},
                 "latency_ms": {"type": "integer"},
                 "tool_name_used": {"type": "string"},
-                "fallback_used": {"type": "boolean"}
+                "fallback_used": {"type": "boolean"},
+                "cache_hit": {"type": "boolean"},
+                "route": {"type": "string"},
+                "cache_read_input_tokens": {"type": "integer"},
+                "cache_write_input_tokens": {"type": "integer"},
+                "input_tokens": {"type": "integer"},
+                "output_tokens": {"type": "integer"},
+                "server_latency_ms": {"type": "integer"},
+                "stop_reason": {"type": "string"}
             },
             "additionalProperties": False
         }
@@ -354,6 +367,25 @@ def get_node_schema():
     return BRAINDUMP_NODE_SCHEMA
 
 
+def get_node_type_schema(node_type: str) -> dict:
+    """
+    Return the node schema narrowed to one node_type's branch.
+    
+    node_type is pinned (so its enum check is dropped) and the other types'
+    payload properties are left out. Only equivalent to the full schema for
+    nodes of that type that carry no other type's payload.
+    """
+    schema = BRAINDUMP_NODE_SCHEMA
+    other_payloads = set(schema["properties"]["node_type"]["enum"]) - {node_type}
+    properties = {
+        name: subschema
+        for name, subschema in schema["properties"].items()
+        if name not in other_payloads
+    }
+    properties["node_type"] = {}
+    return dict(schema, properties=properties)
+
+
 def get_schema_version():
     """Return the current schema version string."""
     return SCHEMA_VERSION
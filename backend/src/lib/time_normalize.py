@@ -1,9 +1,96 @@
 """Time normalization utilities for BrainDump."""
 
 import re
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dateutil import parser as dateutil_parser
-from dateutil.tz import tzoffset
+
+# Shapes datetime.fromisoformat parses exactly like dateutil's isoparse;
+# anything else (week dates, 24:00, offsets with seconds...) goes to dateutil
+FAST_ISO_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?(?:Z|[+-]\d{2}:\d{2})?$"
+)
+
+
+def parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO 8601 string.
+    
+    Common shapes use the C-level datetime.fromisoformat, everything else
+    dateutil's isoparse. Raises like isoparse on unparseable input.
+    """
+    if isinstance(value, str) and FAST_ISO_PATTERN.match(value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return dateutil_parser.isoparse(value)
+
+
+@lru_cache(maxsize=128)
+def offset_timezone(offset: str) -> timezone:
+    """Get a fixed-offset timezone for an offset like "-05:00" (memoized)."""
+    offset_hours = int(offset[1:3])
+    offset_minutes = int(offset[4:6])
+    offset_seconds = (offset_hours * 3600 + offset_minutes * 60)
+    if offset[0] == "-":
+        offset_seconds = -offset_seconds
+    return timezone(timedelta(seconds=offset_seconds))
+
+
+def get_zone(tz_name: str) -> ZoneInfo | None:
+    """Resolve an IANA zone name like "America/Toronto". Returns None if unknown."""
+    if not tz_name or not isinstance(tz_name, str):
+        return None
+    return _load_zone(tz_name)
+
+
+@lru_cache(maxsize=64)
+def _load_zone(tz_name: str) -> ZoneInfo | None:
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def localize(wall: datetime, zone: ZoneInfo) -> datetime:
+    """
+    Attach zone to a naive wall time, with the offset in effect on that date.
+    
+    Wall times skipped by a DST jump (e.g. 02:30 on spring-forward day) are
+    moved forward to the equivalent real time.
+    """
+    aware = wall.replace(tzinfo=zone)
+    return aware.astimezone(timezone.utc).astimezone(zone)
+
+
+def format_offset(offset: timedelta) -> str:
+    """Format a UTC offset as "+HH:MM"."""
+    total_seconds = int(offset.total_seconds())
+    sign = "+" if total_seconds >= 0 else "-"
+    total_seconds = abs(total_seconds)
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def resolve_user_offset(user_time_iso: str, tz_name: str | None = None) -> str:
+    """
+    Get the user's UTC offset like "-05:00".
+    
+    An offset in user_time_iso wins; a naive user_time_iso takes the offset
+    tz_name has at that wall time. Falls back to "+00:00".
+    """
+    zone = get_zone(tz_name)
+    if zone is not None:
+        try:
+            dt = parse_iso(user_time_iso)
+            if dt.tzinfo is None:
+                return format_offset(localize(dt, zone).utcoffset())
+        except Exception:
+            pass
+    return parse_offset_from_user_time_iso(user_time_iso)
 
 
 def parse_offset_from_user_time_iso(user_time_iso: str) -> str:
@@ -14,51 +101,43 @@ def parse_offset_from_user_time_iso(user_time_iso: str) -> str:
     Falls back to "+00:00" if parsing fails.
     """
     try:
-        dt = dateutil_parser.isoparse(user_time_iso)
+        dt = parse_iso(user_time_iso)
         if dt.tzinfo is not None:
             offset = dt.utcoffset()
             if offset is not None:
-                total_seconds = int(offset.total_seconds())
-                sign = "+" if total_seconds >= 0 else "-"
-                total_seconds = abs(total_seconds)
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                return f"{sign}{hours:02d}:{minutes:02d}"
+                return format_offset(offset)
     except Exception:
         pass
     return "+00:00"
 
 
-def ensure_iso_datetime(value: str, default_offset: str) -> str | None:
+def ensure_iso_datetime(value: str, default_offset: str, tz_name: str | None = None) -> str | None:
     """
     Ensure value is a valid ISO 8601 datetime with offset.
     
-    If value is missing offset, appends default_offset.
+    If value is missing offset, appends default_offset. With a known IANA
+    tz_name the offset is the one in effect at that wall time instead, so
+    times on the far side of a DST change get the right offset.
     Returns None if value is None/empty or unparseable.
     """
     if not value:
         return None
     
     try:
-        # Try parsing
-        dt = dateutil_parser.isoparse(value)
-        
-        # Parse the offset string to create tzoffset
-        offset_hours = int(default_offset[1:3])
-        offset_minutes = int(default_offset[4:6])
-        offset_seconds = (offset_hours * 3600 + offset_minutes * 60)
-        if default_offset[0] == "-":
-            offset_seconds = -offset_seconds
-        target_tz = tzoffset(None, offset_seconds)
-
-        # Always keep wall time and apply the user's offset (no conversion).
-        dt = dt.replace(tzinfo=target_tz)
-        
-        return dt.isoformat()
+        dt = parse_iso(value)
+        zone = get_zone(tz_name)
+        if zone is not None:
+            return localize(dt.replace(tzinfo=None), zone).isoformat()
+        return _with_offset(dt, default_offset)
     except Exception:
         return None
 
 
+def _with_offset(dt: datetime, offset: str) -> str:
+    """Keep wall time and apply the user's offset (no conversion)."""
+    return dt.replace(tzinfo=offset_timezone(offset)).isoformat()
+
+
 def ensure_iso_date(value: str) -> str | None:
     """
     Ensure value is a valid ISO date (YYYY-MM-DD).
@@ -70,7 +149,7 @@ def ensure_iso_date(value: str) -> str | None:
     
     try:
         # Try to parse and extract date
-        dt = dateutil_parser.isoparse(value)
+        dt = parse_iso(value)
         return dt.strftime("%Y-%m-%d")
     except Exception:
         pass
@@ -82,14 +161,19 @@ def ensure_iso_date(value: str) -> str | None:
     return None
 
 
-def compute_local_day(user_time_iso: str) -> str:
+def compute_local_day(user_time_iso: str, tz_name: str | None = None) -> str:
     """
     Compute local day (YYYY-MM-DD) from user_time_iso.
     
-    Respects the timezone offset in the input.
+    Respects the timezone offset in the input. With a known IANA tz_name an
+    offset-aware time is converted to that zone first, so UTC or stale-offset
+    timestamps still land on the user's calendar day.
     """
     try:
-        dt = dateutil_parser.isoparse(user_time_iso)
+        dt = parse_iso(user_time_iso)
+        zone = get_zone(tz_name)
+        if zone is not None and dt.tzinfo is not None:
+            dt = dt.astimezone(zone)
         return dt.strftime("%Y-%m-%d")
     except Exception:
         # Fallback to UTC now
@@ -119,91 +203,239 @@ def date_to_datetime_iso(date_str: str, time_str: str, offset: str) -> str | Non
     try:
         combined = f"{date_str}T{time_str}{offset}"
         # Validate by parsing
-        dateutil_parser.isoparse(combined)
+        parse_iso(combined)
         return combined
     except Exception:
         return None
 
 
-def normalize_node_times(node: dict, default_offset: str) -> tuple[dict, list[str]]:
+def normalize_node_times(node: dict, default_offset: str, tz_name: str | None = None) -> tuple[dict, list[str]]:
     """
     Post-process node to ensure all datetime fields have proper offsets.
     
+    Each field is parsed once. The node is copied once and a payload dict is
+    only copied when one of its fields changes, so the input is never mutated.
+    With a known IANA tz_name every field gets the offset in effect on its
+    own date rather than default_offset.
+    
     Returns (updated_node, warnings).
     """
+    return _apply_node_times(
+        node, default_offset,
+        lambda value: ensure_iso_datetime(value, default_offset, tz_name),
+        tz_name
+    )
+
+
+def _apply_node_times(node: dict, default_offset: str, to_datetime, tz_name: str | None = None) -> tuple[dict, list[str]]:
+    """
+    normalize_node_times with the datetime parsing supplied by the caller.
+    
+    to_datetime(value) returns ensure_iso_datetime(value, default_offset, tz_name),
+    either computed on demand or looked up from a bulk pass.
+    """
     warnings = []
     node = dict(node)  # shallow copy
     
     # Handle reminder trigger_datetime_iso
-    if "reminder" in node and node["reminder"]:
-        reminder = dict(node["reminder"])
-        if "trigger_datetime_iso" in reminder and reminder["trigger_datetime_iso"]:
-            normalized = ensure_iso_datetime(reminder["trigger_datetime_iso"], default_offset)
+    reminder = node.get("reminder")
+    if reminder:
+        updates = {}
+        trigger = reminder.get("trigger_datetime_iso")
+        if trigger:
+            normalized = to_datetime(trigger)
             if normalized:
-                reminder["trigger_datetime_iso"] = normalized
+                updates["trigger_datetime_iso"] = normalized
             else:
-                warnings.append(f"Could not parse trigger_datetime_iso: {reminder['trigger_datetime_iso']}")
-                reminder["trigger_datetime_iso"] = None
+                warnings.append(f"Could not parse trigger_datetime_iso: {trigger}")
+                updates["trigger_datetime_iso"] = None
         
         # If no trigger time but we have a date, default to 09:00
-        when = reminder.get("when", {})
-        if not reminder.get("trigger_datetime_iso") and not when.get("needs_clarification"):
+        when = reminder.get("when") or {}
+        if not updates.get("trigger_datetime_iso", trigger) and not when.get("needs_clarification"):
             resolved_start = when.get("resolved_start_iso")
             if resolved_start:
-                normalized = ensure_iso_datetime(resolved_start, default_offset)
+                normalized = to_datetime(resolved_start)
                 if normalized and "T" not in resolved_start:
-                    # Date only - add default time
-                    date_part = ensure_iso_date(resolved_start)
-                    if date_part:
-                        reminder["trigger_datetime_iso"] = date_to_datetime_iso(date_part, "09:00:00", default_offset)
-                        warnings.append("Defaulted reminder time to 09:00 local")
+                    # Date only - add default time. isoformat zero-pads years
+                    # below 1000 where strftime doesn't, so re-parse those.
+                    date_part = ensure_iso_date(resolved_start) if normalized[0] == "0" else normalized[:10]
+                    if get_zone(tz_name) is not None:
+                        updates["trigger_datetime_iso"] = to_datetime(f"{date_part}T09:00:00")
+                    else:
+                        updates["trigger_datetime_iso"] = date_to_datetime_iso(date_part, "09:00:00", default_offset)
+                    warnings.append("Defaulted reminder time to 09:00 local")
                 elif normalized:
-                    reminder["trigger_datetime_iso"] = normalized
+                    updates["trigger_datetime_iso"] = normalized
         
-        node["reminder"] = reminder
+        if updates:
+            node["reminder"] = {**reminder, **updates}
     
     # Handle todo due times
-    if "todo" in node and node["todo"]:
-        todo = dict(node["todo"])
-        if "due_datetime_iso" in todo and todo["due_datetime_iso"]:
-            normalized = ensure_iso_datetime(todo["due_datetime_iso"], default_offset)
-            if normalized:
-                todo["due_datetime_iso"] = normalized
-            else:
-                warnings.append(f"Could not parse due_datetime_iso: {todo['due_datetime_iso']}")
-                todo["due_datetime_iso"] = None
+    todo = node.get("todo")
+    if todo:
+        updates = {}
+        due_datetime = todo.get("due_datetime_iso")
+        if due_datetime:
+            normalized = to_datetime(due_datetime)
+            if not normalized:
+                warnings.append(f"Could not parse due_datetime_iso: {due_datetime}")
+            updates["due_datetime_iso"] = normalized
         
-        if "due_date_iso" in todo and todo["due_date_iso"]:
-            normalized = ensure_iso_date(todo["due_date_iso"])
-            if normalized:
-                todo["due_date_iso"] = normalized
-            else:
-                warnings.append(f"Could not parse due_date_iso: {todo['due_date_iso']}")
-                todo["due_date_iso"] = None
+        due_date = todo.get("due_date_iso")
+        if due_date:
+            normalized = ensure_iso_date(due_date)
+            if not normalized:
+                warnings.append(f"Could not parse due_date_iso: {due_date}")
+            updates["due_date_iso"] = normalized
         
-        node["todo"] = todo
+        if updates:
+            node["todo"] = {**todo, **updates}
     
     # Handle calendar times
-    if "calendar_placeholder" in node and node["calendar_placeholder"]:
-        cal = dict(node["calendar_placeholder"])
+    cal = node.get("calendar_placeholder")
+    if cal:
+        updates = {}
         for field in ["start_datetime_iso", "end_datetime_iso"]:
-            if field in cal and cal[field]:
-                normalized = ensure_iso_datetime(cal[field], default_offset)
-                if normalized:
-                    cal[field] = normalized
-                else:
-                    warnings.append(f"Could not parse {field}: {cal[field]}")
-                    cal[field] = None
-        node["calendar_placeholder"] = cal
+            value = cal.get(field)
+            if value:
+                normalized = to_datetime(value)
+                if not normalized:
+                    warnings.append(f"Could not parse {field}: {value}")
+                updates[field] = normalized
+        if updates:
+            node["calendar_placeholder"] = {**cal, **updates}
     
     # Handle time_interpretation resolved times
-    if "time_interpretation" in node and node["time_interpretation"]:
-        ti = dict(node["time_interpretation"])
+    ti = node.get("time_interpretation")
+    if ti:
+        updates = {}
         for field in ["resolved_start_iso", "resolved_end_iso"]:
-            if field in ti and ti[field]:
-                normalized = ensure_iso_datetime(ti[field], default_offset)
+            value = ti.get(field)
+            if value:
+                normalized = to_datetime(value)
                 if normalized:
-                    ti[field] = normalized
-        node["time_interpretation"] = ti
+                    updates[field] = normalized
+        if updates:
+            node["time_interpretation"] = {**ti, **updates}
     
     return node, warnings
+
+
+# Bulk normalization for backfills - stored nodes repeat the same
+# timestamps a lot, so each distinct value is normalized once
+_MISSING = object()
+
+
+def _per_item(value, count: int) -> list:
+    """Expand a single offset / tz_name (or None) to one per item."""
+    if value is None or isinstance(value, str):
+        return [value] * count
+    return value
+
+
+def ensure_iso_datetimes(values: list, offsets, tz_names=None) -> tuple[list[str | None], list[int]]:
+    """
+    Columnar ensure_iso_datetime.
+    
+    values is a list of datetime strings (or empty values), offsets a list of
+    default offsets of the same length or one offset for every value, and
+    tz_names likewise a list of IANA zones (or None entries) or one zone.
+    Returns (normalized, unparseable) where normalized[i] equals
+    ensure_iso_datetime(values[i], offsets[i], tz_names[i]) and unparseable
+    holds the indices of non-empty values that could not be normalized.
+    """
+    offsets = _per_item(offsets, len(values))
+    tz_names = _per_item(tz_names, len(values))
+    
+    pairs = _normalize_pairs(zip(values, offsets, tz_names))
+    
+    results, unparseable = [], []
+    for index, (value, offset, tz_name) in enumerate(zip(values, offsets, tz_names)):
+        if not value:
+            results.append(None)
+            continue
+        normalized = _lookup_datetime(pairs, offset, tz_name, value)
+        results.append(normalized)
+        if normalized is None:
+            unparseable.append(index)
+    
+    return results, unparseable
+
+
+def _normalize_pairs(value_offsets) -> dict:
+    """
+    Normalize (value, offset, tz_name) triples. Returns {triple: normalized}.
+    
+    Each distinct triple goes through ensure_iso_datetime once.
+    """
+    pairs = {}
+    for triple in value_offsets:
+        if triple[0] and isinstance(triple[0], str) and triple not in pairs:
+            pairs[triple] = ensure_iso_datetime(*triple)
+    return pairs
+
+
+def _lookup_datetime(pairs: dict, offset: str, tz_name: str | None, value) -> str | None:
+    """ensure_iso_datetime(value, offset, tz_name), served from pairs when it was already normalized."""
+    if isinstance(value, str):
+        normalized = pairs.get((value, offset, tz_name), _MISSING)
+        if normalized is not _MISSING:
+            return normalized
+    return ensure_iso_datetime(value, offset, tz_name)
+
+
+def _iter_node_datetime_values(node: dict):
+    """Yield the values normalize_node_times may pass to ensure_iso_datetime for a node."""
+    reminder = node.get("reminder")
+    if reminder:
+        yield reminder.get("trigger_datetime_iso")
+        yield (reminder.get("when") or {}).get("resolved_start_iso")
+    todo = node.get("todo")
+    if todo:
+        yield todo.get("due_datetime_iso")
+    cal = node.get("calendar_placeholder")
+    if cal:
+        yield cal.get("start_datetime_iso")
+        yield cal.get("end_datetime_iso")
+    ti = node.get("time_interpretation")
+    if ti:
+        yield ti.get("resolved_start_iso")
+        yield ti.get("resolved_end_iso")
+
+
+def bulk_normalize_node_times(
+    nodes: list[dict],
+    default_offsets,
+    tz_names=None
+) -> tuple[list[dict], list[list[str]]]:
+    """
+    normalize_node_times for many nodes at once (backfills, migrations).
+    
+    Every datetime field of every node is normalized in one columnar pass,
+    then written back with the same rules as normalize_node_times.
+    default_offsets is one offset per node or a single offset for all;
+    tz_names is the matching IANA zone per node (e.g. each stored node's
+    timezone_name, None where there is none) or a single zone for all.
+    Inputs are not mutated.
+    
+    Returns (updated_nodes, warnings_per_node).
+    """
+    default_offsets = _per_item(default_offsets, len(nodes))
+    tz_names = _per_item(tz_names, len(nodes))
+    
+    pairs = _normalize_pairs(
+        (value, offset, tz_name)
+        for node, offset, tz_name in zip(nodes, default_offsets, tz_names)
+        for value in _iter_node_datetime_values(node)
+    )
+    
+    updated_nodes, warnings = [], []
+    for node, offset, tz_name in zip(nodes, default_offsets, tz_names):
+        updated_node, node_warnings = _apply_node_times(
+            node, offset, partial(_lookup_datetime, pairs, offset, tz_name), tz_name
+        )
+        updated_nodes.append(updated_node)
+        warnings.append(node_warnings)
+    
+    return updated_nodes, warnings
@@ -1,6 +1,9 @@
 """Schema validation for BrainDump nodes."""
 
-from lib.schemas import SCHEMA_VERSION, get_node_schema
+import numbers
+import re
+
+from lib.schemas import SCHEMA_VERSION, get_node_schema, get_node_type_schema
 
 try:
     import jsonschema
@@ -34,37 +37,42 @@ def create_fallback_note(title: str, body: str, warnings: list[str]) -> dict:
     }
 
 
+VALID_NODE_TYPES = ["reminder", "todo", "note", "calendar_placeholder"]
+REQUIRED_FIELDS = [
+    "schema_version", "node_type", "title", "body", "tags",
+    "status", "confidence", "evidence", "location_context"
+]
+
+# Compiled validators, built once per container: node_type (None for an
+# invalid type) -> function(node) -> (manual_errors, schema_errors)
+_node_validators = {}
+
+
 def validate_node_manual(node: dict) -> list[str]:
     """Manual validation of required fields. Returns list of errors."""
     errors = []
     
-    required_fields = [
-        "schema_version", "node_type", "title", "body", "tags",
-        "status", "confidence", "evidence", "location_context"
-    ]
-    
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if field not in node:
             errors.append(f"Missing required field: {field}")
     
     if node.get("schema_version") != SCHEMA_VERSION:
         errors.append(f"Invalid schema_version: expected {SCHEMA_VERSION}")
     
-    valid_node_types = ["reminder", "todo", "note", "calendar_placeholder"]
     node_type = node.get("node_type")
-    if node_type not in valid_node_types:
+    if node_type not in VALID_NODE_TYPES:
         errors.append(f"Invalid node_type: {node_type}")
     
     # Check that the matching payload exists
-    if node_type == "reminder" and "reminder" not in node:
-        errors.append("reminder node missing 'reminder' payload")
-    elif node_type == "todo" and "todo" not in node:
-        errors.append("todo node missing 'todo' payload")
-    elif node_type == "note" and "note" not in node:
-        errors.append("note node missing 'note' payload")
-    elif node_type == "calendar_placeholder" and "calendar_placeholder" not in node:
-        errors.append("calendar_placeholder node missing 'calendar_placeholder' payload")
+    if node_type in VALID_NODE_TYPES and node_type not in node:
+        errors.append(f"{node_type} node missing '{node_type}' payload")
     
+    _check_node_fields(node, errors)
+    return errors
+
+
+def _check_node_fields(node: dict, errors: list[str]) -> None:
+    """The manual checks that don't depend on node_type."""
     # Validate confidence range
     confidence = node.get("confidence")
     if confidence is not None and (not isinstance(confidence, (int, float)) or confidence < 0 or confidence > 1):
@@ -82,14 +90,17 @@ def validate_node_manual(node: dict) -> list[str]:
     
     # Validate location_context
     loc = node.get("location_context")
-    if loc and "location_used" not in loc:
+    if loc and (not isinstance(loc, dict) or "location_used" not in loc):
         errors.append("location_context missing 'location_used'")
-    
-    return errors
 
 
 def validate_node_jsonschema(node: dict) -> list[str]:
-    """Validate using jsonschema library. Returns list of errors."""
+    """
+    Validate using jsonschema library. Returns list of errors.
+    
+    Builds a validator per call; validate_node uses the compiled validators
+    instead and this stays as the reference they are checked against.
+    """
     if not HAS_JSONSCHEMA:
         return []
     
@@ -109,6 +120,238 @@ def validate_node_jsonschema(node: dict) -> list[str]:
     return errors
 
 
+# Schema compiler - turns the node schema into nested closures once, so a
+# validation is plain Python checks instead of jsonschema's per-call
+# keyword dispatch. Messages and paths match jsonschema's.
+JSON_PATH_PROPERTY = re.compile(r"^[a-zA-Z][a-zA-Z0-9_]*$")
+IGNORED_KEYWORDS = {"$schema", "$id", "$defs", "title", "description", "default"}
+
+TYPE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: (
+        isinstance(value, float) and value.is_integer()
+        or isinstance(value, int) and not isinstance(value, bool)
+    ),
+    "number": lambda value: isinstance(value, numbers.Number) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list)
+}
+
+
+def _child_path(key: str) -> str:
+    if JSON_PATH_PROPERTY.match(key):
+        return "." + key
+    escaped = key.replace("\\", "\\\\").replace("'", "\\'")
+    return "['" + escaped + "']"
+
+
+def _compile_keyword(keyword, value, schema, root, refs):
+    """Compile one schema keyword into a check(instance, path, errors)."""
+    if keyword == "$ref":
+        return _compile_ref(value, root, refs)
+    
+    if keyword == "type":
+        types = value if isinstance(value, list) else [value]
+        type_checks = [TYPE_CHECKS[name] for name in types]
+        type_names = ", ".join(repr(name) for name in types)
+        
+        def check(instance, path, errors):
+            for type_check in type_checks:
+                if type_check(instance):
+                    return
+            errors.append(f"{path}: {instance!r} is not of type {type_names}")
+        return check
+    
+    if keyword == "const":
+        def check(instance, path, errors):
+            if instance != value or type(instance) is not type(value):
+                errors.append(f"{path}: {value!r} was expected")
+        return check
+    
+    if keyword == "enum":
+        allowed = list(value)
+        
+        def check(instance, path, errors):
+            if instance not in allowed:
+                errors.append(f"{path}: {instance!r} is not one of {allowed!r}")
+        return check
+    
+    if keyword in ("maxLength", "minLength", "maxItems", "minItems"):
+        kind = str if keyword.endswith("Length") else list
+        if keyword.startswith("max"):
+            message = "is expected to be empty" if value == 0 else "is too long"
+            
+            def check(instance, path, errors):
+                if isinstance(instance, kind) and len(instance) > value:
+                    errors.append(f"{path}: {instance!r} {message}")
+        else:
+            message = "should be non-empty" if value == 1 else "is too short"
+            
+            def check(instance, path, errors):
+                if isinstance(instance, kind) and len(instance) < value:
+                    errors.append(f"{path}: {instance!r} {message}")
+        return check
+    
+    if keyword == "minimum":
+        def check(instance, path, errors):
+            if TYPE_CHECKS["number"](instance) and instance < value:
+                errors.append(f"{path}: {instance!r} is less than the minimum of {value!r}")
+        return check
+    
+    if keyword == "maximum":
+        def check(instance, path, errors):
+            if TYPE_CHECKS["number"](instance) and instance > value:
+                errors.append(f"{path}: {instance!r} is greater than the maximum of {value!r}")
+        return check
+    
+    if keyword == "items":
+        item_check = _compile_schema(value, root, refs)
+        
+        def check(instance, path, errors):
+            if isinstance(instance, list):
+                for index, item in enumerate(instance):
+                    item_check(item, f"{path}[{index}]", errors)
+        return check
+    
+    if keyword == "properties":
+        property_checks = [
+            (name, _child_path(name), _compile_schema(subschema, root, refs))
+            for name, subschema in value.items()
+        ]
+        
+        def check(instance, path, errors):
+            if isinstance(instance, dict):
+                for name, child_path, property_check in property_checks:
+                    if name in instance:
+                        property_check(instance[name], path + child_path, errors)
+        return check
+    
+    if keyword == "required":
+        def check(instance, path, errors):
+            if isinstance(instance, dict):
+                for name in value:
+                    if name not in instance:
+                        errors.append(f"{path}: {name!r} is a required property")
+        return check
+    
+    if keyword == "additionalProperties" and value is False:
+        known = set(schema.get("properties", {}))
+        
+        def check(instance, path, errors):
+            if isinstance(instance, dict):
+                extras = [name for name in instance if name not in known]
+                if extras:
+                    extras = sorted(extras, key=str)
+                    verb = "was" if len(extras) == 1 else "were"
+                    listed = ", ".join(repr(extra) for extra in extras)
+                    errors.append(f"{path}: Additional properties are not allowed ({listed} {verb} unexpected)")
+        return check
+    
+    raise ValueError(f"Unsupported schema keyword: {keyword}")
+
+
+def _compile_ref(ref: str, root: dict, refs: dict):
+    """Compile a local "#/$defs/..." reference, once per ref."""
+    if ref not in refs:
+        if not ref.startswith("#/"):
+            raise ValueError(f"Unsupported $ref: {ref}")
+        target = root
+        for part in ref[2:].split("/"):
+            target = target[part]
+        # Placeholder first so recursive references resolve
+        compiled = []
+        refs[ref] = lambda instance, path, errors: compiled[0](instance, path, errors)
+        compiled.append(_compile_schema(target, root, refs))
+        refs[ref] = compiled[0]
+    return refs[ref]
+
+
+def _compile_schema(schema: dict, root: dict, refs: dict):
+    """Compile a (sub)schema into a check(instance, path, errors)."""
+    checks = [
+        _compile_keyword(keyword, value, schema, root, refs)
+        for keyword, value in schema.items()
+        if keyword not in IGNORED_KEYWORDS
+    ]
+    
+    def check(instance, path, errors):
+        for keyword_check in checks:
+            keyword_check(instance, path, errors)
+    return check
+
+
+def compile_schema(schema: dict):
+    """
+    Compile a JSON schema into a function(instance) -> list of errors.
+    
+    Supports the keywords the node schema uses; raises ValueError for others.
+    Errors are formatted like validate_node_jsonschema ("$.path: message").
+    """
+    check = _compile_schema(schema, schema, {})
+    
+    def validate(instance):
+        errors = []
+        check(instance, "$", errors)
+        return errors
+    return validate
+
+
+def _compile_node_validator(node_type: str | None):
+    """
+    Build the validator for one node_type (None for an invalid node_type).
+    
+    Runs the manual checks and the compiled schema checks in one call and
+    returns (manual_errors, schema_errors) - the same lists as
+    validate_node_manual and validate_node_jsonschema. A valid node_type
+    is checked against its branch of the schema (get_node_type_schema):
+    no node_type enum check and only its own payload schema. Nodes that
+    also carry another type's payload use the full schema. Like
+    validate_node_jsonschema, schema checks are skipped when jsonschema is
+    not installed, so accept/reject behavior doesn't depend on the compiler.
+    """
+    try:
+        check_full = compile_schema(get_node_schema())
+        check_type = compile_schema(get_node_type_schema(node_type)) if node_type else check_full
+    except ValueError:
+        # Schema uses a keyword the compiler doesn't know - use the reference path
+        def validate_reference(node):
+            return validate_node_manual(node), validate_node_jsonschema(node)
+        return validate_reference
+    
+    other_payloads = [other for other in VALID_NODE_TYPES if other != node_type]
+    
+    def validate(node):
+        errors = [f"Missing required field: {field}" for field in REQUIRED_FIELDS if field not in node]
+        
+        if node.get("schema_version") != SCHEMA_VERSION:
+            errors.append(f"Invalid schema_version: expected {SCHEMA_VERSION}")
+        if node_type is None:
+            errors.append(f"Invalid node_type: {node.get('node_type')}")
+        elif node_type not in node:
+            errors.append(f"{node_type} node missing '{node_type}' payload")
+        _check_node_fields(node, errors)
+        if not HAS_JSONSCHEMA:
+            return errors, []
+        
+        check_schema = check_full if any(other in node for other in other_payloads) else check_type
+        try:
+            schema_errors = check_schema(node)
+        except Exception as e:
+            schema_errors = [f"Schema validation error: {str(e)}"]
+        return errors, schema_errors
+    return validate
+
+
+def get_node_validator(node_type):
+    """Get the compiled validator for a node_type (built once per container)."""
+    key = node_type if isinstance(node_type, str) and node_type in VALID_NODE_TYPES else None
+    if key not in _node_validators:
+        _node_validators[key] = _compile_node_validator(key)
+    return _node_validators[key]
+
+
 def validate_node(node: dict, transcript: str = "") -> tuple[dict, list[str], bool]:
     """
     Validate a node against the schema.
@@ -121,11 +364,8 @@ def validate_node(node: dict, transcript: str = "") -> tuple[dict, list[str], bo
         warnings = ["No node provided by model"]
         return create_fallback_note("Captured Note", transcript, warnings), warnings, True
     
-    # Run manual validation (always)
-    manual_errors = validate_node_manual(node)
-    
-    # Run jsonschema validation if available
-    schema_errors = validate_node_jsonschema(node) if HAS_JSONSCHEMA else []
+    # Manual and schema checks in one pass with the compiled validator
+    manual_errors, schema_errors = get_node_validator(node.get("node_type"))(node)
     
     all_errors = manual_errors + schema_errors
     
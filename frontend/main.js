@@ -71,7 +71,7 @@ function toLocalIsoWithOffset(date = new Date()) {
   return `${local}${sign}${hours}:${minutes}`;
 }
 
-async function callApi(endpoint, method = "GET", body = null) {
+async function callApi(endpoint, method = "GET", body = null, extraHeaders = null) {
   const apiUrl = getApiUrl();
   if (!apiUrl) {
     throw new Error("Could not get API URL from stack");
@@ -91,6 +91,7 @@ async function callApi(endpoint, method = "GET", body = null) {
     headers: {
       Authorization: `Bearer ${tokens.id_token}`,
       "Content-Type": "application/json",
+      ...extraHeaders,
     },
   };
 
@@ -105,11 +106,13 @@ async function callApi(endpoint, method = "GET", body = null) {
           const jsonData = JSON.parse(data);
           resolve({
             statusCode: res.statusCode,
+            headers: res.headers,
             body: jsonData,
           });
         } catch (err) {
           resolve({
             statusCode: res.statusCode,
+            headers: res.headers,
             body: data,
           });
         }
@@ -126,6 +129,35 @@ async function callApi(endpoint, method = "GET", body = null) {
   });
 }
 
+// Last /nodes/active response, revalidated with If-None-Match on each poll
+let activeNodesCache = null;
+
+// Stored version of each node we have seen, sent back as expected_version
+// so a save fails with 409 instead of overwriting a newer change
+const nodeVersions = new Map();
+
+function rememberNodeVersions(nodeIds, versions) {
+  (nodeIds || []).forEach((nodeId, index) => {
+    if (versions && Number.isInteger(versions[index])) {
+      nodeVersions.set(nodeId, versions[index]);
+    }
+  });
+}
+
+async function getActiveNodes() {
+  const headers = activeNodesCache ? { "If-None-Match": activeNodesCache.etag } : null;
+  const result = await callApi("nodes/active", "GET", null, headers);
+  if (result.statusCode === 304 && activeNodesCache) {
+    return { statusCode: 200, body: activeNodesCache.body };
+  }
+  const etag = result.headers && result.headers.etag;
+  activeNodesCache = result.statusCode === 200 && etag ? { etag, body: result.body } : null;
+  if (result.statusCode === 200) {
+    rememberNodeVersions(result.body.node_ids, result.body.node_versions);
+  }
+  return { statusCode: result.statusCode, body: result.body };
+}
+
 async function ensureCognitoLogin() {
   const tokens = await ensureValidTokens().catch(() => null);
   if (tokens) {
@@ -582,12 +614,19 @@ app.whenReady().then(async () => {
       const body = {
         transcript: transcript,
         user_time_iso: userTimeIso || toLocalIsoWithOffset(),
+        user_timezone: Intl.DateTimeFormat().resolvedOptions().timeZone,
         user_id: "demo",
         user_location: {
           kind: "unknown",
         },
       };
       const result = await callApi("ingest", "POST", body);
+      // Ingested nodes are stored at version 1 when persisted, otherwise the
+      // first save must create them (expected_version 0)
+      if (result.statusCode === 200 && Array.isArray(result.body.node_ids)) {
+        const version = result.body.persisted ? 1 : 0;
+        rememberNodeVersions(result.body.node_ids, result.body.node_ids.map(() => version));
+      }
       return { success: true, ...result };
     } catch (err) {
       return { success: false, error: err.message };
@@ -611,8 +650,21 @@ app.whenReady().then(async () => {
         node_id: finalNodeId,
         captured_at_iso: node?.captured_at_iso || new Date().toISOString(),
       };
+      if (nodeVersions.has(finalNodeId)) {
+        body.expected_version = nodeVersions.get(finalNodeId);
+      }
 
       const result = await callApi(endpoint, "POST", body);
+      if (result.statusCode === 409) {
+        // Changed elsewhere since we loaded it - refetch before saving again
+        nodeVersions.delete(finalNodeId);
+        activeNodesCache = null;
+        return { success: false, conflict: true, ...result };
+      }
+      if (result.statusCode >= 300) {
+        return { success: false, ...result };
+      }
+      nodeVersions.set(finalNodeId, result.body.version);
       return { success: true, ...result };
     } catch (err) {
       return { success: false, error: err.message };
@@ -621,7 +673,7 @@ app.whenReady().then(async () => {
 
   ipcMain.handle("get-active-nodes", async () => {
     try {
-      const result = await callApi("nodes/active", "GET");
+      const result = await getActiveNodes();
       if (result.statusCode >= 300) {
         return { success: false, ...result };
       }
@@ -641,12 +693,41 @@ app.whenReady().then(async () => {
       if (result.statusCode >= 300) {
         return { success: false, ...result };
       }
+      nodeVersions.delete(nodeId);
       return { success: true, ...result };
     } catch (err) {
       return { success: false, error: err.message };
     }
   });
 
+  // Multi-select: one request for many nodes, with a status per node_id
+  for (const [channel, endpoint] of [
+    ["delete-nodes", "nodes/batch-delete"],
+    ["complete-nodes", "nodes/batch-complete"],
+  ]) {
+    ipcMain.handle(channel, async (event, nodeIds) => {
+      try {
+        if (!Array.isArray(nodeIds) || nodeIds.length === 0) {
+          throw new Error("At least one node ID is required");
+        }
+        const result = await callApi(endpoint, "POST", { node_ids: nodeIds });
+        if (result.statusCode >= 300) {
+          return { success: false, ...result };
+        }
+        for (const { node_id: nodeId, status, version } of result.body.results || []) {
+          if (Number.isInteger(version)) {
+            nodeVersions.set(nodeId, version);
+          } else if (status !== "failed") {
+            nodeVersions.delete(nodeId);
+          }
+        }
+        return { success: true, ...result };
+      } catch (err) {
+        return { success: false, error: err.message };
+      }
+    });
+  }
+
   ipcMain.handle("google-access-token", async () => {
     try {
       const result = await callApi("integrations/google/access-token", "GET");
@@ -738,7 +819,7 @@ app.whenReady().then(async () => {
   // Fetch active tasks/nodes from backend
   ipcMain.handle("fetch-tasks", async (event, cognitoToken) => {
     try {
-      const result = await callApi("nodes/active", "GET");
+      const result = await getActiveNodes();
       return { success: result.statusCode < 300, ...result.body };
     } catch (error) {
       console.error("Fetch tasks error:", error);
@@ -29,6 +29,8 @@ contextBridge.exposeInMainWorld('braindump', {
   completeNode: (node, nodeId) => ipcRenderer.invoke('complete-node', node, nodeId),
   getActiveNodes: () => ipcRenderer.invoke('get-active-nodes'),
   deleteNode: (nodeId) => ipcRenderer.invoke('delete-node', nodeId),
+  deleteNodes: (nodeIds) => ipcRenderer.invoke('delete-nodes', nodeIds),
+  completeNodes: (nodeIds) => ipcRenderer.invoke('complete-nodes', nodeIds),
   googleAccessToken: () => ipcRenderer.invoke('google-access-token'),
 
   // Auth
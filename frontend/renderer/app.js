@@ -773,6 +773,8 @@ async function approveCard(card, index, executionMode = 'execute') {
       console.log(`[COMPLETE_NODE] API Response:`, result);
       if (result.success) {
         console.log(`[COMPLETE_NODE] Successfully saved node ${task.nodeId}`);
+      } else if (result.conflict) {
+        console.warn(`[COMPLETE_NODE] Node ${task.nodeId} was changed elsewhere; reload it before saving again`);
       } else {
         console.error(`[COMPLETE_NODE] Failed to save node:`, result.error);
       }